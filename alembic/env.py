@@ -1,4 +1,5 @@
 import asyncio
+import logging
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -8,6 +9,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from src.config import settings
+from src.data import migrations
 from src.data.domain import Base
 from src.modules.auth.auth_model import User  # Import needed for Alembic to see the model
 
@@ -21,7 +23,8 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Overwrite sqlalchemy.url with the one from settings
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# "%" échappé pour configparser (mot de passe ou paramètres encodés dans l'URL)
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -58,10 +61,26 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
-
-    with context.begin_transaction():
-        context.run_migrations()
+    online = settings.MIGRATION_MODE == "online"
+    if online:
+        # Mode online (src/data/migrations.py): une révision qui attend un verrou échoue au lieu
+        # de bloquer les requêtes de l'API placées derrière elle dans la file des verrous
+        connection.exec_driver_sql(f"SET lock_timeout = {settings.MIGRATION_LOCK_TIMEOUT_MS}")
+        connection.exec_driver_sql(f"SET statement_timeout = {settings.MIGRATION_STATEMENT_TIMEOUT_MS}")
+        connection.commit()
+    # Une transaction par révision en mode online: un échec ne défait que la révision en cours
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=online)
+
+    try:
+        with context.begin_transaction():
+            context.run_migrations()
+    except migrations.ContractPending as pending:
+        # Des instances de l'ancienne version peuvent encore utiliser l'ancien schéma
+        logging.getLogger("alembic.runtime.migration").warning(
+            "Migrations arrêtées à la révision %s: révision de contraction suivante à appliquer avec "
+            "MIGRATION_CONTRACT=true une fois toutes les instances de l'API mises à jour",
+            pending.args[0],
+        )
 
 
 async def run_migrations_online() -> None:
@@ -0,0 +1,38 @@
+"""add login events audit log
+
+Revision ID: 28afe8ef5e75
+Revises: c5804d01e999
+Create Date: 2026-10-18 09:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28afe8ef5e75'
+down_revision: Union[str, None] = 'c5804d01e999'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('login_events',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('event', sa.String(length=32), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('client_ip', sa.String(length=45), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_login_events_created_at'), 'login_events', ['created_at'], unique=False)
+    op.create_index('ix_login_events_user_id_created_at', 'login_events', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_login_events_user_id_created_at', table_name='login_events')
+    op.drop_index(op.f('ix_login_events_created_at'), table_name='login_events')
+    op.drop_table('login_events')
@@ -0,0 +1,30 @@
+"""add last_login_at and login_count to users
+
+Revision ID: 7d2e4b91a3c6
+Revises: 28afe8ef5e75
+Create Date: 2026-10-18 10:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4b91a3c6'
+down_revision: Union[str, None] = '28afe8ef5e75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pas d'index sur last_login_at: il empêcherait les mises à jour HOT des écritures groupées
+    op.add_column('users', sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True))
+    # Défaut constant: ajout sans réécriture de la table (PostgreSQL >= 11)
+    op.add_column('users', sa.Column('login_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'login_count')
+    op.drop_column('users', 'last_login_at')
@@ -0,0 +1,79 @@
+"""add users.email_normalized for case-insensitive lookups (expand)
+
+The previous application version keeps working: it inserts users without
+email_normalized (filled by a trigger) and looks them up through ix_users_email.
+NOT NULL and the drop of ix_users_email come with the contract revision a93d5e7c2f14.
+
+Revision ID: b4f1c2d8e9a7
+Revises: 7d2e4b91a3c6
+Create Date: 2026-10-18 10:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.data import migrations
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f1c2d8e9a7'
+down_revision: Union[str, None] = '7d2e4b91a3c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Version précédente de l'application: insère sans email_normalized (rempli ici) et ne
+# modifie pas l'email sans le recalculer; supprimé par la révision de contraction
+FILL_EMAIL_NORMALIZED = """
+CREATE OR REPLACE FUNCTION users_fill_email_normalized() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.email_normalized IS NULL OR (
+        TG_OP = 'UPDATE' AND NEW.email IS DISTINCT FROM OLD.email
+        AND NEW.email_normalized IS NOT DISTINCT FROM OLD.email_normalized
+    ) THEN
+        NEW.email_normalized := lower(NEW.email);
+    END IF;
+    RETURN NEW;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Vérifié avant toute modification: la migration échoue sans rien changer
+    duplicates = bind.execute(sa.text(
+        "SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Comptes en double à la casse près, à fusionner avant la migration: " + ", ".join(duplicates)
+        )
+
+    # La colonne existe déjà si une exécution précédente a été interrompue pendant le remplissage
+    if 'email_normalized' not in {column['name'] for column in sa.inspect(bind).get_columns('users')}:
+        op.add_column('users', sa.Column('email_normalized', sa.String(), nullable=True))
+    # Avant le remplissage: les lignes écrites pendant et après par l'ancienne version sont couvertes
+    op.execute(FILL_EMAIL_NORMALIZED)
+    op.execute("DROP TRIGGER IF EXISTS users_fill_email_normalized ON users")
+    op.execute(
+        "CREATE TRIGGER users_fill_email_normalized BEFORE INSERT OR UPDATE OF email ON users "
+        "FOR EACH ROW EXECUTE FUNCTION users_fill_email_normalized()"
+    )
+
+    migrations.backfill(
+        'users',
+        "UPDATE users SET email_normalized = lower(email) "
+        "WHERE id >= :start AND id < :end AND email_normalized IS NULL",
+    )
+    migrations.create_index(op.f('ix_users_email_normalized'), 'users', ['email_normalized'], unique=True)
+    # ix_users_email reste en place: recherches (User.email == ...) de l'ancienne version
+
+
+def downgrade() -> None:
+    migrations.drop_index(op.f('ix_users_email_normalized'), 'users')
+    op.execute("DROP TRIGGER IF EXISTS users_fill_email_normalized ON users")
+    op.execute("DROP FUNCTION IF EXISTS users_fill_email_normalized()")
+    op.drop_column('users', 'email_normalized')
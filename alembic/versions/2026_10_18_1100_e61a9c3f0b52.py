@@ -0,0 +1,29 @@
+"""drop redundant ix_users_id index
+
+Revision ID: e61a9c3f0b52
+Revises: b4f1c2d8e9a7
+Create Date: 2026-10-18 11:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.data import migrations
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61a9c3f0b52'
+down_revision: Union[str, None] = 'b4f1c2d8e9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Doublon de users_pkey (même colonne): maintenu à chaque insertion sans jamais servir
+    migrations.drop_index(op.f('ix_users_id'), 'users')
+
+
+def downgrade() -> None:
+    migrations.create_index(op.f('ix_users_id'), 'users', ['id'])
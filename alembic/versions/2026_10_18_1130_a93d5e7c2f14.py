@@ -0,0 +1,55 @@
+"""make users.email_normalized required and drop ix_users_email (contract)
+
+Applied once every API instance runs a version that writes email_normalized
+(MIGRATION_CONTRACT=true in online mode).
+
+Revision ID: a93d5e7c2f14
+Revises: e61a9c3f0b52
+Create Date: 2026-10-18 11:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.data import migrations
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93d5e7c2f14'
+down_revision: Union[str, None] = 'e61a9c3f0b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    migrations.contract()
+    # Toutes les lignes ont été remplies par b4f1c2d8e9a7 (remplissage puis trigger)
+    migrations.set_not_null('users', 'email_normalized')
+    op.execute("DROP TRIGGER IF EXISTS users_fill_email_normalized ON users")
+    op.execute("DROP FUNCTION IF EXISTS users_fill_email_normalized()")
+    # L'index unique sur l'email normalisé garantit aussi l'unicité de l'email saisi
+    migrations.drop_index('ix_users_email', 'users')
+
+
+def downgrade() -> None:
+    migrations.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.execute("""
+CREATE OR REPLACE FUNCTION users_fill_email_normalized() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.email_normalized IS NULL OR (
+        TG_OP = 'UPDATE' AND NEW.email IS DISTINCT FROM OLD.email
+        AND NEW.email_normalized IS NOT DISTINCT FROM OLD.email_normalized
+    ) THEN
+        NEW.email_normalized := lower(NEW.email);
+    END IF;
+    RETURN NEW;
+END
+$$
+""")
+    op.execute(
+        "CREATE TRIGGER users_fill_email_normalized BEFORE INSERT OR UPDATE OF email ON users "
+        "FOR EACH ROW EXECUTE FUNCTION users_fill_email_normalized()"
+    )
+    op.alter_column('users', 'email_normalized', existing_type=sa.String(), nullable=True)
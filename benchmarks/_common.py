@@ -0,0 +1,81 @@
+"""
+Utilitaires partagés par les benchmarks (statistiques de latence, sortie JSON).
+Les benchmarks s'exécutent contre la base définie par DATABASE_URL.
+"""
+from datetime import datetime, timezone
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+
+from httpx import ASGITransport, AsyncClient
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentile par la méthode du rang le plus proche (samples en secondes)."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[float], elapsed: float | None = None) -> dict:
+    """Résumé des latences en millisecondes (+ débit si la durée est fournie)."""
+    summary = {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else float("nan"),
+    }
+    if elapsed:
+        summary["throughput_rps"] = round(len(samples) / elapsed, 2)
+    return summary
+
+
+def emit(results: dict, path: str | None = None) -> None:
+    """Écrit les résultats en JSON sur la sortie standard (et dans `path` si fourni)."""
+    json.dump(results, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    if path:
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2, default=str)
+
+
+def run_metadata() -> dict:
+    """Contexte de la mesure (commit, date, Python) pour comparer des résultats entre commits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+@asynccontextmanager
+async def asgi_client(app):
+    """Client httpx qui appelle l'application ASGI dans le même processus."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        yield client
+
+
+async def timed_request(client: AsyncClient, method: str, url: str, **kwargs) -> tuple[float, int]:
+    """Exécute une requête et retourne (latence en secondes, code HTTP)."""
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return time.perf_counter() - start, response.status_code
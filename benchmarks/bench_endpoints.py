@@ -0,0 +1,195 @@
+"""
+Charge sur /register, /login et /users/me: débit et latences p50/p95/p99 par endpoint.
+
+Deux modes:
+- inprocess: l'application ASGI est appelée dans le processus (httpx + ASGITransport);
+- uvicorn: N workers uvicorn réels lancés par `python -m src.server`, appelés en HTTP sur 127.0.0.1.
+
+Le coût bcrypt et la taille du pool sont transmis à l'application par l'environnement
+(PASSWORD_BCRYPT_ROUNDS, DB_POOL_SIZE); les limites de connexion sont désactivées.
+Le résultat JSON contient le commit mesuré: deux fichiers se comparent avec
+`python -m benchmarks.compare avant.json apres.json`.
+
+Usage:
+    python -m benchmarks.bench_endpoints --mode inprocess --concurrency 16 --duration 10
+    python -m benchmarks.bench_endpoints --mode uvicorn --workers 4 --bcrypt-rounds 10 --pool-size 10 --output results.json
+"""
+import argparse
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+import itertools
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks._common import asgi_client, emit, run_metadata, summarize, timed_request
+
+PASSWORD = "Password123"
+ENDPOINTS = ("register", "login", "users_me")
+
+
+def app_environment(args) -> dict[str, str]:
+    """Configuration de l'application mesurée (appliquée avant l'import de src)."""
+    return {
+        "PASSWORD_BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+        "DB_POOL_SIZE": str(args.pool_size),
+        "LOGIN_RATE_LIMIT_PER_EMAIL": "0",
+        "LOGIN_RATE_LIMIT_PER_IP": "0",
+        "MAX_CONCURRENT_PASSWORD_CHECKS": "0",
+    }
+
+
+async def prepare_users(prefix: str, count: int) -> list[str]:
+    """Crée directement en base les comptes utilisés par /login (un seul hachage bcrypt)."""
+    from src.data.domain import Base, get_async_engine
+    from src.modules.auth.auth_metier import get_password_hash
+    from src.modules.auth.auth_model import User, normalize_email
+
+    emails = [f"{prefix}-login-{i}@example.com" for i in range(count)]
+    hashed_password = get_password_hash(PASSWORD)
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            User.__table__.insert(),
+            [{"email": email, "email_normalized": normalize_email(email), "hashed_password": hashed_password, "first_name": "", "last_name": ""} for email in emails],
+        )
+    await get_async_engine().dispose()
+    return emails
+
+
+def build_request(endpoint: str, i: int, prefix: str, emails: list[str], tokens: list[str]) -> tuple[str, str, dict]:
+    if endpoint == "register":
+        return "POST", "/api/v1/auth/register", {"json": {"email": f"{prefix}-new-{i}@example.com", "password": PASSWORD}}
+    if endpoint == "login":
+        return "POST", "/api/v1/auth/login", {"json": {"email": emails[i % len(emails)], "password": PASSWORD}}
+    return "GET", "/api/v1/auth/users/me", {"headers": {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}}
+
+
+async def run_endpoint(client, endpoint: str, concurrency: int, duration: float, request_ids, **context) -> dict:
+    """Boucle fermée: `concurrency` clients enchaînent les requêtes pendant `duration` secondes."""
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            method, url, kwargs = build_request(endpoint, next(request_ids), **context)
+            try:
+                latency, status_code = await timed_request(client, method, url, **kwargs)
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            statuses[str(status_code)] += 1
+            if status_code < 400:
+                latencies.append(latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        **summarize(latencies, elapsed),
+        "errors": sum(statuses.values()) - len(latencies),
+        "status": dict(statuses),
+    }
+
+
+async def run_suite(client, args, emails: list[str], prefix: str) -> dict:
+    tokens = []
+    for email in emails[:10]:
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+
+    context = {"prefix": prefix, "emails": emails, "tokens": tokens}
+    request_ids = itertools.count()
+    results = {}
+    for endpoint in args.endpoints:
+        if args.warmup:
+            await run_endpoint(client, endpoint, args.concurrency, args.warmup, request_ids, **context)
+        results[endpoint] = await run_endpoint(client, endpoint, args.concurrency, args.duration, request_ids, **context)
+    return results
+
+
+@asynccontextmanager
+async def uvicorn_server(workers: int, port: int, env: dict[str, str]):
+    """Lance le serveur de production (`python -m src.server`) avec `workers` processus et attend /health."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.server"],
+        env={**os.environ, **env, "WEB_HOST": "127.0.0.1", "API_PORT": str(port), "WEB_WORKERS": str(workers)},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as probe:
+            for _ in range(300):
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn s'est arrêté au démarrage (code {process.returncode})")
+                try:
+                    if (await probe.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn n'a pas répondu sur /health en 30 s")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), type=lambda value: value.split(","))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de mesure par endpoint (secondes)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Échauffement non mesuré par endpoint (secondes)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2, help="Workers uvicorn (mode uvicorn)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--login-users", type=int, default=100)
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    env = app_environment(args)
+    os.environ.update(env)  # Avant tout import de src (settings lus à l'import)
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    emails = await prepare_users(prefix, args.login_users)
+
+    if args.mode == "inprocess":
+        from src.main import app
+
+        async with asgi_client(app) as client:
+            results = await run_suite(client, args, emails, prefix)
+    else:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with uvicorn_server(args.workers, args.port, env) as base_url:
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                results = await run_suite(client, args, emails, prefix)
+
+    emit(
+        {
+            "benchmark": "endpoints",
+            **run_metadata(),
+            "params": {
+                "mode": args.mode,
+                "workers": args.workers if args.mode == "uvicorn" else 1,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "bcrypt_rounds": args.bcrypt_rounds,
+                "pool_size": args.pool_size,
+            },
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Coût par token de la validation pour une passerelle: un appel à /users/me par token contre
+/introspect par lots (décodage de tout le lot, une requête `id = ANY(...)` par lot).
+
+Les access tokens sont émis directement pour `--users` comptes créés en base; le cache de
+tokens est vidé avant chaque passe (décodage JWT compris dans la mesure).
+
+Usage:
+    python -m benchmarks.bench_introspect --users 1000 --batch-sizes 1,10,100,1000
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+from benchmarks._common import asgi_client, emit, run_metadata
+
+
+async def measure_users_me(client, tokens: list[str], concurrency: int) -> float:
+    """Durée totale pour valider tous les tokens, un appel /users/me par token."""
+    pending = iter(tokens)
+
+    async def worker() -> None:
+        for token in pending:
+            response = await client.get("/api/v1/auth/users/me", headers={"Authorization": f"Bearer {token}"})
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def measure_introspect(client, tokens: list[str], batch_size: int, concurrency: int) -> float:
+    """Durée totale pour valider tous les tokens par lots de `batch_size`."""
+    pending = iter(range(0, len(tokens), batch_size))
+
+    async def worker() -> None:
+        for offset in pending:
+            response = await client.post("/api/v1/auth/introspect", json={"tokens": tokens[offset:offset + batch_size]})
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def per_token(durations: list[float], count: int) -> dict:
+    best = min(durations)
+    return {"per_token_us": round(best / count * 1e6, 1), "tokens_per_s": round(count / best)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Comptes distincts (un token chacun)")
+    parser.add_argument("--batch-sizes", default="1,10,100,1000", type=lambda value: [int(n) for n in value.split(",")])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes par configuration (la meilleure est retenue)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")  # Hachage des comptes de test uniquement
+    from benchmarks.bench_endpoints import prepare_users
+    from sqlalchemy import select
+    from src.data.domain import dispose_engines, get_async_engine
+    from src.main import app
+    from src.modules.auth.auth_cache import token_cache
+    from src.modules.auth.auth_metier import create_access_token
+    from src.modules.auth.auth_model import User
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    await prepare_users(prefix, args.users)
+    async with get_async_engine().connect() as conn:
+        user_ids = (await conn.scalars(select(User.id).where(User.email.startswith(prefix)))).all()
+    tokens = [create_access_token({"sub": str(user_id)}) for user_id in user_ids]
+
+    results = {}
+    async with asgi_client(app) as client:
+        durations = []
+        for _ in range(args.repeat):
+            token_cache.clear()
+            durations.append(await measure_users_me(client, tokens, args.concurrency))
+        results["users_me"] = per_token(durations, len(tokens))
+
+        for batch_size in args.batch_sizes:
+            durations = []
+            for _ in range(args.repeat):
+                token_cache.clear()
+                durations.append(await measure_introspect(client, tokens, batch_size, args.concurrency))
+            results[f"introspect_batch_{batch_size}"] = per_token(durations, len(tokens))
+    await dispose_engines()
+
+    emit(
+        {
+            "benchmark": "introspect",
+            **run_metadata(),
+            "params": {"users": len(tokens), "concurrency": args.concurrency, "repeat": args.repeat},
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Débit des codecs JWT (JWT_BACKEND): encodages et décodages (signature et claims vérifiés)
+par seconde, pour chaque algorithme HMAC, sur des claims d'access token (sub, sid, exp, iat).
+Mesure en processus, sans base de données ni cache de tokens.
+
+Usage:
+    python -m benchmarks.bench_jwt --algorithms HS256,HS512 --iterations 50000
+"""
+import argparse
+import time
+
+from benchmarks._common import emit, run_metadata
+
+
+def per_second(operation, iterations: int, repeat: int) -> int:
+    """Meilleur débit sur `repeat` passes de `iterations` appels."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        best = min(best, time.perf_counter() - start)
+    return round(iterations / best)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="jose,fast", type=lambda value: value.split(","))
+    parser.add_argument("--algorithms", default="HS256,HS384,HS512", type=lambda value: value.split(","))
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes par mesure (la meilleure est retenue)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    from src.config import settings
+    from src.modules.auth.auth_keys import load_key_ring
+    from src.modules.auth.auth_metier import build_token_codec, new_session_id
+
+    now = int(time.time())
+    claims = {"sub": "123456", "sid": new_session_id(), "exp": now + 900, "iat": now}
+    results = {}
+    for algorithm in args.algorithms:
+        settings.ALGORITHM = algorithm
+        keys = load_key_ring()
+        results[algorithm] = {}
+        for backend in args.backends:
+            codec = build_token_codec(keys, backend)
+            token = codec.encode(claims)
+            assert codec.decode(token) == claims
+            results[algorithm][backend] = {
+                "encodes_per_s": per_second(lambda: codec.encode(claims), args.iterations, args.repeat),
+                "decodes_per_s": per_second(lambda: codec.decode(token), args.iterations, args.repeat),
+            }
+        if {"jose", "fast"} <= set(args.backends):
+            results[algorithm]["speedup"] = {
+                operation: round(results[algorithm]["fast"][operation] / results[algorithm]["jose"][operation], 1)
+                for operation in ("encodes_per_s", "decodes_per_s")
+            }
+
+    emit(
+        {
+            "benchmark": "jwt",
+            **run_metadata(),
+            "params": {"iterations": args.iterations, "repeat": args.repeat},
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Écriture de last_login_at / login_count: un UPDATE par connexion contre le cumul en mémoire
+écrit par lots (LoginTracker, `UPDATE users ... FROM (VALUES ...)`).
+
+`--logins` connexions réussies sont simulées sur `--users` comptes (popularité de Zipf: les
+comptes les plus actifs se reconnectent souvent et se disputent la même ligne), par
+`--concurrency` tâches. Seule l'écriture du suivi est mesurée (pas de bcrypt ni de token):
+connexions absorbées par seconde, requêtes UPDATE et lignes écrites en base.
+
+Usage:
+    python -m benchmarks.bench_login_tracking --users 1000 --logins 20000 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+
+from benchmarks._common import emit, run_metadata, summarize
+
+
+async def measure_naive(user_ids: list[int], concurrency: int) -> dict:
+    """Un UPDATE (et une transaction) par connexion."""
+    from sqlalchemy import func, update
+    from src.data.domain import get_async_engine
+    from src.modules.auth.auth_model import User
+
+    pending = iter(user_ids)
+    latencies = []
+    rows = 0
+
+    async def worker() -> None:
+        nonlocal rows
+        for user_id in pending:
+            start = time.perf_counter()
+            async with get_async_engine().begin() as conn:
+                result = await conn.execute(
+                    update(User).where(User.id == user_id).values(last_login_at=func.now(), login_count=User.login_count + 1)
+                )
+            latencies.append(time.perf_counter() - start)
+            rows += result.rowcount
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "logins_per_s": round(len(user_ids) / elapsed),
+        "update_statements": len(user_ids),
+        "rows_written": rows,
+        "write_latency": summarize(latencies),
+    }
+
+
+async def measure_coalesced(user_ids: list[int], concurrency: int, interval: float, batch_size: int) -> dict:
+    """Cumul en mémoire, écriture périodique par lots, écriture finale à l'arrêt comprise."""
+    from src.modules.auth.auth_login_tracker import LOGIN_TRACKING_EVENTS, LoginTracker
+
+    tracker = LoginTracker(interval, batch_size)
+    pending = iter(user_ids)
+
+    async def worker() -> None:
+        for user_id in pending:
+            tracker.record(user_id)
+            # Rend la main comme le ferait une requête (les autres tâches et l'écriture périodique avancent)
+            await asyncio.sleep(0)
+
+    written, batches = LOGIN_TRACKING_EVENTS.value("rows_written"), LOGIN_TRACKING_EVENTS.value("batches_written")
+    start = time.perf_counter()
+    tracker.start()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await tracker.stop()
+    elapsed = time.perf_counter() - start
+    return {
+        "logins_per_s": round(len(user_ids) / elapsed),
+        "update_statements": int(LOGIN_TRACKING_EVENTS.value("batches_written") - batches),
+        "rows_written": int(LOGIN_TRACKING_EVENTS.value("rows_written") - written),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=0.1, help="Intervalle d'écriture du cumul (s)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")  # Hachage des comptes de test uniquement
+    from sqlalchemy import select
+    from benchmarks.bench_endpoints import prepare_users
+    from src.data.domain import dispose_engines, get_async_engine
+    from src.modules.auth.auth_model import User
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    await prepare_users(prefix, args.users)
+    async with get_async_engine().connect() as conn:
+        user_ids = (await conn.scalars(select(User.id).where(User.email.startswith(prefix)).order_by(User.id))).all()
+    weights = [1 / rank for rank in range(1, len(user_ids) + 1)]
+    logins = random.Random(42).choices(user_ids, weights, k=args.logins)
+
+    results = {
+        "naive": await measure_naive(logins, args.concurrency),
+        "coalesced": await measure_coalesced(logins, args.concurrency, args.interval, args.batch_size),
+    }
+    results["speedup"] = round(results["coalesced"]["logins_per_s"] / results["naive"]["logins_per_s"], 1)
+    await dispose_engines()
+
+    emit(
+        {
+            "benchmark": "login_tracking",
+            **run_metadata(),
+            "params": {
+                "users": args.users, "logins": args.logins, "concurrency": args.concurrency,
+                "interval": args.interval, "batch_size": args.batch_size,
+            },
+            "results": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Latence de /users/me pendant que /login est saturé, avec et sans pool de hachage.
+
+Usage:
+    python -m benchmarks.bench_password_pool --login-concurrency 32 --samples 200
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+from src.config import settings
+from src.data.domain import Base, get_async_engine
+from src.main import app
+from src.modules.auth import auth_metier
+from src.modules.auth.auth_throttle import login_throttle
+from benchmarks._common import asgi_client, emit, summarize, timed_request
+
+PASSWORD = "Password123"
+
+
+async def _saturate_login(client, email: str, stop: asyncio.Event) -> int:
+    calls = 0
+    while not stop.is_set():
+        await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        calls += 1
+    return calls
+
+
+async def run_mode(workers: int, login_concurrency: int, samples: int) -> dict:
+    settings.PASSWORD_HASH_WORKERS = workers
+    auth_metier.shutdown_password_executor()
+
+    async with asgi_client(app) as client:
+        email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+        await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        stop = asyncio.Event()
+        loaders = [
+            asyncio.create_task(_saturate_login(client, email, stop))
+            for _ in range(login_concurrency)
+        ]
+        await asyncio.sleep(0.5)  # Laisse la charge /login s'installer
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(samples):
+            latency, _ = await timed_request(client, "GET", "/api/v1/auth/users/me", headers=headers)
+            latencies.append(latency)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        login_calls = sum(await asyncio.gather(*loaders))
+
+    auth_metier.shutdown_password_executor()
+    return {
+        "password_hash_workers": workers,
+        "users_me": summarize(latencies),
+        "login_throughput_rps": round(login_calls / elapsed, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # La saturation volontaire de /login ne doit pas être limitée
+    settings.LOGIN_RATE_LIMIT_PER_EMAIL = 0
+    settings.LOGIN_RATE_LIMIT_PER_IP = 0
+    login_throttle.gate.limit = 0
+
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    results = {
+        "benchmark": "password_pool",
+        "login_concurrency": args.login_concurrency,
+        "without_pool": await run_mode(0, args.login_concurrency, args.samples),
+        "with_pool": await run_mode(args.workers, args.login_concurrency, args.samples),
+    }
+    await get_async_engine().dispose()
+    emit(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Débit de /users/me (une requête DB par appel, cache de tokens désactivé)
+en fonction de la taille du pool de connexions.
+
+Usage:
+    python -m benchmarks.bench_pool_size --pool-sizes 1,2,5,10,20 --concurrency 50 --duration 5
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.config import settings
+from src.data.domain import Base, build_async_engine, get_db_session
+from src.data.pool_metrics import get_pool_status
+from src.main import app
+from src.modules.auth.auth_cache import token_cache
+from benchmarks._common import asgi_client, emit, summarize, timed_request
+
+PASSWORD = "Password123"
+
+
+async def run_pool_size(pool_size: int, concurrency: int, duration: float, timeout: float) -> dict:
+    engine = build_async_engine(settings.DATABASE_URL, pool_size=pool_size, max_overflow=0, pool_timeout=timeout)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db_session():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db_session] = override_get_db_session
+    latencies: list[float] = []
+    errors = 0
+
+    async with asgi_client(app) as client:
+        email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+        await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                try:
+                    latency, status_code = await timed_request(client, "GET", "/api/v1/auth/users/me", headers=headers)
+                except Exception:
+                    errors += 1
+                    continue
+                if status_code == 200:
+                    latencies.append(latency)
+                else:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    pool = get_pool_status(engine)
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    return {
+        "pool_size": pool_size,
+        "errors": errors,
+        "users_me": summarize(latencies, elapsed),
+        "pool_wait_seconds_max": round(pool["wait_seconds_max"], 4),
+        "pool_wait_seconds_avg": round(pool["wait_seconds_total"] / max(pool["checkouts"], 1), 6),
+        "pool_timeouts": pool["timeouts"],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pool-sizes", default="1,2,5,10,20")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--pool-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    token_cache.max_size = 0  # Chaque requête doit interroger la base
+
+    setup_engine = build_async_engine(settings.DATABASE_URL)
+    async with setup_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await setup_engine.dispose()
+
+    runs = []
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        runs.append(await run_pool_size(pool_size, args.concurrency, args.duration, args.pool_timeout))
+
+    emit({"benchmark": "pool_size", "concurrency": args.concurrency, "runs": runs})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
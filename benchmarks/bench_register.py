@@ -0,0 +1,85 @@
+"""
+Inscriptions par seconde: ancien chemin (SELECT + add/flush/refresh) contre
+INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+Le hachage bcrypt est calculé une seule fois pour isoler le coût base de données.
+
+Usage:
+    python -m benchmarks.bench_register --signups 2000 --concurrency 16
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from src.data.domain import AsyncSessionLocal, Base, get_async_engine
+from src.modules.auth.auth_dto import UserCreate
+from src.modules.auth.auth_metier import get_password_hash
+from src.modules.auth.auth_model import User
+from src.modules.auth.auth_repo import UserRepository
+from benchmarks._common import emit, summarize
+
+
+async def legacy_signup(user_in: UserCreate, hashed_password: str) -> bool:
+    """Ancien chemin d'inscription, reproduit ici comme référence (retiré de UserRepository)."""
+    async with AsyncSessionLocal() as session:
+        repository = UserRepository(session)
+        if await repository.get_user_by_email(user_in.email):
+            return False
+        db_user = User(email=user_in.email, hashed_password=hashed_password, first_name="", last_name="", is_active=True)
+        session.add(db_user)
+        await session.flush()
+        await session.refresh(db_user)
+        await session.commit()
+        return True
+
+
+async def single_statement_signup(user_in: UserCreate, hashed_password: str) -> bool:
+    async with AsyncSessionLocal() as session:
+        user = await UserRepository(session).insert_user_returning(user_in, hashed_password)
+        await session.commit()
+        return user is not None
+
+
+async def run(signup, signups: int, concurrency: int, hashed_password: str) -> dict:
+    prefix = uuid.uuid4().hex[:8]
+    users = [
+        UserCreate(email=f"{prefix}-{i}@example.com", password="Password123")
+        for i in range(signups)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(user_in: UserCreate) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await signup(user_in, hashed_password)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(user_in) for user_in in users))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--signups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    hashed_password = get_password_hash("Password123")
+    results = {
+        "benchmark": "register",
+        "concurrency": args.concurrency,
+        "legacy": await run(legacy_signup, args.signups, args.concurrency, hashed_password),
+        "single_statement": await run(single_statement_signup, args.signups, args.concurrency, hashed_password),
+    }
+    await get_async_engine().dispose()
+    emit(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
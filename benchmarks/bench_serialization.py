@@ -0,0 +1,79 @@
+"""
+Coût de sérialisation par réponse: chemin FastAPI standard (revalidation contre
+response_model, jsonable puis json.dumps) contre le chemin rapide (modèle validé une fois,
+encodé par pydantic-core/orjson, ou corps pré-encodé).
+
+Usage:
+    python -m benchmarks.bench_serialization --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.main import _HEALTH_BODY
+from src.modules.auth.auth_dto import Token, UserInDB
+from src.modules.auth.auth_router import _USERS_ME_PREFIX, _USERS_ME_SUFFIX
+from src.responses import FastJSONResponse, orjson
+from benchmarks._common import emit
+
+USER = UserInDB(id=42, email="bench@example.com", first_name="Ada", last_name="Lovelace", is_active=True)
+TOKEN = Token(access_token="a" * 180, refresh_token="r" * 43, expires_in=900)
+USERS_ME = {"user_id": 42, "message": "Accès autorisé à la ressource protégée."}
+HEALTH = {"status": "healthy", "service": "auth-api"}
+
+
+async def legacy_body(model_field, content) -> bytes:
+    """Reproduit FastAPI: serialize_response (validation + dump) puis JSONResponse."""
+    return JSONResponse(await serialize_response(field=model_field, response_content=content)).body
+
+
+async def measure(make_body, iterations: int) -> float:
+    """Durée moyenne d'un appel, en microsecondes."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await make_body()
+    return round((time.perf_counter() - start) / iterations * 1e6, 3)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    user_field = create_model_field("Response_register", UserInDB, mode="serialization")
+    token_field = create_model_field("Response_login", Token, mode="serialization")
+
+    async def fast_user():
+        return FastJSONResponse(USER).body
+
+    async def fast_token():
+        return FastJSONResponse(TOKEN).body
+
+    async def fast_users_me():
+        return _USERS_ME_PREFIX + b"42" + _USERS_ME_SUFFIX
+
+    async def fast_health():
+        return _HEALTH_BODY
+
+    cases = {
+        "register": (lambda: legacy_body(user_field, USER), fast_user),
+        "login": (lambda: legacy_body(token_field, TOKEN), fast_token),
+        "users_me": (lambda: legacy_body(None, USERS_ME), fast_users_me),
+        "health": (lambda: legacy_body(None, HEALTH), fast_health),
+    }
+    results = {}
+    for name, (legacy, fast) in cases.items():
+        assert await legacy() == await fast(), f"Sorties différentes pour {name}"
+        legacy_us = await measure(legacy, args.iterations)
+        fast_us = await measure(fast, args.iterations)
+        results[name] = {"legacy_us": legacy_us, "fast_us": fast_us, "speedup": round(legacy_us / fast_us, 2)}
+
+    emit({"benchmark": "serialization", "orjson": orjson is not None, "iterations": args.iterations, "results": results})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
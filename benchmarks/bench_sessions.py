@@ -0,0 +1,166 @@
+"""
+Coût base de données par requête: session « historique » (transaction ouverte dès la
+première requête, connexion gardée jusqu'à la fin de la requête HTTP) contre la session
+actuelle (lectures en autocommit, connexion rendue avant bcrypt).
+
+Pour chaque scénario: allers-retours vers Postgres (BEGIN/COMMIT compris), checkouts
+du pool et durée totale de détention des connexions.
+
+Usage:
+    python -m benchmarks.bench_sessions --requests 50
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.config import settings
+from src.data.domain import Base, get_async_engine, get_db_session
+from src.main import app
+from src.modules.auth import auth_app
+from src.modules.auth.auth_throttle import login_throttle
+from benchmarks._common import asgi_client, emit, summarize, timed_request
+
+PASSWORD = "Password123"
+
+
+class DbCounters:
+    """Compteurs alimentés par les événements du moteur et le query logger d'asyncpg."""
+    def __init__(self):
+        self.statements = 0
+        self.transaction_control = 0
+        self.checkouts = 0
+        self.held_seconds = 0.0
+        self._checked_out_at: dict[int, float] = {}
+
+    def install(self) -> None:
+        sync_engine = get_async_engine().sync_engine
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+
+    def reset(self) -> None:
+        self.statements = self.transaction_control = self.checkouts = 0
+        self.held_seconds = 0.0
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        # BEGIN/COMMIT/ROLLBACK sont envoyés par le pilote, invisibles pour SQLAlchemy
+        dbapi_connection._connection.add_query_logger(self._on_query)
+
+    def _on_query(self, record) -> None:
+        if record.query.lstrip().upper().startswith(("BEGIN", "COMMIT", "ROLLBACK")):
+            self.transaction_control += 1
+
+    def _on_statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        self._checked_out_at[id(connection_record)] = time.perf_counter()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        start = self._checked_out_at.pop(id(connection_record), None)
+        if start is not None:
+            self.held_seconds += time.perf_counter() - start
+
+
+@contextmanager
+def legacy_sessions():
+    """Reproduit l'ancien comportement: session transactionnelle gardée pendant toute la requête."""
+    legacy_factory = sessionmaker(get_async_engine(), class_=AsyncSession, expire_on_commit=False)
+
+    async def legacy_get_db_session():
+        async with legacy_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def keep_session(session):
+        pass
+
+    release_session = auth_app.release_session
+    app.dependency_overrides[get_db_session] = legacy_get_db_session
+    auth_app.release_session = keep_session
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+        auth_app.release_session = release_session
+
+
+async def run_scenario(client, counters: DbCounters, requests: int, method: str, url: str, make_body) -> dict:
+    counters.reset()
+    latencies = []
+    statuses = set()
+    for i in range(requests):
+        latency, status_code = await timed_request(client, method, url, json=make_body(i))
+        latencies.append(latency)
+        statuses.add(status_code)
+    return {
+        "status": sorted(statuses),
+        "round_trips_per_request": round((counters.statements + counters.transaction_control) / requests, 2),
+        "begin_commit_per_request": round(counters.transaction_control / requests, 2),
+        "checkouts_per_request": round(counters.checkouts / requests, 2),
+        "connection_held_ms_per_request": round(counters.held_seconds / requests * 1000, 3),
+        "latency": summarize(latencies),
+    }
+
+
+async def run_mode(counters: DbCounters, requests: int) -> dict:
+    prefix = uuid.uuid4().hex[:8]
+    email = f"bench-{prefix}@example.com"
+    async with asgi_client(app) as client:
+        await client.post("/api/v1/auth/register", json={"email": email, "password": PASSWORD})
+        return {
+            "login_success": await run_scenario(
+                client, counters, requests, "POST", "/api/v1/auth/login",
+                lambda i: {"email": email, "password": PASSWORD},
+            ),
+            "login_unknown_email": await run_scenario(
+                client, counters, requests, "POST", "/api/v1/auth/login",
+                lambda i: {"email": f"missing-{prefix}-{i}@example.com", "password": PASSWORD},
+            ),
+            "login_invalid_payload": await run_scenario(
+                client, counters, requests, "POST", "/api/v1/auth/login",
+                lambda i: {"email": "not-an-email"},
+            ),
+            "register": await run_scenario(
+                client, counters, requests, "POST", "/api/v1/auth/register",
+                lambda i: {"email": f"new-{prefix}-{i}@example.com", "password": PASSWORD},
+            ),
+        }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    settings.LOGIN_RATE_LIMIT_PER_EMAIL = 0
+    settings.LOGIN_RATE_LIMIT_PER_IP = 0
+    login_throttle.gate.limit = 0
+
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await get_async_engine().dispose()  # Les connexions suivantes passent par le query logger
+
+    counters = DbCounters()
+    counters.install()
+    with legacy_sessions():
+        legacy = await run_mode(counters, args.requests)
+    current = await run_mode(counters, args.requests)
+    await get_async_engine().dispose()
+    emit({"benchmark": "sessions", "requests": args.requests, "legacy": legacy, "current": current})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
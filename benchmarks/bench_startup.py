@@ -0,0 +1,108 @@
+"""
+Démarrage de l'application: temps d'import de src.main et délai avant la première requête.
+
+- import: durée de `import src.main` dans un interpréteur neuf (médiane de N essais)
+  et modules les plus coûteux selon `python -X importtime`;
+- first_request: serveur lancé par `python -m src.server` (1 worker); temps jusqu'à la
+  première réponse de /health puis de /ready, et latence du premier /login envoyé
+  avant la fin du préchauffage (à froid) ou après /ready (à chaud).
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+from benchmarks._common import emit, run_metadata
+from benchmarks.bench_endpoints import PASSWORD, prepare_users
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import src.main; print(time.perf_counter() - start)"
+
+
+def measure_import(runs: int) -> dict:
+    durations = [
+        float(subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True).stdout.split()[-1])
+        for _ in range(runs)
+    ]
+    profile = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.main"], capture_output=True, text=True, check=True)
+    modules = []
+    for line in profile.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return {
+        "median_ms": round(statistics.median(durations) * 1000, 1),
+        "min_ms": round(min(durations) * 1000, 1),
+        "slowest_modules": sorted(modules, key=lambda module: module["self_ms"], reverse=True)[:15],
+    }
+
+
+async def wait_for(client: httpx.AsyncClient, path: str, start: float, timeout: float = 60) -> float:
+    """Attend une réponse 200 sur `path`; retourne le délai depuis `start` (secondes)."""
+    deadline = start + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get(path)).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.01)
+    raise RuntimeError(f"{path} n'a pas répondu 200 en {timeout} s")
+
+
+async def measure_first_request(email: str, port: int, wait_ready: bool) -> dict:
+    env = {**os.environ, "WEB_HOST": "127.0.0.1", "API_PORT": str(port), "WEB_WORKERS": "1"}
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "src.server"], env=env, stderr=subprocess.DEVNULL)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            result = {"health_s": round(await wait_for(client, "/health", start), 3)}
+            if wait_ready:
+                result["ready_s"] = round(await wait_for(client, "/ready", start), 3)
+            login_latencies = []
+            for _ in range(2):
+                before = time.perf_counter()
+                response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+                response.raise_for_status()
+                login_latencies.append(round((time.perf_counter() - before) * 1000, 1))
+            result["first_login_ms"], result["second_login_ms"] = login_latencies
+            return result
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LOGIN_RATE_LIMIT_PER_EMAIL", "0")
+    emails = await prepare_users(f"bench-{uuid.uuid4().hex[:8]}", 1)
+
+    emit(
+        {
+            "benchmark": "startup",
+            **run_metadata(),
+            "import": measure_import(args.runs),
+            "first_request_cold": await measure_first_request(emails[0], args.port, wait_ready=False),
+            "first_request_after_ready": await measure_first_request(emails[0], args.port, wait_ready=True),
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
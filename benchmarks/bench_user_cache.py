@@ -0,0 +1,169 @@
+"""
+Cache utilisateurs: taux de hits et coût des lectures de UserRepository, délai d'invalidation.
+
+- reads: lectures par ID (popularité de Zipf sur `--users` comptes) mêlées d'écritures
+  (activation/désactivation, `--write-ratio`), pour chaque backend; taux de hits et durée
+  moyenne d'une lecture (cache compris);
+- invalidation: un « worker » invalide une clé que `--listeners` autres instances du backend
+  ont en cache; délai jusqu'à ce que toutes la voient absente (p50/p95/p99).
+  shm: même segment partagé; redis: cache local de chaque instance, invalidé par pub/sub.
+
+Usage:
+    python -m benchmarks.bench_user_cache --backends none,memory,shm --reads 20000
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.bench_user_cache --backends none,memory,shm,redis
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+
+from benchmarks._common import emit, run_metadata, summarize
+
+
+def make_backend(name: str, tag: str):
+    from src.config import settings
+    from src.modules.auth.auth_user_cache import (
+        InMemoryUserCacheBackend, RedisUserCacheBackend, SharedMemoryUserCacheBackend,
+    )
+
+    if name == "memory":
+        return InMemoryUserCacheBackend(100_000, 60)
+    if name == "shm":
+        return SharedMemoryUserCacheBackend(f"bench_{tag}", 16_384, 512, 60)
+    if name == "redis":
+        return RedisUserCacheBackend(settings.REDIS_URL, 60, InMemoryUserCacheBackend(100_000, 5), prefix=f"bench:{tag}:")
+    return None
+
+
+async def close_backend(backend) -> None:
+    from multiprocessing.shared_memory import SharedMemory
+    from src.modules.auth.auth_user_cache import SharedMemoryUserCacheBackend
+
+    await backend.clear()
+    await backend.stop()
+    if isinstance(backend, SharedMemoryUserCacheBackend):
+        name = backend._segment.name
+        backend.close()
+        SharedMemory(name).unlink()
+
+
+async def measure_reads(backend_name: str, user_ids: list[int], reads: int, write_ratio: float) -> dict:
+    from src.data.domain import AsyncSessionLocal
+    from src.modules.auth.auth_repo import UserRepository
+    from src.modules.auth.auth_user_cache import USER_CACHE_EVENTS, user_cache
+
+    backend = make_backend(backend_name, uuid.uuid4().hex[:8])
+    user_cache.backend = backend
+    if backend is not None:
+        await backend.start()
+    weights = [1 / rank for rank in range(1, len(user_ids) + 1)]
+    rng = random.Random(42)
+    targets = rng.choices(user_ids, weights, k=reads)
+    hits, misses = USER_CACHE_EVENTS.value("hit"), USER_CACHE_EVENTS.value("miss")
+    writes = 0
+    read_time = 0.0
+    try:
+        for user_id in targets:
+            async with AsyncSessionLocal() as session:
+                repository = UserRepository(session)
+                start = time.perf_counter()
+                user = await repository.get_user_by_id(user_id)
+                read_time += time.perf_counter() - start
+                if rng.random() < write_ratio:
+                    await repository.set_user_active(user_id, not user.is_active)
+                    writes += 1
+                await session.commit()
+    finally:
+        if backend is not None:
+            await close_backend(backend)
+        user_cache.backend = None
+    hits, misses = USER_CACHE_EVENTS.value("hit") - hits, USER_CACHE_EVENTS.value("miss") - misses
+    return {
+        "reads": reads,
+        "writes": writes,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "mean_read_us": round(read_time / reads * 1e6, 1),
+    }
+
+
+async def measure_invalidation(backend_name: str, listeners: int, rounds: int) -> dict:
+    tag = uuid.uuid4().hex[:8]
+    publisher = make_backend(backend_name, tag)
+    others = [make_backend(backend_name, tag) for _ in range(listeners)]
+    for backend in (publisher, *others):
+        await backend.start()
+    row = {"id": 1, "email": "bench@example.com", "hashed_password": "x", "first_name": "", "last_name": "", "is_active": True}
+    lags = []
+    try:
+        for i in range(rounds):
+            key = f"id:{i}"
+            await publisher.set_many({key: row})
+            for backend in others:
+                assert (await backend.get_many([key]))[0] is not None
+
+            start = time.perf_counter()
+            await publisher.delete([key])
+            pending = list(others)
+            while pending:
+                # Lecture locale uniquement pour redis (sinon la lecture irait chercher la valeur à jour)
+                pending = [
+                    backend for backend in pending
+                    if (backend.local.get_local(key) if hasattr(backend, "local") else (await backend.get_many([key]))[0]) is not None
+                ]
+                if pending:
+                    await asyncio.sleep(0)
+            lags.append(time.perf_counter() - start)
+    finally:
+        await close_backend(publisher)
+        for backend in others:
+            await backend.stop()
+            if hasattr(backend, "close"):
+                backend.close()
+    return {"listeners": listeners, **summarize(lags)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="none,memory,shm", type=lambda value: value.split(","))
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--write-ratio", type=float, default=0.01)
+    parser.add_argument("--listeners", type=int, default=4, help="Instances recevant les invalidations")
+    parser.add_argument("--rounds", type=int, default=200, help="Invalidations mesurées")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")  # Hachage des comptes de test uniquement
+    from sqlalchemy import select
+    from benchmarks.bench_endpoints import prepare_users
+    from src.data.domain import dispose_engines, get_async_engine
+    from src.modules.auth.auth_model import User
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    await prepare_users(prefix, args.users)
+    async with get_async_engine().connect() as conn:
+        user_ids = (await conn.scalars(select(User.id).where(User.email.startswith(prefix)).order_by(User.id))).all()
+
+    reads = {name: await measure_reads(name, user_ids, args.reads, args.write_ratio) for name in args.backends}
+    invalidation = {
+        name: await measure_invalidation(name, args.listeners, args.rounds)
+        for name in args.backends if name in ("shm", "redis")
+    }
+    await dispose_engines()
+
+    emit(
+        {
+            "benchmark": "user_cache",
+            **run_metadata(),
+            "params": {"users": args.users, "reads": args.reads, "write_ratio": args.write_ratio},
+            "reads": reads,
+            "invalidation": invalidation,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Montée en charge avec le nombre de workers du serveur de production (`python -m src.server`).
+
+Pour chaque nombre de workers, /login (bcrypt, CPU) et /users/me sont mesurés en HTTP;
+le débit devrait croître avec les workers jusqu'au nombre de CPUs disponibles.
+
+Usage:
+    python -m benchmarks.bench_workers --workers 1,2,4 --concurrency 32 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import uuid
+
+import httpx
+
+from benchmarks._common import emit, run_metadata
+from benchmarks.bench_endpoints import app_environment, prepare_users, run_suite, uvicorn_server
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", type=lambda value: [int(n) for n in value.split(",")])
+    parser.add_argument("--endpoints", default="login,users_me", type=lambda value: value.split(","))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    env = app_environment(args)
+    os.environ.update(env)
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    emails = await prepare_users(prefix, 100)
+
+    from src.server import available_cpus
+
+    runs = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    for workers in args.workers:
+        async with uvicorn_server(workers, args.port, env) as base_url:
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                results = await run_suite(client, args, emails, prefix)
+        runs.append({
+            "workers": workers,
+            **{f"{endpoint}_rps": result["throughput_rps"] for endpoint, result in results.items()},
+            "results": results,
+        })
+
+    emit(
+        {
+            "benchmark": "workers",
+            **run_metadata(),
+            "available_cpus": available_cpus(),
+            "params": {"concurrency": args.concurrency, "duration": args.duration, "bcrypt_rounds": args.bcrypt_rounds},
+            "runs": runs,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
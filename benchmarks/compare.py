@@ -0,0 +1,43 @@
+"""
+Compare deux résultats de benchmarks.bench_endpoints (ex: avant/après un commit).
+
+Usage:
+    python -m benchmarks.compare base.json candidate.json
+"""
+import argparse
+import json
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    if base["params"] != candidate["params"]:
+        print(f"Attention: paramètres différents\n  {base['params']}\n  {candidate['params']}")
+    print(f"{base['commit']} -> {candidate['commit']}")
+    print(f"{'endpoint':<10} {'métrique':<15} {'base':>10} {'candidat':>10} {'écart':>8}")
+    for endpoint, before in base["results"].items():
+        after = candidate["results"].get(endpoint)
+        if after is None:
+            continue
+        for metric in METRICS:
+            print(f"{endpoint:<10} {metric:<15} {before[metric]:>10} {after[metric]:>10} {delta(before[metric], after[metric]):>8}")
+
+
+if __name__ == "__main__":
+    main()
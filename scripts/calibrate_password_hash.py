@@ -0,0 +1,76 @@
+"""
+Calibrage du coût de hachage des mots de passe sur la machine courante.
+
+Mesure la durée médiane d'une vérification pour des coûts croissants et retient le plus
+élevé qui reste sous la cible. Les lignes à reporter dans l'environnement sont affichées;
+les hachages existants sont refaits à la connexion suivante de chaque utilisateur.
+
+Usage:
+    python scripts/calibrate_password_hash.py --scheme bcrypt --target-ms 250
+    python scripts/calibrate_password_hash.py --scheme argon2 --memory-cost 65536 --target-ms 250
+"""
+import argparse
+import statistics
+import time
+
+from src.config import settings
+from src.modules.auth.auth_metier import PASSWORD_SCHEMES, build_password_context
+
+SAMPLE_PASSWORD = "Calibration-Password-123"
+
+
+def median_verify_ms(context, samples: int) -> float:
+    hashed = context.hash(SAMPLE_PASSWORD)
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def calibrate(scheme: str, target_ms: float, samples: int, memory_cost: int, parallelism: int) -> tuple[int, list[dict]]:
+    """
+    Coûts essayés dans l'ordre croissant (bcrypt: log2 des itérations à partir de 4,
+    argon2id: nombre de passes à partir de 1); arrêt au premier coût qui dépasse la cible.
+    """
+    cost = 4 if scheme == "bcrypt" else 1
+    chosen, measures = cost, []
+    while True:
+        if scheme == "bcrypt":
+            context = build_password_context(scheme, bcrypt_rounds=cost)
+        else:
+            context = build_password_context(
+                scheme, argon2_time_cost=cost, argon2_memory_cost=memory_cost, argon2_parallelism=parallelism,
+            )
+        verify_ms = median_verify_ms(context, samples)
+        measures.append({"cost": cost, "verify_ms": round(verify_ms, 1)})
+        if verify_ms > target_ms:
+            return chosen, measures
+        chosen, cost = cost, cost + 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", choices=PASSWORD_SCHEMES, default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--target-ms", type=float, default=250, help="Durée maximale d'une vérification (ms)")
+    parser.add_argument("--samples", type=int, default=5, help="Vérifications mesurées par coût")
+    parser.add_argument("--memory-cost", type=int, default=settings.PASSWORD_ARGON2_MEMORY_COST, help="argon2id: mémoire (Kio)")
+    parser.add_argument("--parallelism", type=int, default=settings.PASSWORD_ARGON2_PARALLELISM, help="argon2id: nombre de voies")
+    args = parser.parse_args()
+
+    cost, measures = calibrate(args.scheme, args.target_ms, args.samples, args.memory_cost, args.parallelism)
+    for measure in measures:
+        print(f"# coût {measure['cost']}: {measure['verify_ms']} ms")
+
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    if args.scheme == "bcrypt":
+        print(f"PASSWORD_BCRYPT_ROUNDS={cost}")
+    else:
+        print(f"PASSWORD_ARGON2_TIME_COST={cost}")
+        print(f"PASSWORD_ARGON2_MEMORY_COST={args.memory_cost}")
+        print(f"PASSWORD_ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,23 @@ done
 
 echo "PostgreSQL est accessible. Démarrage de l'application..."
 
-# Appliquer les migrations Alembic
+# Appliquer les migrations Alembic sans bloquer le trafic des autres instances de l'API
+# (MIGRATION_MODE=online: index CONCURRENTLY, remplissages par lots, lock_timeout).
+# Une révision qui n'obtient pas son verrou échoue sans rien garder: nouvel essai après une pause.
+# Les révisions de contraction attendent MIGRATION_CONTRACT=true (toutes les instances à jour).
 echo "Application des migrations de base de données..."
-alembic upgrade head
+MIGRATION_ATTEMPTS="${MIGRATION_ATTEMPTS:-5}"
+MIGRATION_RETRY_DELAY="${MIGRATION_RETRY_DELAY:-5}"
+attempt=1
+until MIGRATION_MODE="${MIGRATION_MODE:-online}" alembic upgrade head; do
+  if [ "$attempt" -ge "$MIGRATION_ATTEMPTS" ]; then
+    echo "Échec des migrations après $attempt tentatives"
+    exit 1
+  fi
+  echo "Migrations interrompues (tentative $attempt/$MIGRATION_ATTEMPTS) - nouvel essai dans ${MIGRATION_RETRY_DELAY}s..."
+  attempt=$((attempt + 1))
+  sleep "$MIGRATION_RETRY_DELAY"
+done
 
 # Exécute la commande principale spécifiée dans docker-compose.yml
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Génère une clé de signature JWT pour la rotation des clés.
+
+Usage:
+    python scripts/generate_jwt_key.py keys/ 2026-01 --algorithm RS256
+
+Crée keys/<kid>.pem (clé privée). Pour retirer une ancienne clé tout en acceptant
+encore ses tokens, ne conserver que sa partie publique: keys/<kid>.pub.pem.
+"""
+import argparse
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("keys_dir", help="Dossier JWT_KEYS_DIR")
+    parser.add_argument("kid", help="Identifiant de la clé (en-tête kid)")
+    parser.add_argument("--algorithm", choices=["RS256", "ES256"], default="RS256")
+    parser.add_argument("--with-public", action="store_true", help="Écrit aussi <kid>.pub.pem")
+    args = parser.parse_args()
+
+    if args.algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+
+    keys_dir = Path(args.keys_dir)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    private_path = keys_dir / f"{args.kid}.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    private_path.chmod(0o600)
+    print(f"Clé privée écrite: {private_path}")
+
+    if args.with_public:
+        public_path = keys_dir / f"{args.kid}.pub.pem"
+        public_path.write_bytes(private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ))
+        print(f"Clé publique écrite: {public_path}")
+
+
+if __name__ == "__main__":
+    main()
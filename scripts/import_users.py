@@ -0,0 +1,47 @@
+"""
+Import en masse d'utilisateurs depuis un fichier CSV (avec en-tête) ou JSONL.
+
+Usage:
+    python scripts/import_users.py users.csv --rejects rejects.jsonl
+    python scripts/import_users.py users.jsonl --format jsonl --chunk-size 5000
+
+Les lignes rejetées (invalides ou doublons) sont écrites au format JSONL dans le fichier de rejets.
+"""
+import argparse
+import asyncio
+import logging
+
+from src.config import settings
+from src.data.domain import dispose_engines
+from src.modules.auth.auth_import import import_users, iter_lines_from_file, parse_records
+from src.modules.auth.auth_metier import shutdown_password_executor
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Fichier à importer")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Format du fichier (déduit de l'extension par défaut)")
+    parser.add_argument("--rejects", default="rejects.jsonl", help="Fichier recevant les lignes rejetées")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+
+    try:
+        with open(args.path, encoding="utf-8", newline="") as source, \
+                open(args.rejects, "w", encoding="utf-8") as rejects:
+            report = await import_users(
+                parse_records(iter_lines_from_file(source), fmt),
+                chunk_size=args.chunk_size,
+                on_reject=lambda rejected: rejects.write(rejected.model_dump_json() + "\n"),
+            )
+    finally:
+        shutdown_password_executor()
+        await dispose_engines()
+
+    print(f"{report.imported} importés, {report.rejected} rejetés sur {report.total} lignes (rejets: {args.rejects})")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
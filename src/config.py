@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -7,11 +9,111 @@ class Settings(BaseSettings):
     Utilise Pydantic pour la validation et la gestion des types.
     """
     SECRET_KEY: str = Field(..., description="Clé secrète pour le hachage des tokens JWT")
-    ALGORITHM: str = Field("HS256", description="Algorithme de signature JWT")
+    ALGORITHM: str = Field("HS256", description="Algorithme de signature JWT (HS256, RS256, ES256...)")
+    JWT_KEYS_DIR: str | None = Field(None, description="Dossier des clés PEM (<kid>.pem privée, <kid>.pub.pem vérification seule) pour RS*/ES*")
+    JWT_ACTIVE_KID: str | None = Field(None, description="Identifiant (kid) de la clé utilisée pour signer")
+    JWT_ACCEPT_LEGACY_HS256: bool = Field(True, description="Accepter les tokens sans kid signés avec SECRET_KEY (migration depuis HS256)")
+    JWT_BACKEND: Literal["fast", "jose"] = Field("fast", description="Codec JWT: fast (HMAC précalculé, python-jose pour RS*/ES*) ou jose (python-jose pour tout)")
     API_PORT: int = Field(8000, description="Port de l'API")
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field("INFO", description="Niveau minimal des logs")
+    LOG_FORMAT: Literal["json", "text"] = Field("json", description="Format des logs sur stderr: une ligne JSON ou texte lisible")
+    LOG_QUEUE_SIZE: int = Field(10_000, description="Enregistrements en attente d'écriture (au-delà: abandonnés et comptés)")
+    LOG_SAMPLE_BURST: int = Field(20, description="Avertissements identiques écrits par fenêtre avant échantillonnage (0 = pas d'échantillonnage)")
+    LOG_SAMPLE_EVERY: int = Field(100, description="Au-delà de LOG_SAMPLE_BURST, un avertissement écrit sur N (0 = aucun)")
+    LOG_SAMPLE_WINDOW_SECONDS: float = Field(60, description="Durée de la fenêtre d'échantillonnage des avertissements")
+
+    WEB_HOST: str = Field("0.0.0.0", description="Adresse d'écoute du serveur (python -m src.server)")
+    WEB_WORKERS: int | None = Field(None, description="Nombre de processus uvicorn (défaut: CPUs disponibles, quota cgroup compris)")
+    WEB_BACKLOG: int = Field(2048, description="File d'attente des connexions TCP non encore acceptées")
+    WEB_KEEPALIVE_SECONDS: int = Field(5, description="Durée de maintien des connexions HTTP inactives")
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = Field(30, description="Délai laissé aux requêtes en cours lors d'un arrêt ou redémarrage")
+    WEB_ACCESS_LOG: bool = Field(False, description="Journal d'accès uvicorn (une ligne par requête)")
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(15, description="Durée de vie des access tokens")
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(30, description="Durée de vie des refresh tokens")
+    REVOCATION_REFRESH_INTERVAL_SECONDS: float = Field(5, description="Intervalle de rechargement de la liste de révocation")
+    REVOCATION_REFRESH_OVERLAP_SECONDS: float = Field(
+        60,
+        description="Marge relue à chaque rechargement avant la dernière révocation vue (transactions validées en retard)"
+    )
 
     DATABASE_URL: str = Field(..., description="URL de connexion complète à la base de données (postgresql+asyncpg)")
-    
+    DB_POOL_SIZE: int = Field(5, description="Nombre de connexions gardées ouvertes dans le pool")
+    DB_MAX_OVERFLOW: int = Field(10, description="Connexions supplémentaires autorisées au-delà de DB_POOL_SIZE")
+    DB_POOL_TIMEOUT: float = Field(30, description="Attente maximale (secondes) d'une connexion libre avant erreur")
+    DB_POOL_RECYCLE: int = Field(1800, description="Âge maximal (secondes) d'une connexion avant renouvellement (-1 = jamais)")
+    DB_POOL_PRE_PING: bool = Field(False, description="Vérifie la connexion à chaque checkout (un aller-retour de plus)")
+    DB_STATEMENT_CACHE_SIZE: int = Field(100, description="Taille du cache de requêtes préparées asyncpg par connexion (0 = désactivé)")
+    DB_POOL_WARMUP_CONNECTIONS: int | None = Field(None, description="Connexions ouvertes et préparées au démarrage (défaut: DB_POOL_SIZE, 0 = aucune)")
+    REPLICA_DATABASE_URLS: list[str] = Field(default_factory=list, description="URLs des réplicas en lecture (JSON: [\"postgresql+asyncpg://...\"]), vide = tout sur le primaire")
+    REPLICA_STRATEGY: Literal["round_robin", "least_connections"] = Field("round_robin", description="Choix du réplica pour une lecture")
+    REPLICA_RETRY_SECONDS: float = Field(30, description="Durée d'écartement d'un réplica après une erreur de connexion")
+
+    MIGRATION_MODE: Literal["standard", "online"] = Field(
+        "standard",
+        description="Migrations Alembic: standard (une transaction, base vide ou maintenance) ou online (index CONCURRENTLY, remplissages par lots ralentis, lock_timeout)"
+    )
+    MIGRATION_LOCK_TIMEOUT_MS: int = Field(2000, description="Mode online: attente maximale d'un verrou avant échec de la révision (0 = illimitée)")
+    MIGRATION_STATEMENT_TIMEOUT_MS: int = Field(60_000, description="Mode online: durée maximale d'une requête de migration, hors construction d'index (0 = illimitée)")
+    MIGRATION_BACKFILL_BATCH_SIZE: int = Field(10_000, description="Lignes (plage d'IDs) mises à jour par transaction lors d'un remplissage")
+    MIGRATION_BACKFILL_PAUSE_SECONDS: float = Field(0.1, description="Mode online: pause entre deux lots de remplissage")
+    MIGRATION_CONTRACT: bool = Field(
+        False,
+        description="Mode online: applique les révisions de contraction (ancien schéma retiré), une fois toutes les instances de l'API mises à jour"
+    )
+
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "argon2"] = Field("bcrypt", description="Algorithme des nouveaux hachages (argon2 = argon2id, paquet argon2-cffi)")
+    PASSWORD_BCRYPT_ROUNDS: int = Field(12, description="Coût bcrypt (log2 du nombre d'itérations) des nouveaux hachages")
+    PASSWORD_ARGON2_TIME_COST: int = Field(3, description="Nombre de passes argon2id")
+    PASSWORD_ARGON2_MEMORY_COST: int = Field(65536, description="Mémoire argon2id par hachage (Kio)")
+    PASSWORD_ARGON2_PARALLELISM: int = Field(2, description="Nombre de voies (threads) argon2id")
+    PASSWORD_HASH_WORKERS: int | None = Field(
+        None,
+        description="Taille du pool de hachage des mots de passe (défaut: nombre de cœurs, 0 = exécution sur la boucle d'événements)"
+    )
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = Field(
+        "thread",
+        description="Type de pool utilisé pour bcrypt: threads (bcrypt libère le GIL) ou processus"
+    )
+
+    TOKEN_CACHE_SIZE: int = Field(10_000, description="Nombre maximal de tokens vérifiés gardés en cache (0 = désactivé)")
+    TOKEN_CACHE_TTL_SECONDS: float = Field(60, description="Durée de vie maximale d'une entrée du cache de tokens")
+
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = Field(10, description="Tentatives de connexion autorisées par email et par fenêtre (0 = illimité)")
+    LOGIN_RATE_LIMIT_PER_IP: int = Field(100, description="Tentatives de connexion autorisées par IP et par fenêtre (0 = illimité)")
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = Field(60, description="Durée de la fenêtre glissante des limites de connexion")
+    LOGIN_RATE_LIMIT_BACKEND: Literal["memory", "redis"] = Field("memory", description="Stockage des fenêtres: mémoire du worker ou Redis partagé")
+    REDIS_URL: str | None = Field(None, description="URL Redis (redis://host:6379/0) pour les backends partagés")
+    MAX_CONCURRENT_PASSWORD_CHECKS: int = Field(64, description="Opérations bcrypt simultanées maximales par worker (0 = illimité)")
+    PASSWORD_CHECK_RETRY_AFTER_SECONDS: int = Field(1, description="Valeur de Retry-After renvoyée en cas de surcharge")
+
+    AUDIT_QUEUE_SIZE: int = Field(10_000, description="Événements d'authentification en attente d'écriture (au-delà: abandonnés et comptés, 0 = journal désactivé)")
+    AUDIT_BATCH_SIZE: int = Field(500, description="Nombre maximal d'événements insérés par requête dans login_events")
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = Field(1.0, description="Délai maximal avant l'écriture d'un lot incomplet")
+
+    LOGIN_TRACKING_INTERVAL_SECONDS: float = Field(
+        10, description="Intervalle d'écriture groupée de last_login_at / login_count (0 = suivi désactivé)"
+    )
+    LOGIN_TRACKING_BATCH_SIZE: int = Field(1000, description="Utilisateurs mis à jour par requête UPDATE ... FROM (VALUES ...)")
+
+    USER_CACHE_BACKEND: Literal["none", "memory", "shm", "redis"] = Field(
+        "none",
+        description="Cache des lectures d'utilisateurs: mémoire du worker, mémoire partagée entre workers d'une machine, ou Redis"
+    )
+    USER_CACHE_SIZE: int = Field(10_000, description="Entrées du cache utilisateurs (cases du segment partagé, cache local devant Redis)")
+    USER_CACHE_TTL_SECONDS: float = Field(30, description="Durée de vie maximale d'une entrée du cache utilisateurs")
+    USER_CACHE_LOCAL_TTL_SECONDS: float = Field(5, description="Backend redis: durée de vie du cache local de chaque worker")
+    USER_CACHE_SHM_NAME: str = Field("auth_user_cache", description="Backend shm: nom du segment de mémoire partagée")
+    USER_CACHE_SHM_SLOT_BYTES: int = Field(512, description="Backend shm: taille d'une case (les lignes plus longues ne sont pas mises en cache)")
+
+    INTERNAL_ENDPOINTS_TOKEN: str | None = Field(
+        None,
+        description="Jeton Bearer exigé sur /metrics et /internal/* (non défini = endpoints désactivés, 404)"
+    )
+    ADMIN_USER_IDS: list[int] = Field(default_factory=list, description="IDs des utilisateurs autorisés sur les endpoints d'administration")
+    IMPORT_CHUNK_SIZE: int = Field(1000, description="Nombre de lignes chargées par COPY lors d'un import en masse")
+    IMPORT_HASH_CONCURRENCY: int = Field(2, description="Hachages simultanés d'un import en masse (le reste du pool de hachage reste aux connexions)")
+    EXPORT_BATCH_SIZE: int = Field(1000, description="Nombre de lignes lues par page lors d'un export d'utilisateurs")
+
     model_config = SettingsConfigDict(
         env_file='.env',
         env_file_encoding='utf-8',
@@ -31,6 +133,4 @@ def get_db_url_safe():
             return f"{url.split('://')[0]}://{user_pass[0]}:***@{host_port}"
         except IndexError:
             return url 
-    return url
-
-print(f"Configuration chargée. DB URL: {get_db_url_safe()}")
\ No newline at end of file
+    return url
\ No newline at end of file
@@ -1,29 +1,140 @@
+from contextlib import AsyncExitStack
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import Select, event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from src.config import settings
+from src.data.pool_metrics import InstrumentedAsyncPool
+from src.data.replicas import ReplicaSet
 
 Base = declarative_base()
 
-# 1. Création du moteur Asynchrone
-# Utilise l'URL de la base de données définie dans config.py
-async_engine = create_async_engine(
-    settings.DATABASE_URL, 
-    echo=False, # Mettre à True pour le débogage SQL
-    future=True
-)
 
-# 2. Création de la Session Locale Asynchrone
+def build_async_engine(url: str, **overrides) -> AsyncEngine:
+    """
+    Crée un moteur asynchrone avec le pool configuré dans Settings (DB_POOL_*).
+    Les paramètres peuvent être surchargés (ex: benchmarks, moteurs secondaires).
+    """
+    options = dict(
+        echo=False, # Mettre à True pour le débogage SQL
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+
+# 1. Moteur Asynchrone, créé à la première utilisation (au plus tard par le warm-up du lifespan)
+# et non à l'import: importer l'application ne coûte ni dialecte ni pool.
+_async_engine: AsyncEngine | None = None
+_read_engine: AsyncEngine | None = None
+_replicas: ReplicaSet | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Moteur principal (DATABASE_URL)."""
+    global _async_engine, _read_engine
+    if _async_engine is None:
+        _async_engine = build_async_engine(settings.DATABASE_URL)
+        # Même pool, connexions en AUTOCOMMIT: une lecture seule = un seul aller-retour (ni BEGIN ni COMMIT)
+        _read_engine = _async_engine.execution_options(isolation_level="AUTOCOMMIT")
+    return _async_engine
+
+
+def get_read_engine() -> AsyncEngine:
+    """Vue AUTOCOMMIT du moteur principal, utilisée pour les lectures hors transaction."""
+    get_async_engine()
+    return _read_engine
+
+
+def get_replicas() -> ReplicaSet:
+    """Réplicas en lecture (optionnels), même configuration de pool que le primaire."""
+    global _replicas
+    if _replicas is None:
+        _replicas = ReplicaSet(
+            [build_async_engine(url) for url in settings.REPLICA_DATABASE_URLS],
+            strategy=settings.REPLICA_STRATEGY,
+            retry_seconds=settings.REPLICA_RETRY_SECONDS,
+        )
+    return _replicas
+
+
+async def dispose_engines() -> None:
+    """Ferme les connexions des moteurs déjà créés (arrêt du worker, fin de test)."""
+    if _replicas is not None:
+        await _replicas.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+async def warm_up_pool(connections: int, statements: list) -> None:
+    """
+    Ouvre `connections` connexions du pool (gardées ouvertes ensemble pour qu'elles soient
+    distinctes) et y exécute les requêtes fréquentes: elles sont compilées (cache SQLAlchemy)
+    et préparées (cache asyncpg par connexion) avant la première requête HTTP.
+    """
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(get_read_engine().connect())
+            for stmt in statements:
+                await conn.execute(stmt)
+
+
+class RoutingSession(Session):
+    """
+    Session qui n'ouvre une transaction que pour écrire.
+    Les SELECT (hors FOR UPDATE) passent par une connexion en autocommit tant que la session
+    n'a rien écrit ni rien en attente d'écriture ; dès la première écriture (ou après
+    `begin_write`), tout passe par la connexion transactionnelle (lecture de ses propres
+    écritures) jusqu'à la fin de la transaction.
+    La connexion n'est prise dans le pool qu'à la première requête.
+    """
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("writes") or self.new or self.deleted or self.dirty or not _is_plain_read(clause):
+            self.info["writes"] = True
+            return get_async_engine().sync_engine
+        return get_read_engine().sync_engine
+
+
+def _is_plain_read(clause) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_write_routing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writes", None)
+
+
+def begin_write(session: AsyncSession) -> None:
+    """
+    À appeler avant une lecture suivie d'une écriture (lecture-modification-écriture): la
+    lecture passe déjà par la connexion transactionnelle. Sinon elle prendrait une connexion
+    en autocommit, gardée jusqu'à la fin de la session en plus de celle de l'écriture.
+    """
+    session.info["writes"] = True
+
+
+# 2. Création de la Session Locale Asynchrone (le moteur est choisi par RoutingSession.get_bind)
 AsyncSessionLocal = sessionmaker(
-    async_engine, 
     class_=AsyncSession, 
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dépendance FastAPI pour injecter une session DB asynchrone.
-    Ouvre une session au début de la requête et la ferme (ou la rollback) à la fin.
+    Aucune connexion n'est prise tant que la session n'exécute pas de requête, et une requête
+    en lecture seule ne coûte ni BEGIN ni COMMIT. Valide (ou annule) à la fin.
+    À déclarer avec Depends(get_db_session, scope="function") pour libérer la connexion
+    avant l'envoi de la réponse.
     """
     async with AsyncSessionLocal() as session:
         try:
@@ -35,10 +146,33 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+async def release_session(session: AsyncSession) -> None:
+    """
+    Termine l'unité de travail en cours: valide les écritures éventuelles et rend
+    immédiatement les connexions au pool. La session reste utilisable ensuite.
+    À appeler dès la dernière requête, avant un traitement long (ex: bcrypt) ou la réponse.
+    """
+    await session.commit()
+    await session.close()
+
 # 3. Fonction pour Alembic
 def get_base_metadata():
     """
     Retourne les métadonnées de la Base pour la configuration d'Alembic.
     Ceci est utilisé dans src/alembic/env.py.
     """
-    return Base.metadata
\ No newline at end of file
+    return Base.metadata
+
+
+async def replica_scalar(session: AsyncSession, stmt):
+    """
+    Lecture scalaire routée vers un réplica. Elle reste sur le primaire (via `session`)
+    si la session a déjà écrit (lecture de ses propres écritures), si aucun réplica n'est
+    disponible ou si le réplica ne trouve pas la ligne (retard de réplication).
+    """
+    replicas = get_replicas()
+    if replicas and not session.info.get("writes"):
+        result = await replicas.scalar(stmt)
+        if result is not None:
+            return result
+    return await session.scalar(stmt)
@@ -0,0 +1,146 @@
+"""
+Opérations de migration Alembic compatibles avec le trafic de l'API (MIGRATION_MODE=online).
+
+En mode standard (base vide, tests, fenêtre de maintenance), ces fonctions se comportent
+comme les opérations `op.*` habituelles, dans la transaction de la révision. En mode online:
+
+- index créés et supprimés avec CONCURRENTLY, hors transaction: les écritures sur la table
+  continuent pendant la construction (statement_timeout désactivé le temps de l'index);
+- remplissages par plages d'IDs, une transaction par lot, avec une pause entre les lots et
+  la progression dans les logs d'Alembic;
+- NOT NULL posé via une contrainte CHECK validée sans verrou exclusif (pas de parcours de
+  la table sous ACCESS EXCLUSIVE);
+- changements de schéma en deux temps (expand/contract): la révision d'expansion ajoute le
+  nouveau schéma en restant compatible avec la version de l'application encore en service;
+  la révision de contraction (`contract()`) retire l'ancien schéma et n'est appliquée qu'avec
+  MIGRATION_CONTRACT, une fois toutes les instances mises à jour.
+
+lock_timeout et statement_timeout sont positionnés par alembic/env.py: une révision qui
+n'obtient pas son verrou échoue rapidement au lieu de bloquer les connexions derrière elle,
+et peut être relancée (scripts/entrypoint.sh).
+"""
+from contextlib import contextmanager
+import logging
+import time
+from typing import Iterator, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import settings
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def is_online() -> bool:
+    return settings.MIGRATION_MODE == "online"
+
+
+class ContractPending(Exception):
+    """Révision de contraction atteinte en mode online sans MIGRATION_CONTRACT."""
+
+
+def contract() -> None:
+    """
+    À appeler en tête d'une révision de contraction, avant toute opération. En mode online
+    sans MIGRATION_CONTRACT, la révision n'est pas appliquée: alembic/env.py arrête les
+    migrations juste avant elle, sans erreur (les révisions précédentes restent appliquées).
+    """
+    if is_online() and not settings.MIGRATION_CONTRACT:
+        raise ContractPending(op.get_context().get_current_revision())
+
+
+@contextmanager
+def _without_statement_timeout() -> Iterator[None]:
+    bind = op.get_bind()
+    bind.exec_driver_sql("SET statement_timeout = 0")
+    try:
+        yield
+    finally:
+        bind.exec_driver_sql(f"SET statement_timeout = {settings.MIGRATION_STATEMENT_TIMEOUT_MS}")
+
+
+def _index_state(name: str) -> bool | None:
+    """True si l'index existe et est valide, False s'il est invalide (CONCURRENTLY interrompu), None s'il n'existe pas."""
+    return op.get_bind().scalar(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+
+
+def create_index(name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+    """op.create_index; en mode online, CREATE INDEX CONCURRENTLY hors transaction (relançable)."""
+    if not is_online():
+        op.create_index(name, table, list(columns), unique=unique)
+        return
+    with op.get_context().autocommit_block(), _without_statement_timeout():
+        state = _index_state(name)
+        if state:
+            return
+        if state is False:
+            # Reste d'une construction interrompue: inutilisable mais maintenu à chaque écriture
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        logger.info("Construction de l'index %s sur %s (CONCURRENTLY)", name, table)
+        op.create_index(name, table, list(columns), unique=unique, postgresql_concurrently=True)
+
+
+def drop_index(name: str, table: str) -> None:
+    """op.drop_index; en mode online, DROP INDEX CONCURRENTLY hors transaction."""
+    if not is_online():
+        op.drop_index(name, table_name=table)
+        return
+    with op.get_context().autocommit_block(), _without_statement_timeout():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def backfill(table: str, update_sql: str, batch_size: int | None = None) -> int:
+    """
+    Exécute `update_sql` par plages d'IDs de `table`: la requête reçoit les paramètres
+    :start (inclus) et :end (exclu) et doit être idempotente (ex: `WHERE colonne IS NULL`).
+    En mode online, une transaction par lot et MIGRATION_BACKFILL_PAUSE_SECONDS entre deux lots.
+    Retourne le nombre de lignes mises à jour.
+    """
+    batch_size = batch_size or settings.MIGRATION_BACKFILL_BATCH_SIZE
+    statement = sa.text(update_sql)
+
+    def run() -> int:
+        bind = op.get_bind()
+        low, high = bind.execute(sa.text(f"SELECT min(id), max(id) FROM {table}")).one()
+        if low is None:
+            return 0
+        updated = 0
+        started = time.monotonic()
+        for start in range(low, high + 1, batch_size):
+            updated += bind.execute(statement, {"start": start, "end": start + batch_size}).rowcount
+            done = min(start + batch_size, high + 1) - low
+            logger.info(
+                "Remplissage de %s: %d/%d IDs (%.0f %%), %d lignes mises à jour, %.1f s",
+                table, done, high - low + 1, 100 * done / (high - low + 1), updated, time.monotonic() - started,
+            )
+            if is_online() and settings.MIGRATION_BACKFILL_PAUSE_SECONDS > 0:
+                time.sleep(settings.MIGRATION_BACKFILL_PAUSE_SECONDS)
+        return updated
+
+    if not is_online():
+        return run()
+    with op.get_context().autocommit_block():
+        return run()
+
+
+def set_not_null(table: str, column: str) -> None:
+    """
+    ALTER COLUMN ... SET NOT NULL. En mode online, la vérification des lignes existantes est
+    faite par une contrainte CHECK NOT VALID puis VALIDATE (verrou compatible avec les
+    écritures); SET NOT NULL la réutilise sans parcourir la table (PostgreSQL >= 12).
+    """
+    if not is_online():
+        op.alter_column(table, column, nullable=False)
+        return
+    constraint = f"ck_{table}_{column}_not_null"
+    op.execute(
+        f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}, "
+        f"ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID"
+    )
+    with op.get_context().autocommit_block(), _without_statement_timeout():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+    op.alter_column(table, column, nullable=False)
+    op.drop_constraint(constraint, table)
@@ -0,0 +1,61 @@
+from dataclasses import asdict, dataclass
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolStats:
+    """Compteurs cumulés des demandes de connexion au pool."""
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Pool asynchrone standard qui mesure le temps d'attente de chaque checkout
+    (attente d'une connexion libre ou ouverture d'une nouvelle) et compte les timeouts.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.stats.wait_seconds_total += waited
+            self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, waited)
+        self.stats.checkouts += 1
+        return connection
+
+    def recreate(self):
+        # Conserve les compteurs lorsque le moteur recrée son pool (ex: dispose())
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def get_pool_status(engine: AsyncEngine) -> dict:
+    """Photographie de l'état du pool d'un moteur (connexions et compteurs)."""
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(asdict(stats))
+    return status
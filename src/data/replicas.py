@@ -0,0 +1,98 @@
+import itertools
+import logging
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.data.pool_metrics import get_pool_status
+from src.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+REPLICA_READS = REGISTRY.counter(
+    "db_replica_reads_total", "Lectures routées vers les réplicas par résultat", ("outcome",)
+)
+
+# Erreurs qui écartent le réplica: connexion refusée ou perdue, pool saturé, erreur du serveur
+REPLICA_ERRORS = (exc.DBAPIError, exc.TimeoutError, OSError)
+
+
+class Replica:
+    """Moteur d'un réplica et son état de santé (suivi passif, à partir des erreurs de lecture)."""
+    def __init__(self, engine: AsyncEngine):
+        # Lectures en autocommit: un seul aller-retour par requête
+        self.engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.failures = 0
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def status(self) -> dict:
+        return {"name": self.name, "healthy": self.healthy, "failures": self.failures, **get_pool_status(self.engine)}
+
+
+class ReplicaSet:
+    """
+    Réplicas en lecture. Chaque lecture choisit un réplica sain (tour à tour ou le moins
+    chargé); un réplica en erreur est écarté pendant `retry_seconds` puis réessayé.
+    Sans réplica sain, l'appelant lit sur le primaire.
+    """
+    def __init__(self, engines: list[AsyncEngine], strategy: str = "round_robin", retry_seconds: float = 30):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.strategy = strategy
+        self.retry_seconds = retry_seconds
+        self._next = itertools.cycle(self.replicas) if self.replicas else None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda replica: replica.engine.pool.checkedout())
+        for _ in range(len(self.replicas)):
+            replica = next(self._next)
+            if replica.healthy:
+                return replica
+        return None
+
+    def mark_failed(self, replica: Replica, error: Exception) -> None:
+        replica.failures += 1
+        replica.down_until = time.monotonic() + self.retry_seconds
+        logger.warning("Réplica %s écarté pendant %ss: %s", replica.name, self.retry_seconds, type(error).__name__)
+
+    async def scalar(self, stmt):
+        """
+        Exécute une lecture scalaire sur un réplica, dans une session courte (la connexion
+        est rendue aussitôt). Retourne None si aucun réplica n'a pu répondre ou si la ligne
+        n'y est pas (encore) visible: l'appelant relit alors sur le primaire.
+        """
+        # Un réplica en erreur est écarté et le suivant est essayé
+        for _ in range(len(self.replicas)):
+            replica = self.choose()
+            if replica is None:
+                break
+            try:
+                async with AsyncSession(replica.engine, expire_on_commit=False) as session:
+                    result = await session.scalar(stmt)
+            except REPLICA_ERRORS as e:
+                REPLICA_READS.inc("error")
+                self.mark_failed(replica, e)
+                continue
+            REPLICA_READS.inc("hit" if result is not None else "miss")
+            return result
+        REPLICA_READS.inc("no_replica")
+        return None
+
+    def status(self) -> list[dict]:
+        return [replica.status() for replica in self.replicas]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
@@ -0,0 +1,152 @@
+"""
+Journalisation hors de la boucle d'événements.
+
+Les appels `logger.info(...)` des requêtes ne font qu'ajouter l'enregistrement à une file
+en mémoire (QueueHandler): la mise en forme du message, l'encodage JSON et l'écriture
+sur stderr sont faits par un thread dédié (QueueListener). Les messages utilisent le
+formatage paresseux (`logger.warning("... %s", email)`): le gabarit sert de clé
+d'échantillonnage et le message n'est construit que s'il est écrit.
+
+- file pleine: l'enregistrement est abandonné et compté, la requête n'attend jamais;
+- avertissements répétitifs (ex: mots de passe incorrects): les LOG_SAMPLE_BURST premiers
+  d'un même gabarit par fenêtre sont écrits, puis un sur LOG_SAMPLE_EVERY; l'enregistrement
+  écrit porte le nombre d'occurrences omises depuis le précédent (`suppressed`).
+"""
+import atexit
+from datetime import datetime, timezone
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import sys
+import time
+
+from src.config import settings
+from src.metrics import REGISTRY
+from src.responses import dumps
+
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total", "Enregistrements de log non écrits (file pleine ou échantillonnage)", ("reason",)
+)
+
+# Attributs standard d'un LogRecord: tout autre attribut vient de `extra=` et est exporté
+# (sauf la variante colorée des messages d'uvicorn)
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "color_message"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement (horodatage UTC, niveau, logger, message, champs `extra`)."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return dumps(entry).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Échantillonnage des avertissements par gabarit de message (record.msg) et par fenêtre.
+    Les erreurs et les messages d'autres niveaux ne sont jamais échantillonnés.
+    """
+    def __init__(self, burst: int, every: int, window: float, max_keys: int = 1000):
+        super().__init__()
+        self.burst = burst
+        self.every = every
+        self.window = window
+        self.max_keys = max_keys
+        # (logger, gabarit) -> [début de la fenêtre, occurrences dans la fenêtre, omis non signalés]
+        self._state: dict[tuple[str, object], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        state = self._state.get(key)
+        if state is None:
+            if len(self._state) >= self.max_keys:
+                self._state.clear()
+            state = self._state[key] = [now, 0, 0]
+        elif now - state[0] >= self.window:
+            state[0], state[1] = now, 0
+
+        state[1] += 1
+        extra = state[1] - self.burst
+        if extra <= 0 or (self.every > 0 and extra % self.every == 0):
+            if state[2]:
+                record.suppressed = state[2]
+                state[2] = 0
+            return True
+        state[2] += 1
+        LOG_RECORDS_DROPPED.inc("sampled")
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler qui ne formate rien dans le thread appelant (la mise en forme est faite
+    par le QueueListener) et abandonne l'enregistrement si la file est pleine.
+    Les arguments des messages doivent donc être immuables (str, nombres).
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc("queue_full")
+
+
+def setup_logging() -> None:
+    """
+    Installe la file de logs sur le logger racine et démarre le thread d'écriture.
+    Les loggers d'uvicorn qui ont leurs propres handlers sont redirigés vers la racine
+    (logs d'accès compris, sauf s'ils sont désactivés).
+    Sans effet si déjà appelé dans le processus.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    if settings.LOG_SAMPLE_BURST > 0:
+        handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_BURST, settings.LOG_SAMPLE_EVERY, settings.LOG_SAMPLE_WINDOW_SECONDS))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        if uvicorn_logger.handlers:
+            uvicorn_logger.handlers.clear()
+            uvicorn_logger.propagate = True
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Écrit les enregistrements restants et arrête le thread d'écriture."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,12 +1,87 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import secrets
+from time import perf_counter
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response
+from src.data.domain import dispose_engines, get_async_engine, get_replicas, warm_up_pool
+from src.data.pool_metrics import get_pool_status
+from src.logging_config import setup_logging
+from src.metrics import REGISTRY, MetricsMiddleware
+from src.responses import FastJSONResponse, dumps
+from src.modules.auth.auth_audit import audit_log
+from src.modules.auth.auth_login_tracker import login_tracker
+from src.modules.auth.auth_cache import token_cache
+from src.modules.auth.auth_keys import key_ring
 from src.modules.auth.auth_router import router as auth_router
+from src.modules.auth.auth_metier import shutdown_password_executor, warm_up_security
+from src.modules.auth.auth_repo import UserRepository
+from src.modules.auth.auth_revocation import revocation_list
+from src.modules.auth.auth_user_cache import user_cache
+from src.config import get_db_url_safe, settings
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Préchauffage en tâche de fond: connexions du pool ouvertes et requêtes fréquentes
+    préparées, premier bcrypt et premier JWT. /ready répond 503 jusqu'à la fin.
+    La base peut être indisponible au démarrage: nouvelle tentative toutes les secondes.
+    """
+    start = perf_counter()
+    connections = settings.DB_POOL_WARMUP_CONNECTIONS
+    if connections is None:
+        connections = settings.DB_POOL_SIZE
+    while True:
+        try:
+            await warm_up_pool(connections, UserRepository.hot_statements())
+            break
+        except Exception as e:
+            logger.warning("Préchauffage du pool impossible (%s), nouvelle tentative dans 1 s", type(e).__name__)
+            await asyncio.sleep(1)
+    await warm_up_security()
+    app.state.ready = True
+    logger.info("Préchauffage terminé en %.3f s (%d connexions)", perf_counter() - start, connections)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'application: démarre les tâches de fond (dont le préchauffage)
+    et libère les ressources partagées à l'arrêt.
+    """
+    # Mise en forme et écriture des logs (uvicorn compris) dans un thread dédié: démarré
+    # par le processus qui sert l'application, pas à l'import (sans effet si src.server l'a fait)
+    setup_logging()
+    logger.info("Démarrage de l'application. DB URL: %s", get_db_url_safe())
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up(app))
+    revocation_list.start(settings.REVOCATION_REFRESH_INTERVAL_SECONDS)
+    audit_log.start()
+    login_tracker.start()
+    await user_cache.start()
+    yield
+    warm_up_task.cancel()
+    await asyncio.gather(warm_up_task, return_exceptions=True)
+    await revocation_list.stop()
+    # Événements d'audit encore en file écrits avant la fermeture des connexions
+    await audit_log.stop()
+    await login_tracker.stop()
+    await user_cache.stop()
+    shutdown_password_executor()
+    # Ferme proprement les connexions du worker (sinon coupées par la fin du processus)
+    await dispose_engines()
 
 
 app = FastAPI(
     title="API d'Authentification Modulaire",
     description="Backend d'authentification utilisant FastAPI, SQLAlchemy et une architecture modulaire.",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configuration CORS pour permettre la communication avec le frontend
@@ -22,15 +97,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comptage des requêtes et latences par route (exposées sur /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Inclusion du router d'authentification avec préfixe /api/v1
 app.include_router(auth_router, prefix="/api/v1")
 
+# Corps des endpoints à forme fixe, encodés une seule fois
+_ROOT_BODY = dumps({"message": "Bienvenue sur l'API d'Authentification. Rendez-vous sur /docs pour les endpoints."})
+_HEALTH_BODY = dumps({"status": "healthy", "service": "auth-api"})
+_READY_BODY = dumps({"status": "ready"})
+_NOT_READY_BODY = dumps({"status": "warming_up"})
+
 @app.get("/", tags=["Root"], summary="Endpoint de base")
 async def read_root():
     """
     Route de base pour vérifier que l'API est opérationnelle.
     """
-    return {"message": "Bienvenue sur l'API d'Authentification. Rendez-vous sur /docs pour les endpoints."}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health", tags=["Health"], summary="Health check endpoint")
 async def health_check():
@@ -38,10 +122,112 @@ async def health_check():
     Endpoint de santé pour vérifier que l'API est opérationnelle.
     Utilisé par les outils de monitoring et les orchestrateurs.
     """
-    return {"status": "healthy", "service": "auth-api"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+@app.get("/ready", tags=["Health"], summary="Readiness: prêt à recevoir du trafic")
+async def readiness(request: Request):
+    """
+    Readiness pour l'orchestrateur / le load balancer: 503 tant que le préchauffage
+    (pool de connexions, requêtes préparées, bcrypt, JWT) n'est pas terminé.
+    /health reste la sonde de vivacité.
+    """
+    if not getattr(request.app.state, "ready", False):
+        return Response(content=_NOT_READY_BODY, status_code=503, media_type="application/json")
+    return Response(content=_READY_BODY, media_type="application/json")
+
+@app.get("/.well-known/jwks.json", tags=["Authentification"], summary="Clés publiques de vérification des JWT (JWKS)")
+async def jwks():
+    """
+    Publie les clés publiques actives (format JWKS) pour que les autres services
+    vérifient les tokens localement. Le document est sérialisé une fois au démarrage.
+    """
+    return Response(
+        content=key_ring.jwks_json,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
+
+async def require_internal_token(request: Request) -> None:
+    """
+    Dépendance des endpoints internes (métriques, état du pool): jeton Bearer
+    INTERNAL_ENDPOINTS_TOKEN. Sans jeton configuré, ces endpoints n'existent pas (404).
+    """
+    expected = settings.INTERNAL_ENDPOINTS_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Jeton interne invalide",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# Endpoints d'exploitation: jamais publics (jeton interne)
+internal_router = APIRouter(tags=["Health"], dependencies=[Depends(require_internal_token)])
+
+
+@internal_router.get("/internal/db-pool", summary="État du pool de connexions")
+async def db_pool_status():
+    """
+    Expose l'état du pool de connexions: connexions utilisées, overflow,
+    temps d'attente cumulé et nombre de timeouts de checkout.
+    Les réplicas éventuels sont listés avec leur état de santé.
+    """
+    status = get_pool_status(get_async_engine())
+    if get_replicas():
+        status["replicas"] = get_replicas().status()
+    return status
+
+@internal_router.get("/metrics", summary="Métriques au format Prometheus", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Export des métriques (requêtes par route, sections internes, résultats de connexion,
+    pool de connexions et cache de tokens) au format texte Prometheus.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+app.include_router(internal_router)
+
+# État du pool lu une seule fois par export, pour les deux métriques qui en dépendent
+_pool_status = REGISTRY.per_scrape(lambda: get_pool_status(get_async_engine()))
+REGISTRY.register_collector(
+    "db_pool_connections", "Connexions du pool par état", "gauge",
+    lambda: [({"state": state}, _pool_status()[state]) for state in ("checked_out", "checked_in", "overflow")],
+)
+REGISTRY.register_collector(
+    "db_pool_events_total", "Compteurs cumulés du pool (checkouts, timeouts, attente)", "counter",
+    lambda: [({"event": event}, _pool_status()[event]) for event in ("checkouts", "timeouts", "wait_seconds_total")],
+)
+REGISTRY.register_collector(
+    "db_replica_up", "Réplicas en lecture utilisables (1) ou écartés après une erreur (0)", "gauge",
+    lambda: [({"replica": replica.name}, int(replica.healthy)) for replica in get_replicas().replicas],
+)
+REGISTRY.register_collector(
+    "auth_audit_queue_events", "Événements d'audit en attente d'écriture", "gauge",
+    lambda: [({}, audit_log.pending())],
+)
+REGISTRY.register_collector(
+    "auth_login_tracking_pending_users", "Utilisateurs dont les connexions attendent l'écriture groupée", "gauge",
+    lambda: [({}, login_tracker.pending())],
+)
+REGISTRY.register_collector(
+    "user_cache_hit_ratio", "Part des lectures d'utilisateurs servies par le cache depuis le démarrage", "gauge",
+    lambda: [({"backend": settings.USER_CACHE_BACKEND}, user_cache.stats()["hit_ratio"] or 0.0)] if user_cache.enabled else [],
+)
+REGISTRY.register_collector(
+    "token_revocations", "Révocations actives en mémoire", "gauge",
+    lambda: [({"kind": kind}, revocation_list.stats()[kind]) for kind in ("users", "families")],
+)
+REGISTRY.register_collector(
+    "token_cache_events_total", "Compteurs du cache de tokens vérifiés", "counter",
+    lambda: [({"event": event}, token_cache.stats()[event]) for event in ("hits", "misses", "evictions")],
+)
 
-# Ce bloc est utilisé par uvicorn si le fichier est exécuté directement, 
-# mais Docker utilise la commande `fastapi run src/main.py`.
+# Ce bloc est utilisé par uvicorn si le fichier est exécuté directement,
+# mais Docker utilise la commande `python -m src.server` (voir src/server.py).
 # if __name__ == "__main__":
 #     import uvicorn
 #     uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Métriques applicatives au format texte Prometheus (exposées sur /metrics).
+
+Implémentation minimale et sans dépendance: compteurs et histogrammes en mémoire,
+mis à jour depuis la boucle d'événements, plus des collecteurs appelés au moment
+de l'export (état du pool, cache de tokens...).
+"""
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Iterable, TypeVar
+
+# Bornes (en secondes) adaptées aux latences HTTP comme aux sections internes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = tuple[dict[str, str], float]
+T = TypeVar("T")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class Counter:
+    """Compteur monotone, éventuellement étiqueté."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterable[str]:
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(dict(zip(self.labelnames, labels)))} {value}"
+
+
+class Histogram:
+    """Histogramme cumulatif (buckets, somme et nombre d'observations)."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Par jeu d'étiquettes: [compteurs par bucket (+Inf inclus), somme]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> Iterable[str]:
+        for labels, (counts, total) in self._series.items():
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels({**base, 'le': str(bound)})} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(base)} {total}"
+            yield f"{self.name}_count{_format_labels(base)} {cumulative}"
+
+
+class Registry:
+    """Ensemble des métriques exportées par /metrics."""
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+        # Valeurs partagées par plusieurs collecteurs, calculées une fois par export (voir per_scrape)
+        self._scrape_cache: dict[object, object] | None = None
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, name: str, help: str, kind: str, collect: Callable[[], Iterable[Sample]]) -> None:
+        """Ajoute une métrique calculée à la demande (kind: gauge ou counter)."""
+        self._collectors.append((name, help, kind, collect))
+
+    def per_scrape(self, fetch: Callable[[], T]) -> Callable[[], T]:
+        """
+        Enveloppe `fetch` pour qu'il ne soit appelé qu'une fois par export, même s'il
+        alimente plusieurs collecteurs (ex: état du pool lu pour deux métriques).
+        """
+        key = object()
+
+        def cached() -> T:
+            if self._scrape_cache is None:
+                return fetch()
+            if key not in self._scrape_cache:
+                self._scrape_cache[key] = fetch()
+            return self._scrape_cache[key]
+        return cached
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        self._scrape_cache = {}
+        try:
+            for name, help, kind, collect in self._collectors:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in collect())
+        finally:
+            self._scrape_cache = None
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route")
+)
+SECTION_DURATION = REGISTRY.histogram(
+    "auth_section_duration_seconds", "Durée des sections internes (bcrypt, JWT, requêtes DB)", ("section",)
+)
+LOGIN_ATTEMPTS = REGISTRY.counter(
+    "auth_login_attempts_total", "Tentatives de connexion par résultat", ("outcome",)
+)
+
+
+class timed:
+    """
+    Mesure la durée d'une section dans SECTION_DURATION.
+    S'utilise comme context manager (`with timed("jwt_decode"):`) ou comme
+    décorateur de coroutine (`@timed("db_get_user_by_id")`).
+    """
+    __slots__ = ("section", "_start")
+
+    def __init__(self, section: str):
+        self.section = section
+
+    def __enter__(self) -> "timed":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        SECTION_DURATION.observe(perf_counter() - self._start, self.section)
+
+    def __call__(self, func):
+        section = self.section
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timed(section):
+                return await func(*args, **kwargs)
+        return wrapper
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI qui compte les requêtes et mesure leur durée par route.
+    La route est le gabarit FastAPI (ex: /api/v1/auth/login), pas le chemin brut.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_REQUEST_DURATION.observe(perf_counter() - start, method, route)
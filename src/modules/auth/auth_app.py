@@ -1,102 +1,268 @@
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import jwt, JWTError
+from jose import JWTError
+from datetime import datetime, timedelta, timezone
 import logging
 
-from src.data.domain import get_db_session
-from src.modules.auth.auth_dto import UserCreate, UserInDB, Token, UserLogin, TokenData
-from src.modules.auth.auth_repo import UserRepository
-from src.modules.auth.auth_metier import get_password_hash, verify_password, create_access_token
+from src.data.domain import get_db_session, release_session
+from src.modules.auth.auth_dto import TokenIntrospection, UserCreate, UserInDB, Token, UserLogin
+from src.modules.auth.auth_repo import UserRepository, RefreshTokenRepository
+from src.modules.auth.auth_metier import (
+    get_password_hash_async, verify_and_update_password_async, create_access_token, decode_access_token,
+    generate_refresh_token, hash_refresh_token, new_session_id,
+)
 from src.modules.auth.auth_model import User
+from src.modules.auth.auth_audit import audit_log
+from src.modules.auth.auth_login_tracker import login_tracker
+from src.modules.auth.auth_cache import CachedToken, token_cache
+from src.modules.auth.auth_revocation import revocation_list
+from src.modules.auth.auth_throttle import login_throttle
 from src.config import settings
+from src.metrics import LOGIN_ATTEMPTS, timed
 
 logger = logging.getLogger(__name__)
 
 
 class AuthAppService:
-    def __init__(self, db: AsyncSession = Depends(get_db_session)):
+    # scope="function": la session est validée et rendue au pool avant l'envoi de la réponse
+    def __init__(self, db: AsyncSession = Depends(get_db_session, scope="function")):
+        self.db = db
         self.repository = UserRepository(db)
+        self.tokens = RefreshTokenRepository(db)
 
 
-    async def register_new_user(self, user_in: UserCreate) -> UserInDB:
-        """Logique d'inscription: vérifie l'existence, hache le mot de passe et crée l'utilisateur."""
-        existing_user = await self.repository.get_user_by_email(user_in.email)
-        if existing_user:
+    async def register_new_user(self, user_in: UserCreate, client_ip: str | None = None) -> UserInDB:
+        """
+        Logique d'inscription: hache le mot de passe puis insère l'utilisateur.
+        L'unicité de l'email est vérifiée par la requête d'insertion elle-même (un seul aller-retour).
+        """
+        with login_throttle.password_check():
+            hashed_password = await get_password_hash_async(user_in.password)
+        db_user = await self.repository.insert_user_returning(user_in, hashed_password)
+        if db_user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Un utilisateur avec cet email existe déjà"
             )
-
-        hashed_password = get_password_hash(user_in.password)
-        db_user = await self.repository.create_user(user_in, hashed_password)
-        logger.info(f"Nouvel utilisateur créé: {db_user.email}")
+        audit_log.record("register", db_user.email, db_user.id, client_ip)
+        logger.info("Nouvel utilisateur créé: %s", db_user.email)
         return UserInDB.model_validate(db_user)
 
 
-    async def authenticate_user(self, user_login: UserLogin) -> Token:
+    async def authenticate_user(self, user_login: UserLogin, client_ip: str | None = None) -> Token:
+        """
+        Vérifie les identifiants et émet un jeton d'accès.
+        Les limites par email/IP et le plafond de vérifications simultanées sont appliqués
+        avant tout calcul bcrypt. La connexion DB est rendue au pool pendant la vérification
+        du mot de passe.
+        """
+        try:
+            await login_throttle.check_attempt(user_login.email, client_ip)
+        except HTTPException:
+            audit_log.record("login_throttled", user_login.email, None, client_ip)
+            raise
         user: User | None = await self.repository.get_user_by_email(user_login.email)
-        
+        # Aucune connexion n'est conservée pendant bcrypt (jusqu'à ~100 ms)
+        await release_session(self.db)
+
         if not user:
-            logger.warning(f"Tentative de connexion échouée pour: {user_login.email}")
+            LOGIN_ATTEMPTS.inc("unknown_email")
+            audit_log.record("login_unknown_email", user_login.email, None, client_ip)
+            logger.warning("Tentative de connexion échouée pour: %s", user_login.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email ou mot de passe incorrect"
             )
             
-        if not verify_password(user_login.password, user.hashed_password):
-            logger.warning(f"Mot de passe incorrect pour: {user_login.email}")
+        with login_throttle.password_check():
+            password_ok, new_hash = await verify_and_update_password_async(user_login.password, user.hashed_password)
+        if not password_ok:
+            LOGIN_ATTEMPTS.inc("bad_password")
+            audit_log.record("login_bad_password", user_login.email, user.id, client_ip)
+            logger.warning("Mot de passe incorrect pour: %s", user_login.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email ou mot de passe incorrect"
             )
             
         if not user.is_active:
-            logger.warning(f"Tentative de connexion avec compte inactif: {user_login.email}")
+            LOGIN_ATTEMPTS.inc("inactive_account")
+            audit_log.record("login_inactive_account", user_login.email, user.id, client_ip)
+            logger.warning("Tentative de connexion avec compte inactif: %s", user_login.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Compte inactif"
             )
         
-        access_token = create_access_token(data={"sub": str(user.id)})
-        logger.info(f"Connexion réussie pour: {user_login.email}")
-        return Token(access_token=access_token)
-    
+        if new_hash:
+            # Hachage d'un autre algorithme ou d'un autre coût: remplacé dans la transaction du login
+            await self.repository.update_password_hash(user, new_hash)
+            logger.info("Hachage du mot de passe mis à jour pour: %s", user_login.email)
+
+        token = await self._issue_tokens(user.id)
+        LOGIN_ATTEMPTS.inc("success")
+        # last_login_at / login_count: écrits par lots, pas dans la transaction du login
+        login_tracker.record(user.id)
+        audit_log.record("login_success", user_login.email, user.id, client_ip)
+        logger.info("Connexion réussie pour: %s", user_login.email)
+        return token
+
+    async def _issue_tokens(self, user_id: int, session_id: str | None = None) -> Token:
+        """Émet un access token de courte durée et un nouveau refresh token pour la session."""
+        session_id = session_id or new_session_id()
+        refresh_token, refresh_token_hash = generate_refresh_token()
+        await self.tokens.create_refresh_token(
+            user_id,
+            session_id,
+            refresh_token_hash,
+            datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        access_token = create_access_token(data={"sub": str(user_id), "sid": session_id})
+        return Token(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    async def refresh_access_token(self, refresh_token: str) -> Token:
+        """
+        Échange un refresh token contre une nouvelle paire (rotation: l'ancien est révoqué).
+        La réutilisation d'un refresh token déjà consommé révoque toute la session.
+        """
+        stored = await self.tokens.get_refresh_token(hash_refresh_token(refresh_token))
+        invalid = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token invalide ou expiré",
+        )
+        if stored is None:
+            raise invalid
+
+        if stored.revoked_at is not None:
+            logger.warning("Réutilisation d'un refresh token révoqué, session %s révoquée", stored.family_id)
+            # Validée par _revoke_session: la révocation survit à l'erreur renvoyée
+            await self._revoke_session(stored.family_id)
+            raise invalid
+
+        if stored.expires_at <= datetime.now(timezone.utc):
+            raise invalid
+
+        user = await self.repository.get_user_by_id(stored.user_id)
+        if not user or not user.is_active:
+            raise invalid
+
+        await self.tokens.revoke_refresh_tokens(token_id=stored.id)
+        return await self._issue_tokens(user.id, stored.family_id)
+
+    async def logout(self, refresh_token: str) -> None:
+        """Termine la session du refresh token: refresh tokens et access tokens sont révoqués."""
+        stored = await self.tokens.get_refresh_token(hash_refresh_token(refresh_token))
+        if stored is not None:
+            await self._revoke_session(stored.family_id)
+
+    async def _revoke_session(self, family_id: str) -> None:
+        await self.tokens.revoke_refresh_tokens(family_id=family_id)
+        revocation = await self.tokens.add_revocation(self._access_token_horizon(), family_id=family_id)
+        # En mémoire seulement une fois validée (sinon ce worker révoquerait seul une session restée valide)
+        await self.db.commit()
+        revocation_list.add(revocation)
+
+    @staticmethod
+    def _access_token_horizon() -> datetime:
+        """Après cette date, tous les access tokens émis jusqu'ici ont expiré."""
+        return datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
     async def get_current_user_id_from_token(self, token: str) -> int:
         """
-        Valide le token JWT et vérifie que l'utilisateur existe toujours en base.
+        Valide le token JWT et vérifie qu'il n'a pas été révoqué.
+        La révocation (déconnexion, compte désactivé) est contrôlée en mémoire: aucune requête DB.
+        Un token déjà validé est servi depuis le cache (sans décodage).
         """
         try:
-            payload = jwt.decode(
-                token, 
-                settings.SECRET_KEY, 
-                algorithms=[settings.ALGORITHM]
+            cached = self._verify_token(token)
+        except (JWTError, ValueError) as e:
+            logger.warning("JWT validation failed: %s", type(e).__name__)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token invalide ou expiré.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if revocation_list.is_revoked(cached.user_id, cached.session_id, cached.issued_at):
+            logger.warning("Token révoqué présenté pour l'utilisateur: %s", cached.user_id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Utilisateur invalide ou inactif",
+                headers={"WWW-Authenticate": "Bearer"},
             )
 
+        return cached.user_id
+
+    @staticmethod
+    def _verify_token(token: str) -> CachedToken:
+        """Claims d'un access token valide (cache, sinon décodage). Lève JWTError ou ValueError."""
+        cached = token_cache.get(token)
+        if cached is None:
+            with timed("jwt_decode"):
+                payload = decode_access_token(token)
+
             user_id_str: str = payload.get("sub")
             if user_id_str is None:
                 raise JWTError("Sub field missing in token payload")
 
-            user_id = int(user_id_str)
-            
-            # Vérifier que l'utilisateur existe toujours et est actif
-            user = await self.repository.get_user_by_id(user_id)
-            if not user or not user.is_active:
-                logger.warning(f"Token valide mais utilisateur inexistant ou inactif: {user_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Utilisateur invalide ou inactif",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            
-            token_data = TokenData(user_id=user_id)
+            cached = CachedToken(
+                user_id=int(user_id_str),
+                session_id=payload.get("sid"),
+                # Millisecondes si présentes (tokens émis avant iat_ms: seconde entière, plus prudent)
+                issued_at=payload["iat_ms"] / 1000 if "iat_ms" in payload else payload.get("iat", 0),
+            )
+            if "exp" in payload:
+                token_cache.put(token, cached, payload["exp"])
+        return cached
+
+    async def introspect_tokens(self, tokens: list[str]) -> list[TokenIntrospection]:
+        """
+        Introspection d'un lot de tokens (passerelles d'API), dans l'ordre reçu.
+        Signature, expiration et révocation sont vérifiées en mémoire; le statut des comptes
+        est lu en une seule requête pour tous les utilisateurs distincts du lot.
+        Un token invalide donne active=False sans faire échouer le lot.
+        """
+        claims: list[CachedToken | None] = []
+        for token in tokens:
+            try:
+                cached = self._verify_token(token)
+            except (JWTError, ValueError):
+                cached = None
+            if cached is not None and revocation_list.is_revoked(cached.user_id, cached.session_id, cached.issued_at):
+                cached = None
+            claims.append(cached)
+
+        user_ids = {cached.user_id for cached in claims if cached is not None}
+        active_users = await self.repository.get_active_flags(user_ids) if user_ids else {}
+        return [
+            TokenIntrospection(active=False) if cached is None
+            else TokenIntrospection(active=active_users.get(cached.user_id, False), user_id=cached.user_id)
+            for cached in claims
+        ]
 
-        except JWTError as e:
-            logger.warning(f"JWT validation failed: {type(e).__name__}")
+    async def set_user_active(self, user_id: int, is_active: bool) -> UserInDB:
+        """
+        Active ou désactive un compte.
+        À la désactivation, les refresh tokens sont révoqués et les access tokens déjà émis
+        sont ajoutés à la liste de révocation (et retirés du cache).
+        """
+        user = await self.repository.set_user_active(user_id, is_active)
+        if user is None:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token invalide ou expiré.",
-                headers={"WWW-Authenticate": "Bearer"},
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Utilisateur introuvable"
             )
-
-        return token_data.user_id
-    
\ No newline at end of file
+        if not is_active:
+            await self.tokens.revoke_refresh_tokens(user_id=user_id)
+            revocation = await self.tokens.add_revocation(self._access_token_horizon(), user_id=user_id)
+            # En mémoire seulement une fois validée (un échec du commit ne laisse rien de révoqué)
+            await self.db.commit()
+            revocation_list.add(revocation)
+            token_cache.invalidate_user(user_id)
+        logger.info("Statut du compte %s mis à jour: is_active=%s", user_id, is_active)
+        return UserInDB.model_validate(user)
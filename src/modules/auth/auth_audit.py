@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timezone
+import logging
+
+from sqlalchemy import insert
+
+from src.config import settings
+from src.data.domain import get_async_engine
+from src.metrics import REGISTRY
+from src.modules.auth.auth_model import LoginEvent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EVENTS = REGISTRY.counter(
+    "auth_audit_events_total", "Événements d'audit par devenir (écrits ou abandonnés)", ("status",)
+)
+
+
+class AuditLog:
+    """
+    Journal d'audit des authentifications (table login_events).
+    `record` dépose l'événement dans une file en mémoire sans jamais attendre: la requête
+    ne paie ni l'écriture ni l'attente d'une connexion. Une tâche de fond insère les
+    événements par lots, dès que `batch_size` sont disponibles ou après `flush_interval`.
+    File pleine ou base indisponible: les événements sont abandonnés et comptés.
+    """
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(max_size)
+        # Lot en cours de constitution: conservé si la tâche est annulée pendant l'attente
+        self._batch: list[dict] = []
+        self._task: asyncio.Task | None = None
+        # Insertion en cours, protégée de l'annulation (voir _write)
+        self._writing: asyncio.Future | None = None
+
+    def record(self, event: str, email: str, user_id: int | None = None, client_ip: str | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        try:
+            self._queue.put_nowait({
+                "created_at": datetime.now(timezone.utc),
+                "event": event,
+                "email": email,
+                "user_id": user_id,
+                "client_ip": client_ip,
+            })
+        except asyncio.QueueFull:
+            AUDIT_EVENTS.inc("dropped_queue_full")
+
+    def pending(self) -> int:
+        return self._queue.qsize() + len(self._batch)
+
+    def clear(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._batch.clear()
+
+    async def _insert(self, batch: list[dict]) -> None:
+        try:
+            async with get_async_engine().begin() as conn:
+                await conn.execute(insert(LoginEvent), batch)
+        except Exception:
+            AUDIT_EVENTS.inc("dropped_write_error", amount=len(batch))
+            logger.exception("Écriture de %d événements d'audit impossible", len(batch))
+        else:
+            AUDIT_EVENTS.inc("written", amount=len(batch))
+
+    async def _wait_writing(self) -> None:
+        if self._writing is not None and not self._writing.done():
+            await asyncio.wait([self._writing])
+
+    async def _write(self) -> None:
+        """
+        Insère le lot en cours. Le lot quitte self._batch avant l'insertion, qui va jusqu'au
+        bout même si la tâche de fond est annulée (stop() pendant une écriture): stop()
+        l'attend, les événements ne sont ni perdus ni insérés deux fois.
+        """
+        await self._wait_writing()
+        batch, self._batch = self._batch, []
+        self._writing = asyncio.ensure_future(self._insert(batch))
+        await asyncio.shield(self._writing)
+
+    def _take_nowait(self) -> None:
+        while len(self._batch) < self.batch_size and not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+
+    async def flush(self) -> None:
+        """Écrit immédiatement tous les événements en attente (arrêt du worker, tests)."""
+        while self._batch or not self._queue.empty():
+            self._take_nowait()
+            await self._write()
+        await self._wait_writing()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._batch:
+                self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                self._take_nowait()
+                timeout = deadline - loop.time()
+                if len(self._batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+            await self._write()
+
+    def start(self) -> None:
+        """Démarre l'écriture en tâche de fond (appelé depuis le lifespan de l'application)."""
+        if self._task is None and self.max_size > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête la tâche de fond puis écrit les événements restants."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+audit_log = AuditLog(settings.AUDIT_QUEUE_SIZE, settings.AUDIT_BATCH_SIZE, settings.AUDIT_FLUSH_INTERVAL_SECONDS)
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+import hashlib
+import time
+from typing import NamedTuple
+
+from src.config import settings
+
+
+class CachedToken(NamedTuple):
+    """Claims utiles d'un token vérifié (suffisants pour le contrôle de révocation)."""
+    user_id: int
+    session_id: str | None
+    issued_at: float
+
+
+class TokenCache:
+    """
+    Cache LRU en mémoire des tokens JWT déjà vérifiés.
+    La clé est le SHA-256 du token (le token brut n'est jamais conservé).
+    Chaque entrée expire au plus tard à l'expiration (`exp`) du token.
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[CachedToken, float]] = OrderedDict()
+        self._keys_by_user: dict[int, set[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> CachedToken | None:
+        """Retourne les claims associés au token, ou None (absent ou expiré)."""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        cached, expires_at = entry
+        if expires_at <= time.time():
+            self._remove(key, cached.user_id)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached
+
+    def put(self, token: str, cached: CachedToken, token_exp: float) -> None:
+        """Mémorise un token vérifié jusqu'à min(maintenant + TTL, exp du token)."""
+        if not self.enabled:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, token_exp)
+        key = self._key(token)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (cached, expires_at)
+        self._keys_by_user.setdefault(cached.user_id, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            old_key, (old_cached, _) = self._entries.popitem(last=False)
+            self._forget_user_key(old_cached.user_id, old_key)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Supprime toutes les entrées d'un utilisateur (ex: compte désactivé)."""
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: bytes, user_id: int) -> None:
+        self._entries.pop(key, None)
+        self._forget_user_key(user_id, key)
+
+    def _forget_user_key(self, user_id: int, key: bytes) -> None:
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+# Instance partagée par toutes les requêtes du worker
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL_SECONDS)
@@ -37,10 +37,45 @@ class UserInDB(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
-    """Schéma Pydantic pour la réponse JWT (Access Token)."""
+    """Schéma Pydantic pour la réponse JWT (Access Token + Refresh Token)."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshRequest(BaseModel):
+    """Corps des requêtes /refresh et /logout."""
+    refresh_token: str
+
+class IntrospectRequest(BaseModel):
+    """Lot de tokens à introspecter (/introspect)."""
+    tokens: list[str] = Field(..., min_length=1, max_length=1000)
+
+class TokenIntrospection(BaseModel):
+    """
+    Résultat pour un token: active=True si le token est valide, non révoqué et que le
+    compte existe et est actif. user_id est absent si le token n'a pas pu être vérifié.
+    """
+    active: bool
+    user_id: Optional[int] = None
+
+class IntrospectResponse(BaseModel):
+    """Résultats dans l'ordre des tokens reçus."""
+    results: list[TokenIntrospection]
 
 class TokenData(BaseModel):
     """Schéma Pydantic pour les données contenues dans le token (Payload)."""
-    user_id: Optional[int] = None
\ No newline at end of file
+    user_id: Optional[int] = None
+
+class ImportReject(BaseModel):
+    """Ligne rejetée lors d'un import en masse."""
+    line: int
+    email: Optional[str] = None
+    reason: str
+
+class UserImportReport(BaseModel):
+    """Bilan d'un import en masse (les rejets renvoyés sont un échantillon)."""
+    total: int = 0
+    imported: int = 0
+    rejected: int = 0
+    rejects: list[ImportReject] = Field(default_factory=list)
@@ -0,0 +1,52 @@
+import csv
+import io
+from typing import AsyncIterator, Literal
+
+from src.data.domain import AsyncSessionLocal
+from src.modules.auth.auth_dto import UserInDB
+from src.modules.auth.auth_repo import UserRepository
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def iter_user_pages(batch_size: int, is_active: bool | None = None) -> AsyncIterator[list[UserInDB]]:
+    """
+    Parcourt la table users par pages successives (pagination par clé sur User.id).
+    Chaque page utilise sa propre session: aucune connexion n'est gardée entre deux pages,
+    même si le client lit lentement la réponse.
+    """
+    after_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = await UserRepository(session).get_users_page(after_id, batch_size, is_active)
+        if not rows:
+            return
+        yield [UserInDB.model_validate(row) for row in rows]
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1].id
+
+
+async def export_users(fmt: ExportFormat, batch_size: int, is_active: bool | None = None) -> AsyncIterator[bytes]:
+    """Sérialise les utilisateurs en NDJSON ou CSV, une page à la fois."""
+    if fmt == "csv":
+        fields = list(UserInDB.model_fields)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        yield buffer.getvalue().encode()
+
+        async for page in iter_user_pages(batch_size, is_active):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(user.model_dump() for user in page)
+            yield buffer.getvalue().encode()
+        return
+
+    async for page in iter_user_pages(batch_size, is_active):
+        yield b"".join(user.model_dump_json().encode() + b"\n" for user in page)
@@ -0,0 +1,243 @@
+import asyncio
+import codecs
+from collections import deque
+import csv
+import json
+import logging
+from typing import AsyncIterator, Callable, Iterable, Literal
+
+from pydantic import ValidationError
+
+from src.config import settings
+from src.data.domain import get_async_engine
+from src.modules.auth.auth_dto import ImportReject, UserCreate, UserImportReport
+from src.modules.auth.auth_metier import get_password_hash_async
+from src.modules.auth.auth_model import User, normalize_email
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "jsonl"]
+
+# Colonnes du modèle User alimentées par l'import (l'id est attribué par la séquence)
+IMPORT_COLUMNS = (User.email, User.email_normalized, User.hashed_password, User.first_name, User.last_name, User.is_active)
+_COLUMN_NAMES = [column.name for column in IMPORT_COLUMNS]
+_STAGING_TABLE = "users_import_staging"
+
+_CREATE_STAGING_SQL = (
+    f"CREATE TEMP TABLE {_STAGING_TABLE} ON COMMIT DROP AS "
+    f"SELECT {', '.join(_COLUMN_NAMES)} FROM {User.__tablename__} WITH NO DATA"
+)
+_INSERT_FROM_STAGING_SQL = (
+    f"INSERT INTO {User.__tablename__} ({', '.join(_COLUMN_NAMES)}) "
+    f"SELECT {', '.join(_COLUMN_NAMES)} FROM {_STAGING_TABLE} "
+    f"ON CONFLICT ({User.email_normalized.name}) DO NOTHING RETURNING {User.email.name}"
+)
+
+# Au-delà, un enregistrement CSV est rejeté (guillemet jamais fermé: le reste du fichier
+# serait lu comme un seul champ)
+_MAX_CSV_RECORD_LINES = 100
+
+Record = tuple[int, dict | None]
+
+
+async def iter_lines_from_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Découpe un flux d'octets (ex: corps de requête) en lignes UTF-8 sans le charger en entier.
+    Les fins de ligne sont conservées (champs CSV entre guillemets sur plusieurs lignes).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def iter_lines_from_file(lines: Iterable[str]) -> AsyncIterator[str]:
+    """Adapte un fichier texte ouvert avec newline="" (lu ligne par ligne) en itérateur asynchrone."""
+    for line in lines:
+        yield line
+
+
+class _PendingLines:
+    """
+    Source du csv.reader: lignes d'enregistrements complets, ajoutées au fil du flux.
+    Vide, elle interrompt l'itération sans s'épuiser (le lecteur reste utilisable).
+    """
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+def _in_quoted_field(line: str, in_quotes: bool) -> bool:
+    """Indique si `line` se termine à l'intérieur d'un champ entre guillemets (dialecte CSV par défaut)."""
+    field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quotes:
+            if char == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 1  # Guillemet doublé: caractère du champ
+                else:
+                    in_quotes = False
+        elif char == '"' and field_start:
+            in_quotes = True
+        field_start = char == "," and not in_quotes
+        i += 1
+    return in_quotes
+
+
+async def _parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    # Un seul lecteur pour tout le flux: il ne reçoit que des enregistrements complets
+    pending = _PendingLines()
+    reader = csv.reader(pending)
+    header: list[str] | None = None
+    line_no = start = 0
+    in_quotes = False
+    async for line in lines:
+        line_no += 1
+        if not pending.lines:
+            if not line.strip():
+                continue
+            start = line_no
+        pending.lines.append(line)
+        in_quotes = _in_quoted_field(line, in_quotes)
+        if in_quotes:
+            if len(pending.lines) >= _MAX_CSV_RECORD_LINES:
+                pending.lines.clear()
+                in_quotes = False
+                yield start, None
+            continue
+
+        row = next(reader)
+        if header is None:
+            header = [name.strip() for name in row]
+            continue
+        yield start, dict(zip(header, row)) if len(row) == len(header) else None
+    if pending.lines:
+        # Guillemet non fermé en fin de flux
+        yield start, None
+
+
+async def parse_records(lines: AsyncIterator[str], fmt: ImportFormat) -> AsyncIterator[Record]:
+    """
+    Transforme les lignes CSV (avec en-tête) ou JSONL en dictionnaires.
+    Produit (numéro de ligne, enregistrement) ; l'enregistrement vaut None si la ligne est illisible.
+    Un enregistrement CSV sur plusieurs lignes (champ entre guillemets) porte le numéro de sa première ligne.
+    """
+    if fmt == "csv":
+        async for record in _parse_csv(lines):
+            yield record
+        return
+
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        yield line_no, record if isinstance(record, dict) else None
+
+
+async def import_users(
+    records: AsyncIterator[Record],
+    chunk_size: int,
+    on_reject: Callable[[ImportReject], None] | None = None,
+    max_reported_rejects: int = 0,
+    hash_concurrency: int | None = None,
+) -> UserImportReport:
+    """
+    Importe des utilisateurs par blocs via COPY.
+    Chaque bloc est validé avec UserCreate, haché (au plus `hash_concurrency` hachages
+    simultanés, IMPORT_HASH_CONCURRENCY par défaut: le pool de hachage reste disponible pour
+    les connexions) puis chargé dans une table temporaire et inséré avec ON CONFLICT DO NOTHING,
+    dans sa propre transaction. Une connexion n'est prise que le temps de l'écriture d'un bloc.
+    La mémoire utilisée dépend de chunk_size et non de la taille du fichier.
+    """
+    report = UserImportReport()
+    hashing = asyncio.Semaphore(max(hash_concurrency or settings.IMPORT_HASH_CONCURRENCY, 1))
+
+    def reject(line: int, email: str | None, reason: str) -> None:
+        report.rejected += 1
+        rejected = ImportReject(line=line, email=email, reason=reason)
+        if len(report.rejects) < max_reported_rejects:
+            report.rejects.append(rejected)
+        if on_reject is not None:
+            on_reject(rejected)
+
+    chunk: list[Record] = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            await _import_chunk(chunk, report, reject, hashing)
+            chunk = []
+    if chunk:
+        await _import_chunk(chunk, report, reject, hashing)
+
+    logger.info(
+        "Import terminé: %d importés, %d rejetés sur %d lignes", report.imported, report.rejected, report.total
+    )
+    return report
+
+
+async def _hash(password: str, hashing: asyncio.Semaphore) -> str:
+    async with hashing:
+        return await get_password_hash_async(password)
+
+
+async def _import_chunk(chunk: list[Record], report: UserImportReport, reject, hashing: asyncio.Semaphore) -> None:
+    report.total += len(chunk)
+    valid: dict[str, tuple[int, UserCreate]] = {}
+
+    for line_no, record in chunk:
+        if record is None:
+            reject(line_no, None, "Ligne illisible")
+            continue
+        try:
+            user_in = UserCreate.model_validate(record)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            reject(line_no, record.get("email"), f"Invalide ({field}): {error['msg']}")
+            continue
+        email_normalized = normalize_email(user_in.email)
+        if email_normalized in valid:
+            reject(line_no, user_in.email, "Doublon dans le fichier")
+            continue
+        valid[email_normalized] = (line_no, user_in)
+
+    if not valid:
+        return
+
+    hashes = await asyncio.gather(*(_hash(user_in.password, hashing) for _, user_in in valid.values()))
+    rows = [
+        (user_in.email, email_normalized, hashed_password, user_in.first_name or "", user_in.last_name or "", True)
+        for (email_normalized, (_, user_in)), hashed_password in zip(valid.items(), hashes)
+    ]
+
+    async with get_async_engine().connect() as conn:
+        pg = (await conn.get_raw_connection()).driver_connection
+        async with pg.transaction():
+            await pg.execute(_CREATE_STAGING_SQL)
+            await pg.copy_records_to_table(_STAGING_TABLE, records=rows, columns=_COLUMN_NAMES)
+            inserted = {row[0] for row in await pg.fetch(_INSERT_FROM_STAGING_SQL)}
+
+    report.imported += len(inserted)
+    for line_no, user_in in valid.values():
+        if user_in.email not in inserted:
+            reject(line_no, user_in.email, "Un utilisateur avec cet email existe déjà")
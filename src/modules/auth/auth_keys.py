@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+
+from jose import jwk
+from jose.backends.base import Key
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class JwtKey:
+    """Clé de signature JWT déjà analysée (objet python-jose prêt à l'emploi)."""
+    kid: str | None
+    algorithm: str
+    verifier: Key
+    signer: Key | None = None  # None pour une clé publique conservée uniquement pour la vérification
+    public_jwk: dict | None = None  # None pour une clé HMAC (jamais publiée)
+
+
+class KeyRing:
+    """
+    Ensemble des clés actives: une clé de signature et toutes les clés acceptées
+    en vérification (rotation). Les tokens sans `kid` sont vérifiés avec la clé
+    HMAC historique (SECRET_KEY) si elle est acceptée.
+    """
+    def __init__(self, signing_key: JwtKey, keys: list[JwtKey]):
+        if signing_key.signer is None:
+            raise ValueError(f"La clé active {signing_key.kid!r} ne contient pas de clé privée")
+        self.signing_key = signing_key
+        self._keys = {key.kid: key for key in keys}
+        self._keys.setdefault(signing_key.kid, signing_key)
+        # Document JWKS sérialisé une seule fois
+        self.jwks_json = json.dumps(
+            {"keys": [key.public_jwk for key in self._keys.values() if key.public_jwk is not None]},
+            separators=(",", ":"),
+        ).encode()
+
+    def verification_key(self, kid: str | None) -> JwtKey | None:
+        return self._keys.get(kid)
+
+    def verification_keys(self) -> list[JwtKey]:
+        """Toutes les clés acceptées en vérification (dont la clé de signature)."""
+        return list(self._keys.values())
+
+
+def _hmac_key() -> JwtKey:
+    algorithm = settings.ALGORITHM if settings.ALGORITHM.startswith("HS") else "HS256"
+    key = jwk.construct(settings.SECRET_KEY, algorithm)
+    return JwtKey(kid=None, algorithm=algorithm, verifier=key, signer=key)
+
+
+def _load_pem_key(path: Path, algorithm: str) -> JwtKey:
+    """Charge `<kid>.pem` (clé privée) ou `<kid>.pub.pem` (clé publique en vérification seule)."""
+    is_public = path.name.endswith(".pub.pem")
+    kid = path.name.removesuffix(".pub.pem") if is_public else path.name.removesuffix(".pem")
+    key = jwk.construct(path.read_text(), algorithm)
+    public_key = key if is_public else key.public_key()
+    public_jwk = {**public_key.to_dict(), "kid": kid, "use": "sig", "alg": algorithm}
+    return JwtKey(
+        kid=kid,
+        algorithm=algorithm,
+        verifier=public_key,
+        signer=None if is_public else key,
+        public_jwk=public_jwk,
+    )
+
+
+def load_key_ring() -> KeyRing:
+    """
+    Construit le trousseau à partir de la configuration.
+    - ALGORITHM=HS*: une seule clé HMAC (SECRET_KEY), comportement historique.
+    - ALGORITHM=RS*/ES*: clés PEM lues dans JWT_KEYS_DIR, signature avec JWT_ACTIVE_KID.
+    """
+    hmac_key = _hmac_key()
+    if settings.ALGORITHM.startswith("HS"):
+        return KeyRing(hmac_key, [hmac_key])
+
+    if not settings.JWT_KEYS_DIR:
+        raise RuntimeError(f"ALGORITHM={settings.ALGORITHM} nécessite JWT_KEYS_DIR")
+    keys = [_load_pem_key(path, settings.ALGORITHM) for path in sorted(Path(settings.JWT_KEYS_DIR).glob("*.pem"))]
+    private_kids = [key.kid for key in keys if key.signer is not None]
+
+    active_kid = settings.JWT_ACTIVE_KID
+    if active_kid is None and len(private_kids) == 1:
+        active_kid = private_kids[0]
+    if active_kid not in private_kids:
+        raise RuntimeError(f"Clé active introuvable dans {settings.JWT_KEYS_DIR}: {active_kid!r} (clés privées: {private_kids})")
+
+    if settings.JWT_ACCEPT_LEGACY_HS256:
+        keys.append(hmac_key)
+    signing_key = next(key for key in keys if key.kid == active_kid)
+    logger.info("Trousseau JWT chargé: %d clés, clé active %s", len(keys), active_kid)
+    return KeyRing(signing_key, keys)
+
+
+# Trousseau analysé une seule fois au démarrage du worker
+key_ring = load_key_ring()
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timezone
+import logging
+
+from sqlalchemy import DateTime, Integer, column, func, update, values
+
+from src.config import settings
+from src.data.domain import get_async_engine
+from src.metrics import REGISTRY
+from src.modules.auth.auth_model import User
+
+logger = logging.getLogger(__name__)
+
+LOGIN_TRACKING_EVENTS = REGISTRY.counter(
+    "auth_login_tracking_total", "Suivi des connexions: connexions enregistrées, lots et lignes écrits, écritures en échec", ("event",)
+)
+
+
+class LoginTracker:
+    """
+    Suivi de last_login_at et login_count sans UPDATE à chaque connexion.
+    `record` cumule en mémoire (par user_id: dernière connexion, nombre de connexions);
+    une tâche de fond écrit le cumul toutes les `interval` secondes, une requête
+    `UPDATE users ... FROM (VALUES ...)` par lot d'utilisateurs. Un utilisateur qui se
+    connecte cent fois dans l'intervalle coûte une seule mise à jour de ligne.
+    """
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        # user_id -> [dernière connexion, nombre de connexions depuis la dernière écriture]
+        self._pending: dict[int, list] = {}
+        self._task: asyncio.Task | None = None
+        # Écriture en cours, protégée de l'annulation (voir flush)
+        self._writing: asyncio.Future | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def record(self, user_id: int, logged_in_at: datetime | None = None) -> None:
+        if not self.enabled:
+            return
+        logged_in_at = logged_in_at or datetime.now(timezone.utc)
+        entry = self._pending.get(user_id)
+        if entry is None:
+            self._pending[user_id] = [logged_in_at, 1]
+        else:
+            entry[0] = max(entry[0], logged_in_at)
+            entry[1] += 1
+        LOGIN_TRACKING_EVENTS.inc("recorded")
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    @staticmethod
+    def _update_statement(rows: list[tuple[int, datetime, int]]):
+        logins = values(
+            column("user_id", Integer), column("logged_in_at", DateTime(timezone=True)), column("logins", Integer),
+            name="logins",
+        ).data(rows)
+        return (
+            update(User)
+            .where(User.id == logins.c.user_id)
+            .values(
+                last_login_at=func.greatest(func.coalesce(User.last_login_at, logins.c.logged_in_at), logins.c.logged_in_at),
+                login_count=User.login_count + logins.c.logins,
+            )
+        )
+
+    async def flush(self) -> int:
+        """
+        Écrit le cumul en attente. Retourne le nombre d'utilisateurs mis à jour.
+        En cas d'échec, le cumul est conservé pour l'écriture suivante. L'écriture va jusqu'au
+        bout même si l'appelant est annulé (stop() pendant une écriture périodique): le cumul
+        retiré de la mémoire est écrit ou réintégré, jamais perdu, et l'écriture suivante
+        attend la fin de celle en cours.
+        """
+        while self._writing is not None and not self._writing.done():
+            await asyncio.wait([self._writing])
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        self._writing = asyncio.ensure_future(self._write(pending))
+        return await asyncio.shield(self._writing)
+
+    async def _write(self, pending: dict[int, list]) -> int:
+        # Ordre des IDs constant: les workers verrouillent les lignes dans le même ordre (pas d'interblocage)
+        rows = [(user_id, logged_in_at, logins) for user_id, (logged_in_at, logins) in sorted(pending.items())]
+        written = 0
+        try:
+            async with get_async_engine().begin() as conn:
+                for start in range(0, len(rows), self.batch_size):
+                    result = await conn.execute(self._update_statement(rows[start:start + self.batch_size]))
+                    written += result.rowcount
+        except Exception:
+            LOGIN_TRACKING_EVENTS.inc("flush_failed")
+            logger.exception("Écriture du suivi des connexions impossible (%d utilisateurs)", len(rows))
+            for user_id, (logged_in_at, logins) in pending.items():
+                self.record_many(user_id, logged_in_at, logins)
+            return 0
+        LOGIN_TRACKING_EVENTS.inc("rows_written", amount=written)
+        LOGIN_TRACKING_EVENTS.inc("batches_written", amount=-(-len(rows) // self.batch_size))
+        return written
+
+    def record_many(self, user_id: int, logged_in_at: datetime, logins: int) -> None:
+        """Réintègre un cumul non écrit (les connexions enregistrées entre-temps sont conservées)."""
+        entry = self._pending.get(user_id)
+        if entry is None:
+            self._pending[user_id] = [logged_in_at, logins]
+        else:
+            entry[0] = max(entry[0], logged_in_at)
+            entry[1] += logins
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Démarre l'écriture périodique (appelé depuis le lifespan de l'application)."""
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête l'écriture périodique puis écrit le cumul restant."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+login_tracker = LoginTracker(settings.LOGIN_TRACKING_INTERVAL_SECONDS, settings.LOGIN_TRACKING_BATCH_SIZE)
@@ -1,42 +1,319 @@
 from passlib.context import CryptContext
-from datetime import datetime, timedelta, timezone
-from jose import jwt
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Protocol
+from jose import jwt, JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
 from src.config import settings
+from src.modules.auth.auth_keys import JwtKey, KeyRing, key_ring
+from src.metrics import timed
+from src.responses import dumps
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import logging
+import os
+import secrets
+import time
 
 logger = logging.getLogger(__name__)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+# Algorithmes JWT pris en charge par HmacTokenCodec -> fonction de hachage HMAC
+_HMAC_DIGESTS = {"HS256": "sha256", "HS384": "sha384", "HS512": "sha512"}
+
+
+def build_password_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    bcrypt_rounds: int = settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism: int = settings.PASSWORD_ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    Politique de hachage: `scheme` pour les nouveaux hachages, les autres algorithmes
+    restent acceptés en vérification. Un hachage d'un autre algorithme ou d'un autre coût
+    est signalé par needs_update (coût minimal = coût maximal = coût configuré), ce qui
+    permet de le refaire à la connexion suivante.
+    """
+    return CryptContext(
+        schemes=[scheme, *(other for other in PASSWORD_SCHEMES if other != scheme)],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__rounds=argon2_time_cost,
+        argon2__min_rounds=argon2_time_cost,
+        argon2__max_rounds=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_password_context()
+
+# Pool partagé pour les opérations bcrypt (créé à la première utilisation)
+_password_executor: Executor | None = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Vérifie si le mot de passe simple correspond au mot de passe haché."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Vérifie le mot de passe et retourne un nouveau hachage si la politique a changé."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Hache le mot de passe simple."""
     return pwd_context.hash(password)
 
+def get_password_executor() -> Executor | None:
+    """
+    Retourne le pool dédié au hachage des mots de passe.
+    Sa taille vaut PASSWORD_HASH_WORKERS, ou le nombre de cœurs par défaut.
+    Retourne None si le pool est désactivé (PASSWORD_HASH_WORKERS=0).
+    """
+    global _password_executor
+    workers = settings.PASSWORD_HASH_WORKERS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        return None
+
+    if _password_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _password_executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _password_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    return _password_executor
+
+def shutdown_password_executor() -> None:
+    """Arrête le pool de hachage (appelé à l'arrêt de l'application)."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=True)
+        _password_executor = None
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Version asynchrone de verify_password, exécutée hors de la boucle d'événements."""
+    executor = get_password_executor()
+    with timed("password_verify"):
+        if executor is None:
+            return verify_password(plain_password, hashed_password)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Version asynchrone de verify_and_update_password (vérification et rehachage dans le même appel au pool)."""
+    executor = get_password_executor()
+    with timed("password_verify"):
+        if executor is None:
+            return verify_and_update_password(plain_password, hashed_password)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Version asynchrone de get_password_hash, exécutée hors de la boucle d'événements."""
+    executor = get_password_executor()
+    with timed("password_hash"):
+        if executor is None:
+            return get_password_hash(password)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, get_password_hash, password)
+
+def _dummy_verify() -> None:
+    # Fonction de module (et non méthode liée) pour rester transmissible à un pool de processus
+    pwd_context.dummy_verify()
+
+async def warm_up_security() -> None:
+    """
+    Premier hachage et premier JWT hors requête: chargement du backend bcrypt, démarrage
+    du pool de hachage, initialisation des clés de signature et de vérification.
+    """
+    executor = get_password_executor()
+    if executor is None:
+        _dummy_verify()
+    else:
+        await asyncio.get_running_loop().run_in_executor(executor, _dummy_verify)
+    decode_access_token(create_access_token({"sub": "0"}))
+
+class TokenCodec(Protocol):
+    """Encodage et vérification des JWT avec les clés d'un trousseau."""
+    keys: KeyRing
+
+    def encode(self, claims: dict) -> str: ...
+
+    def decode(self, token: str) -> dict:
+        """Claims d'un token valide (signature et claims vérifiés). Lève JWTError."""
+        ...
+
+
+class JoseTokenCodec:
+    """python-jose pour tous les algorithmes: la clé est choisie d'après l'en-tête `kid`."""
+    def __init__(self, keys: KeyRing):
+        self.keys = keys
+
+    def encode(self, claims: dict) -> str:
+        signing_key = self.keys.signing_key
+        return jwt.encode(
+            claims,
+            signing_key.signer,
+            algorithm=signing_key.algorithm,
+            headers={"kid": signing_key.kid} if signing_key.kid else None,
+        )
+
+    def decode(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.verification_key(kid)
+        if key is None:
+            raise JWTError(f"Clé de signature inconnue: {kid}")
+        return jwt.decode(token, key.verifier, algorithms=[key.algorithm])
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class HmacTokenCodec:
+    """
+    Codec rapide pour les clés HMAC (HS256/384/512) du trousseau, compatible avec python-jose
+    (mêmes en-têtes, tokens acceptés dans les deux sens). L'en-tête encodé en base64 et l'état
+    HMAC initialisé avec la clé sont calculés une seule fois par clé; un token dont l'en-tête
+    ne correspond à aucune clé HMAC (RS256, ES256, `kid` inconnu...) est délégué à `fallback`.
+    Les claims sont vérifiés comme par jwt.decode sans options: exp, nbf, iat, sub, jti,
+    et rejet des tokens portant aud ou at_hash.
+    """
+    def __init__(self, keys: KeyRing, fallback: TokenCodec):
+        self.keys = keys
+        self.fallback = fallback
+        # En-tête base64 -> état HMAC de la clé correspondante
+        self._verifiers: dict[str, hmac.HMAC] = {}
+        for key in keys.verification_keys():
+            if key.algorithm in _HMAC_DIGESTS:
+                self._verifiers[self._header(key).decode()] = hmac.new(key.verifier.prepared_key, digestmod=_HMAC_DIGESTS[key.algorithm])
+        signing_key = keys.signing_key
+        self._signing_header = self._header(signing_key) if signing_key.algorithm in _HMAC_DIGESTS else None
+        self._signer = self._verifiers.get(self._signing_header.decode()) if self._signing_header else None
+
+    @staticmethod
+    def _header(key: JwtKey) -> bytes:
+        # Même sérialisation que python-jose (clés triées, sans espaces)
+        header = {"alg": key.algorithm, "typ": "JWT", **({"kid": key.kid} if key.kid else {})}
+        return _b64encode(json.dumps(header, separators=(",", ":"), sort_keys=True).encode())
+
+    def encode(self, claims: dict) -> str:
+        if self._signer is None:
+            return self.fallback.encode(claims)
+        signing_input = self._signing_header + b"." + _b64encode(dumps(claims))
+        mac = self._signer.copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64encode(mac.digest())).decode()
+
+    def decode(self, token: str) -> dict:
+        signing_input, _, signature = token.rpartition(".")
+        header, _, payload = signing_input.partition(".")
+        verifier = self._verifiers.get(header)
+        if verifier is None or not payload:
+            return self.fallback.decode(token)
+        try:
+            mac = verifier.copy()
+            mac.update(signing_input.encode("ascii"))
+            valid = hmac.compare_digest(mac.digest(), _b64decode(signature))
+        except (ValueError, binascii.Error):
+            raise JWTError("Invalid crypto padding")
+        if not valid:
+            raise JWTError("Signature verification failed.")
+        try:
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, binascii.Error):
+            raise JWTError("Invalid payload padding")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+        self._validate_claims(claims)
+        return claims
+
+    @staticmethod
+    def _validate_claims(claims: dict) -> None:
+        now = int(time.time())
+        for name in ("iat", "nbf", "exp"):
+            if name in claims and (isinstance(claims[name], bool) or not isinstance(claims[name], (int, float))):
+                raise JWTClaimsError(f"Claim {name} must be an integer.")
+        if "nbf" in claims and claims["nbf"] > now:
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+        if "exp" in claims and claims["exp"] < now:
+            raise ExpiredSignatureError("Signature has expired.")
+        if "aud" in claims:
+            raise JWTClaimsError("Invalid audience")
+        for name in ("sub", "jti"):
+            if name in claims and not isinstance(claims[name], str):
+                raise JWTClaimsError(f"Claim {name} must be a string.")
+        if "at_hash" in claims:
+            raise JWTClaimsError("No access_token provided to compare against at_hash claim.")
+
+
+_token_codec: TokenCodec | None = None
+
+
+def build_token_codec(keys: KeyRing, backend: str = settings.JWT_BACKEND) -> TokenCodec:
+    """Codec de JWT_BACKEND pour le trousseau: `fast` (HMAC précalculé, python-jose pour le reste) ou `jose`."""
+    jose_codec = JoseTokenCodec(keys)
+    if backend == "fast":
+        return HmacTokenCodec(keys, fallback=jose_codec)
+    return jose_codec
+
+def get_token_codec() -> TokenCodec:
+    """Codec du trousseau courant (reconstruit si le trousseau est remplacé, ex: rotation des clés)."""
+    global _token_codec
+    if _token_codec is None or _token_codec.keys is not key_ring:
+        _token_codec = build_token_codec(key_ring)
+    return _token_codec
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     Crée un token JWT avec une durée d'expiration.
-    Par défaut: 24 heures.
+    Par défaut: ACCESS_TOKEN_EXPIRE_MINUTES (courte durée, renouvelée via /auth/refresh).
+    exp et iat sont des timestamps entiers (secondes), comme les produisait python-jose.
+    iat_ms porte l'heure d'émission en millisecondes pour le contrôle de révocation: à la
+    seconde près, un token émis juste après une réactivation serait encore révoqué.
     """
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        # Token valide pour 24 heures par défaut
-        expire = datetime.now(timezone.utc) + timedelta(hours=24)
-    
-    to_encode.update({"exp": expire})
-    
-    # Ajout du temps d'émission pour plus de sécurité (iat: issued at)
-    to_encode.update({"iat": datetime.now(timezone.utc)}) 
-    
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.SECRET_KEY, 
-        algorithm=settings.ALGORITHM
-    )
-    logger.info(f"Token créé avec expiration: {expire}")
-    return encoded_jwt
\ No newline at end of file
+    issued_at = time.time()
+    now = int(issued_at)
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = now + int(expires_delta.total_seconds())
+    # iat (issued at) et iat_ms: comparés aux révocations
+    to_encode = {**data, "exp": expire, "iat": now, "iat_ms": int(issued_at * 1000)}
+
+    # Clé active du trousseau (déjà analysée) ; le `kid` permet la rotation des clés
+    with timed("jwt_encode"):
+        encoded_jwt = get_token_codec().encode(to_encode)
+    logger.debug("Token créé avec expiration: %s", expire)
+    return encoded_jwt
+
+def decode_access_token(token: str) -> dict:
+    """
+    Vérifie la signature et les claims d'un token JWT.
+    La clé est choisie d'après l'en-tête `kid` et seul son algorithme est accepté.
+    """
+    return get_token_codec().decode(token)
+
+def new_session_id() -> str:
+    """Identifiant de session (famille de refresh tokens), porté par les access tokens (claim `sid`)."""
+    return secrets.token_hex(16)
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """Empreinte SHA-256 d'un refresh token: seule cette valeur est stockée en base."""
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+def generate_refresh_token() -> tuple[str, str]:
+    """Génère un refresh token opaque et retourne (token, empreinte)."""
+    refresh_token = secrets.token_urlsafe(32)
+    return refresh_token, hash_refresh_token(refresh_token)
@@ -1,15 +1,89 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Boolean, func
+from sqlalchemy.orm import validates
 from src.data.domain import Base
 
+
+def normalize_email(email: str) -> str:
+    """
+    Forme canonique d'un email pour l'unicité et les recherches (insensibles à la casse).
+    Identique à lower() en SQL, utilisé par la migration qui a rempli les lignes existantes.
+    """
+    return email.lower()
+
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    # Email tel que saisi (affiché); l'unicité et les recherches portent sur email_normalized
+    email = Column(String, nullable=False)
+    email_normalized = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     first_name = Column(String, default="", nullable=False)
     last_name = Column(String, default="", nullable=False)
     is_active = Column(Boolean, default=True)
+    # Mis à jour par lots (auth_login_tracker), pas à chaque connexion
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+    login_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    @validates("email")
+    def _normalize_email(self, key: str, email: str) -> str:
+        self.email_normalized = normalize_email(email)
+        return email
+
+    def __repr__(self):
+        return f"<User(id={self.id}, email='{self.email}', name='{self.first_name} {self.last_name}')>"
+
+
+class RefreshToken(Base):
+    """Refresh token (stocké haché). Tous les tokens d'une même session partagent un family_id."""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id='{self.family_id}')>"
+
+
+class TokenRevocation(Base):
+    """
+    Révocation d'access tokens encore valides: toute une session (family_id)
+    ou tous les tokens d'un utilisateur émis avant revoked_at.
+    Chargée en mémoire par la liste de révocation ; inutile après expires_at.
+    """
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=True)
+    family_id = Column(String(32), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TokenRevocation(id={self.id}, user_id={self.user_id}, family_id='{self.family_id}')>"
+
+
+class LoginEvent(Base):
+    """
+    Journal d'audit des inscriptions et connexions (succès, échecs, blocages).
+    Écrit par lots en tâche de fond: created_at est l'heure de l'événement, pas de l'insertion.
+    Pas de clé étrangère: l'historique survit à la suppression du compte.
+    """
+    __tablename__ = "login_events"
+    __table_args__ = (Index("ix_login_events_user_id_created_at", "user_id", "created_at"),)
+
+    id = Column(BigInteger, primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    event = Column(String(32), nullable=False)
+    email = Column(String, nullable=False)
+    user_id = Column(Integer, nullable=True)
+    client_ip = Column(String(45), nullable=True)
 
     def __repr__(self):
-        return f"<User(id={self.id}, email='{self.email}', name='{self.first_name} {self.last_name}')>"
\ No newline at end of file
+        return f"<LoginEvent(id={self.id}, event='{self.event}', email='{self.email}')>"
@@ -1,9 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from sqlalchemy import Integer, any_, bindparam, func, update
 from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException, status
-from src.modules.auth.auth_model import User
-from src.modules.auth.auth_dto import UserCreate
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from src.data.domain import begin_write, replica_scalar
+from src.metrics import timed
+from src.modules.auth.auth_model import User, RefreshToken, TokenRevocation, normalize_email
+from src.modules.auth.auth_dto import UserCreate, UserInDB
+from src.modules.auth.auth_user_cache import user_cache
 
 class UserRepository:
     """
@@ -13,34 +17,185 @@ class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @staticmethod
+    def hot_statements() -> list:
+        """Requêtes du chemin critique, préparées sur les connexions du pool au démarrage."""
+        return [select(User).where(User.email_normalized == ""), select(User).where(User.id == 0)]
+
+    def _use_cache(self) -> bool:
+        # Après une écriture, la session lit ses propres données non validées: ni lecture ni alimentation du cache
+        return user_cache.enabled and not self.db.info.get("writes")
+
+    @timed("db_get_user_by_email")
     async def get_user_by_email(self, email: str) -> User | None:
-        stmt = select(User).where(User.email == email)
-        result = await self.db.execute(stmt)
-        return result.scalars().first()
+        """
+        Récupère un utilisateur par email, sans tenir compte de la casse (index unique sur
+        email_normalized): cache utilisateurs, puis réplica s'il y en a.
+        Un utilisateur servi par le cache est détaché de la session.
+        """
+        use_cache = self._use_cache()
+        if use_cache and (user := await user_cache.get_by_email(email)) is not None:
+            return user
+        stmt = select(User).where(User.email_normalized == normalize_email(email))
+        user = await replica_scalar(self.db, stmt)
+        if use_cache and user is not None:
+            await user_cache.put([user])
+        return user
     
+    @timed("db_get_user_by_id")
     async def get_user_by_id(self, user_id: int) -> User | None:
-        """Récupère un utilisateur par son ID."""
+        """Récupère un utilisateur par son ID: cache utilisateurs, puis réplica s'il y en a."""
+        use_cache = self._use_cache()
+        if use_cache and (user := await user_cache.get_by_id(user_id)) is not None:
+            return user
         stmt = select(User).where(User.id == user_id)
+        user = await replica_scalar(self.db, stmt)
+        if use_cache and user is not None:
+            await user_cache.put([user])
+        return user
+
+    @timed("db_get_active_flags")
+    async def get_active_flags(self, user_ids: set[int]) -> dict[int, bool]:
+        """
+        Statut (is_active) de plusieurs utilisateurs en une requête: `id = ANY(:ids)` avec
+        un seul paramètre tableau, donc une seule requête préparée quelle que soit la taille du lot.
+        Les IDs inconnus sont absents du résultat. Avec le cache utilisateurs, seuls les IDs
+        absents du cache sont lus (lignes complètes, ajoutées au cache).
+        """
+        if not self._use_cache():
+            stmt = select(User.id, User.is_active).where(User.id == any_(bindparam("ids", list(user_ids), type_=ARRAY(Integer))))
+            result = await self.db.execute(stmt)
+            return {user_id: bool(is_active) for user_id, is_active in result.all()}
+
+        cached = await user_cache.get_many_by_id(list(user_ids))
+        missing = [user_id for user_id in user_ids if user_id not in cached]
+        if missing:
+            stmt = select(User).where(User.id == any_(bindparam("ids", missing, type_=ARRAY(Integer))))
+            loaded = (await self.db.scalars(stmt)).all()
+            await user_cache.put(loaded)
+            cached.update((user.id, user) for user in loaded)
+        return {user_id: bool(user.is_active) for user_id, user in cached.items()}
+
+    @timed("db_get_users_page")
+    async def get_users_page(self, after_id: int, limit: int, is_active: bool | None = None):
+        """
+        Page d'utilisateurs triés par ID, après `after_id` (pagination par clé, sans OFFSET).
+        Seules les colonnes exposées par UserInDB sont lues.
+        """
+        columns = [getattr(User, name) for name in UserInDB.model_fields]
+        stmt = select(*columns).where(User.id > after_id).order_by(User.id).limit(limit)
+        if is_active is not None:
+            stmt = stmt.where(User.is_active == is_active)
         result = await self.db.execute(stmt)
-        return result.scalars().first()
+        return result.all()
+
+    @timed("db_set_user_active")
+    async def set_user_active(self, user_id: int, is_active: bool) -> User | None:
+        """Active ou désactive un utilisateur. Retourne None si l'utilisateur n'existe pas."""
+        # Lecture dans la transaction de l'écriture: une seule connexion pour la session
+        begin_write(self.db)
+        user = await self.db.scalar(select(User).where(User.id == user_id))
+        if user is None:
+            return None
+        user.is_active = is_active
+        await self.db.flush()
+        await user_cache.invalidate_on_write(self.db, user.id, user.email)
+        return user
+
+    @timed("db_update_password_hash")
+    async def update_password_hash(self, user: User, new_hash: str) -> bool:
+        """
+        Remplace le hachage du mot de passe (rehachage après changement de politique).
+        Sans effet si le hachage a changé entre-temps (mot de passe modifié en parallèle).
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(hashed_password=new_hash)
+        )
+        result = await self.db.execute(stmt)
+        await user_cache.invalidate_on_write(self.db, user.id, user.email)
+        return result.rowcount == 1
 
-    async def create_user(self, user_in: UserCreate, hashed_password: str) -> User:
-        """Crée un nouvel utilisateur avec gestion d'erreur pour les contraintes uniques."""
-        try:
-            db_user = User(
+    @timed("db_insert_user_returning")
+    async def insert_user_returning(self, user_in: UserCreate, hashed_password: str) -> User | None:
+        """
+        Crée un utilisateur en une seule requête (INSERT ... ON CONFLICT DO NOTHING RETURNING).
+        Retourne None si l'email existe déjà (à la casse près), sans requête de vérification préalable.
+        """
+        stmt = (
+            pg_insert(User)
+            .values(
                 email=user_in.email,
+                email_normalized=normalize_email(user_in.email),
                 hashed_password=hashed_password,
                 first_name=user_in.first_name or "",
                 last_name=user_in.last_name or "",
                 is_active=True
             )
-            self.db.add(db_user)
-            await self.db.flush()  # Force l'ID à être rempli sans commit
-            await self.db.refresh(db_user)  # Rafraîchit l'objet avec les données de la DB
-            return db_user
-        except IntegrityError:
-            await self.db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Un utilisateur avec cet email existe déjà"
-            )
\ No newline at end of file
+            .on_conflict_do_nothing(index_elements=[User.email_normalized])
+            .returning(User)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+
+class RefreshTokenRepository:
+    """
+    Accès aux refresh tokens et aux révocations d'access tokens.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @timed("db_create_refresh_token")
+    async def create_refresh_token(self, user_id: int, family_id: str, token_hash: str, expires_at: datetime) -> RefreshToken:
+        refresh_token = RefreshToken(
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=token_hash,
+            expires_at=expires_at
+        )
+        self.db.add(refresh_token)
+        await self.db.flush()
+        return refresh_token
+
+    @timed("db_get_refresh_token")
+    async def get_refresh_token(self, token_hash: str) -> RefreshToken | None:
+        """Récupère un refresh token en verrouillant la ligne (rotation concurrente impossible)."""
+        stmt = select(RefreshToken).where(RefreshToken.token_hash == token_hash).with_for_update()
+        result = await self.db.execute(stmt)
+        return result.scalars().first()
+
+    @timed("db_revoke_refresh_tokens")
+    async def revoke_refresh_tokens(self, *, family_id: str | None = None, user_id: int | None = None, token_id: int | None = None) -> None:
+        """Révoque les refresh tokens encore actifs d'un token, d'une session ou d'un utilisateur."""
+        stmt = update(RefreshToken).where(RefreshToken.revoked_at.is_(None)).values(revoked_at=func.now())
+        if token_id is not None:
+            stmt = stmt.where(RefreshToken.id == token_id)
+        if family_id is not None:
+            stmt = stmt.where(RefreshToken.family_id == family_id)
+        if user_id is not None:
+            stmt = stmt.where(RefreshToken.user_id == user_id)
+        await self.db.execute(stmt)
+
+    @timed("db_add_revocation")
+    async def add_revocation(self, expires_at: datetime, *, user_id: int | None = None, family_id: str | None = None) -> TokenRevocation:
+        # revoked_at fixé ici et non par now() (heure de début de transaction, potentiellement antérieure)
+        revocation = TokenRevocation(
+            user_id=user_id,
+            family_id=family_id,
+            revoked_at=datetime.now(timezone.utc),
+            expires_at=expires_at
+        )
+        self.db.add(revocation)
+        await self.db.flush()
+        return revocation
+
+    @timed("db_get_revocations_since")
+    async def get_revocations_since(self, since: datetime | None, now: datetime) -> list[TokenRevocation]:
+        """Révocations non expirées postérieures à `since` (toutes si None: chargement initial)."""
+        stmt = select(TokenRevocation).where(TokenRevocation.expires_at > now).order_by(TokenRevocation.revoked_at)
+        if since is not None:
+            stmt = stmt.where(TokenRevocation.revoked_at > since)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
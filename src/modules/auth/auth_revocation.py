@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+
+from src.config import settings
+from src.data.domain import AsyncSessionLocal
+from src.modules.auth.auth_model import TokenRevocation
+from src.modules.auth.auth_repo import RefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Liste de révocation des access tokens, gardée en mémoire et vérifiée en O(1)
+    (dictionnaires indexés par utilisateur et par session).
+    Elle est rechargée par incréments depuis token_revocations (révoquées après la dernière
+    révocation vue, moins `overlap` secondes: revoked_at est fixé avant la validation, une
+    transaction plus ancienne peut être validée après une plus récente), ce qui évite toute
+    requête base de données sur les routes protégées.
+    """
+    def __init__(self, overlap: float = 60):
+        self.overlap = overlap
+        # user_id -> (révoqué à, expire à): tokens de l'utilisateur émis avant la révocation
+        self._users: dict[int, tuple[float, float]] = {}
+        # family_id -> expire à: tous les tokens de la session
+        self._families: dict[str, float] = {}
+        # Dernière révocation vue (revoked_at), base du rechargement incrémental
+        self._watermark: datetime | None = None
+        self._task: asyncio.Task | None = None
+
+    def is_revoked(self, user_id: int, session_id: str | None, issued_at: float) -> bool:
+        user_revocation = self._users.get(user_id)
+        if user_revocation is not None and issued_at <= user_revocation[0]:
+            return True
+        return session_id is not None and session_id in self._families
+
+    def add(self, revocation: TokenRevocation) -> None:
+        expires_at = revocation.expires_at.timestamp()
+        if revocation.user_id is not None:
+            revoked_at = revocation.revoked_at.timestamp()
+            current = self._users.get(revocation.user_id)
+            if current is None or current[0] < revoked_at:
+                self._users[revocation.user_id] = (revoked_at, expires_at)
+        if revocation.family_id is not None:
+            self._families[revocation.family_id] = max(expires_at, self._families.get(revocation.family_id, 0))
+        if self._watermark is None or revocation.revoked_at > self._watermark:
+            self._watermark = revocation.revoked_at
+
+    def prune(self, now: float | None = None) -> None:
+        """Oublie les révocations dont tous les tokens concernés ont expiré."""
+        now = now or time.time()
+        self._users = {user_id: entry for user_id, entry in self._users.items() if entry[1] > now}
+        self._families = {family_id: expires for family_id, expires in self._families.items() if expires > now}
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._families.clear()
+        self._watermark = None
+
+    def stats(self) -> dict:
+        return {"users": len(self._users), "families": len(self._families), "watermark": self._watermark}
+
+    async def refresh(self) -> int:
+        """Charge les révocations apparues depuis le dernier passage. Retourne le nombre de lignes lues."""
+        since = None if self._watermark is None else self._watermark - timedelta(seconds=self.overlap)
+        async with AsyncSessionLocal() as session:
+            revocations = await RefreshTokenRepository(session).get_revocations_since(since, datetime.now(timezone.utc))
+        for revocation in revocations:
+            self.add(revocation)
+        self.prune()
+        return len(revocations)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Échec du rafraîchissement de la liste de révocation")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Démarre le rafraîchissement périodique (appelé depuis le lifespan de l'application)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList(settings.REVOCATION_REFRESH_OVERLAP_SECONDS)
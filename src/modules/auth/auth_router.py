@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
+from src.config import settings
 from src.modules.auth.auth_app import UserCreate, UserInDB, Token, UserLogin
 from src.modules.auth.auth_app import AuthAppService
+from src.modules.auth.auth_dto import IntrospectRequest, IntrospectResponse, RefreshRequest, UserImportReport
+from src.modules.auth.auth_export import EXPORT_MEDIA_TYPES, ExportFormat, export_users
+from src.modules.auth.auth_import import ImportFormat, import_users, iter_lines_from_chunks, parse_records
+from src.responses import FastJSONResponse, dumps
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+# Corps de /users/me pré-encodé: seul l'ID change d'une requête à l'autre
+_USERS_ME_PREFIX = b'{"user_id":'
+_USERS_ME_SUFFIX = b',"message":' + dumps("Accès autorisé à la ressource protégée.") + b"}"
 router = APIRouter(
     prefix="/auth",
     tags=["Authentification"],
@@ -21,6 +31,20 @@ async def get_current_user_id(
     return await auth_service.get_current_user_id_from_token(token)
 
 
+async def get_current_admin_id(
+    current_user_id: int = Depends(get_current_user_id)
+) -> int:
+    """
+    Dépendance réservant un endpoint aux administrateurs (settings.ADMIN_USER_IDS).
+    """
+    if current_user_id not in settings.ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé aux administrateurs"
+        )
+    return current_user_id
+
+
 @router.post(
     "/register", 
     response_model=UserInDB, 
@@ -29,13 +53,16 @@ async def get_current_user_id(
 )
 async def register(
     user_in: UserCreate, 
+    request: Request,
     auth_service: AuthAppService = Depends()
 ):
     """
     Point de terminaison pour l'inscription d'un nouvel utilisateur.
     Appelle le Service Applicatif pour gérer la logique d'inscription.
     """
-    return await auth_service.register_new_user(user_in)
+    client_ip = request.client.host if request.client else None
+    user = await auth_service.register_new_user(user_in, client_ip)
+    return FastJSONResponse(user, status_code=status.HTTP_201_CREATED)
 
 @router.post(
     "/login",
@@ -45,13 +72,48 @@ async def register(
 )
 async def login(
     user_login: UserLogin,
+    request: Request,
     auth_service: AuthAppService = Depends()
 ):
     """
     Point de terminaison pour la connexion.
     Valide les identifiants et retourne un jeton d'accès JWT.
+    Retourne 429 (limite de tentatives) ou 503 (surcharge) avec un en-tête Retry-After.
+    """
+    client_ip = request.client.host if request.client else None
+    return FastJSONResponse(await auth_service.authenticate_user(user_login, client_ip))
+
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+    status_code=status.HTTP_200_OK,
+    summary="Renouvellement de l'access token via un refresh token",
+)
+async def refresh(
+    body: RefreshRequest,
+    auth_service: AuthAppService = Depends()
+):
+    """
+    Échange un refresh token valide contre un nouvel access token et un nouveau refresh token.
+    Le refresh token présenté est révoqué (rotation).
+    """
+    return FastJSONResponse(await auth_service.refresh_access_token(body.refresh_token))
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Déconnexion: révoque la session du refresh token",
+)
+async def logout(
+    body: RefreshRequest,
+    auth_service: AuthAppService = Depends()
+):
+    """
+    Révoque la session: ses refresh tokens et les access tokens encore valides.
     """
-    return await auth_service.authenticate_user(user_login)
+    await auth_service.logout(body.refresh_token)
 
 
 @router.get(
@@ -67,4 +129,73 @@ async def read_users_me(
     Il retourne l'ID de l'utilisateur qui a fourni un jeton valide.
     Si le jeton est invalide ou manquant, FastAPI retourne 401 Unauthorized.
     """
-    return {"user_id": current_user_id, "message": "Accès autorisé à la ressource protégée."}
\ No newline at end of file
+    return Response(
+        content=_USERS_ME_PREFIX + str(current_user_id).encode() + _USERS_ME_SUFFIX,
+        media_type="application/json",
+    )
+
+
+@router.post(
+    "/introspect",
+    response_model=IntrospectResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Introspection d'un lot d'access tokens (passerelles d'API)",
+)
+async def introspect(
+    body: IntrospectRequest,
+    auth_service: AuthAppService = Depends()
+):
+    """
+    Vérifie jusqu'à 1000 tokens en un appel et retourne, pour chacun et dans le même ordre,
+    s'il est actif et l'ID de son utilisateur. Le statut des comptes est lu en une requête
+    pour tout le lot (au lieu d'un appel à /users/me par token).
+    """
+    return FastJSONResponse(IntrospectResponse(results=await auth_service.introspect_tokens(body.tokens)))
+
+
+@router.post(
+    "/admin/users/import",
+    response_model=UserImportReport,
+    summary="Import en masse d'utilisateurs (CSV ou JSONL)",
+)
+async def import_users_bulk(
+    request: Request,
+    format: ImportFormat = Query("csv", description="Format du corps de la requête"),
+    admin_id: int = Depends(get_current_admin_id)
+):
+    """
+    Point de terminaison d'import en masse, réservé aux administrateurs.
+    Le corps (CSV avec en-tête ou JSONL) est lu en flux et chargé par blocs via COPY.
+    Le bilan retourne un échantillon des lignes rejetées (doublons et lignes invalides).
+    """
+    records = parse_records(iter_lines_from_chunks(request.stream()), format)
+    return await import_users(
+        records,
+        chunk_size=settings.IMPORT_CHUNK_SIZE,
+        max_reported_rejects=100,
+    )
+
+
+@router.get(
+    "/admin/users/export",
+    summary="Export en flux des utilisateurs (NDJSON ou CSV)",
+    response_class=StreamingResponse,
+)
+async def export_users_stream(
+    format: ExportFormat = Query("ndjson", description="Format de sortie"),
+    is_active: bool | None = Query(None, description="Filtrer sur le statut du compte"),
+    admin_id: int = Depends(get_current_admin_id)
+):
+    """
+    Point de terminaison d'export, réservé aux administrateurs.
+    La table est lue par pages (pagination par clé sur l'ID) et envoyée au fil de l'eau:
+    la mémoire reste constante quel que soit le nombre d'utilisateurs.
+    """
+    headers = {}
+    if format == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="users.csv"'
+    return StreamingResponse(
+        export_users(format, settings.EXPORT_BATCH_SIZE, is_active),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
@@ -0,0 +1,177 @@
+from collections import deque
+from contextlib import contextmanager
+import math
+import time
+import uuid
+from typing import Protocol
+
+from fastapi import HTTPException, status
+
+from src.config import settings
+from src.metrics import REGISTRY
+
+LOGIN_SHED = REGISTRY.counter(
+    "auth_login_shed_total", "Tentatives de connexion rejetées avant la vérification du mot de passe", ("reason",)
+)
+
+
+class RateLimitBackend(Protocol):
+    """
+    Stockage des fenêtres glissantes.
+    `acquire` enregistre une tentative si la limite n'est pas atteinte et retourne 0,
+    sinon retourne le délai (secondes) avant la prochaine tentative autorisée.
+    """
+    async def acquire(self, key: str, limit: int, window: float) -> float: ...
+
+    async def reset(self) -> None: ...
+
+
+class InMemoryRateLimitBackend:
+    """Fenêtres glissantes en mémoire, propres au worker."""
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._attempts: dict[str, deque[float]] = {}
+
+    async def acquire(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            if len(self._attempts) >= self.max_keys:
+                self._sweep(now, window)
+            attempts = self._attempts[key] = deque()
+
+        while attempts and attempts[0] <= now - window:
+            attempts.popleft()
+        if len(attempts) >= limit:
+            return attempts[0] + window - now
+        attempts.append(now)
+        return 0.0
+
+    async def reset(self) -> None:
+        self._attempts.clear()
+
+    def _sweep(self, now: float, window: float) -> None:
+        # Supprime les clés dont la dernière tentative est sortie de la fenêtre
+        stale = [key for key, attempts in self._attempts.items() if not attempts or attempts[-1] <= now - window]
+        for key in stale:
+            del self._attempts[key]
+
+
+class RedisRateLimitBackend:
+    """
+    Fenêtres glissantes partagées entre workers (sorted sets Redis, script Lua atomique).
+    Nécessite le paquet optionnel `redis`.
+    """
+    _SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return tostring(tonumber(oldest[2]) + window - now)
+    end
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+    """
+
+    def __init__(self, url: str, prefix: str = "auth:ratelimit:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("Le backend Redis nécessite le paquet 'redis' (pip install redis)") from e
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    async def acquire(self, key: str, limit: int, window: float) -> float:
+        retry_after = await self._script(
+            keys=[self.prefix + key],
+            args=[time.time(), window, limit, uuid.uuid4().hex],
+        )
+        return float(retry_after)
+
+    async def reset(self) -> None:
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+
+class ConcurrencyGate:
+    """
+    Limite non bloquante du nombre d'opérations simultanées (ex: vérifications bcrypt).
+    Au-delà de la limite, la requête est rejetée immédiatement plutôt que mise en file.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.limit > 0 and self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+def build_rate_limit_backend() -> RateLimitBackend:
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("LOGIN_RATE_LIMIT_BACKEND=redis nécessite REDIS_URL")
+        return RedisRateLimitBackend(settings.REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+
+class LoginThrottle:
+    """
+    Protège le CPU consacré à bcrypt:
+    - limite par email et par IP sur une fenêtre glissante (429),
+    - plafond global de vérifications de mot de passe simultanées (503).
+    """
+    def __init__(self, backend: RateLimitBackend, gate: ConcurrencyGate):
+        self.backend = backend
+        self.gate = gate
+
+    async def check_attempt(self, email: str, client_ip: str | None) -> None:
+        """Enregistre la tentative ou lève 429 si une limite est atteinte."""
+        window = settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+        # IP d'abord: une IP bloquée ne consomme pas le quota de l'email visé (sinon un
+        # attaquant limité par IP pourrait encore bloquer le compte de la victime)
+        checks = []
+        if client_ip:
+            checks.append(("ip", client_ip, settings.LOGIN_RATE_LIMIT_PER_IP))
+        checks.append(("email", email.lower(), settings.LOGIN_RATE_LIMIT_PER_EMAIL))
+
+        for scope, value, limit in checks:
+            if limit <= 0:
+                continue
+            retry_after = await self.backend.acquire(f"{scope}:{value}", limit, window)
+            if retry_after > 0:
+                LOGIN_SHED.inc(f"rate_limit_{scope}")
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Trop de tentatives de connexion, réessayez plus tard",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+    @contextmanager
+    def password_check(self):
+        """Réserve une place pour une opération bcrypt ou lève 503 si le plafond est atteint."""
+        if not self.gate.try_acquire():
+            LOGIN_SHED.inc("overload")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service surchargé, réessayez plus tard",
+                headers={"Retry-After": str(settings.PASSWORD_CHECK_RETRY_AFTER_SECONDS)},
+            )
+        try:
+            yield
+        finally:
+            self.gate.release()
+
+
+login_throttle = LoginThrottle(
+    build_rate_limit_backend(),
+    ConcurrencyGate(settings.MAX_CONCURRENT_PASSWORD_CHECKS),
+)
@@ -0,0 +1,421 @@
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import struct
+import time
+from typing import Protocol
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.metrics import REGISTRY
+from src.modules.auth.auth_model import User, normalize_email
+from src.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_EVENTS = REGISTRY.counter(
+    "user_cache_events_total", "Cache des utilisateurs: hits, misses, écritures et invalidations", ("event",)
+)
+USER_CACHE_INVALIDATION_LAG = REGISTRY.histogram(
+    "user_cache_invalidation_lag_seconds", "Délai entre la publication d'une invalidation et sa réception par un autre worker"
+)
+
+# Colonnes mises en cache: celles lues par le login, le refresh et l'introspection
+# (les compteurs de connexion, écrits par lots, n'invalident pas le cache)
+_USER_COLUMNS = ("id", "email", "email_normalized", "hashed_password", "first_name", "last_name", "is_active")
+
+
+class UserCacheBackend(Protocol):
+    """
+    Stockage des lignes `users` (dictionnaires colonne -> valeur) par clé.
+    `delete` invalide la clé pour tous les workers (directement ou par message publié).
+    """
+    async def get_many(self, keys: list[str]) -> list[dict | None]: ...
+
+    async def set_many(self, items: dict[str, dict]) -> None: ...
+
+    async def delete(self, keys: list[str]) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class InMemoryUserCacheBackend:
+    """LRU en mémoire avec durée de vie, propre au worker (invalidations locales uniquement)."""
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+
+    def get_local(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set_local(self, key: str, value: dict) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete_local(self, keys: list[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear_local(self) -> None:
+        self._entries.clear()
+
+    async def get_many(self, keys: list[str]) -> list[dict | None]:
+        return [self.get_local(key) for key in keys]
+
+    async def set_many(self, items: dict[str, dict]) -> None:
+        for key, value in items.items():
+            self.set_local(key, value)
+
+    async def delete(self, keys: list[str]) -> None:
+        self.delete_local(keys)
+
+    async def clear(self) -> None:
+        self.clear_local()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+def open_shared_segment(name: str, size: int) -> SharedMemory:
+    """
+    Ouvre le segment partagé `name`, ou le crée s'il n'existe pas encore.
+    Le segment survit aux workers: il est supprimé par le lanceur (`python -m src.server`).
+    """
+    try:
+        segment = SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+        segment = SharedMemory(name)
+    # Sinon le resource tracker le supprimerait à la fin du premier worker qui l'a ouvert
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class SharedMemoryUserCacheBackend:
+    """
+    Table partagée par les workers d'une même machine (multiprocessing.shared_memory).
+    Chaque clé a une case déterminée par son hachage (une écriture remplace l'occupant):
+    [hachage de la clé: 8 o][expiration: double][longueur: uint32][somme de contrôle: 8 o][JSON].
+    Pas de verrou entre processus: une lecture concurrente d'une écriture échoue à la
+    vérification de la somme de contrôle et compte comme un miss. Une invalidation efface
+    la case, visible immédiatement par tous les workers.
+    """
+    _HEADER = struct.Struct("<8sdI8s")
+
+    def __init__(self, name: str, slots: int, slot_bytes: int, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.slot_bytes = slot_bytes
+        self._segment = open_shared_segment(name, slots * slot_bytes)
+        # Le segment existant peut avoir été créé avec une autre taille
+        self.slots = self._segment.size // slot_bytes
+        self._buffer = self._segment.buf
+
+    @staticmethod
+    def _digest(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=8).digest()
+
+    def _offset(self, key_hash: bytes) -> int:
+        return int.from_bytes(key_hash, "little") % self.slots * self.slot_bytes
+
+    def _read(self, key: str) -> dict | None:
+        key_hash = self._digest(key.encode())
+        offset = self._offset(key_hash)
+        stored_hash, expires_at, length, checksum = self._HEADER.unpack_from(self._buffer, offset)
+        if stored_hash != key_hash or expires_at <= time.time() or length > self.slot_bytes - self._HEADER.size:
+            return None
+        start = offset + self._HEADER.size
+        payload = bytes(self._buffer[start:start + length])
+        if self._digest(key_hash + struct.pack("<d", expires_at) + payload) != checksum:
+            return None
+        return json.loads(payload)
+
+    def _write(self, key: str, value: dict) -> None:
+        payload = dumps(value)
+        if len(payload) > self.slot_bytes - self._HEADER.size:
+            return
+        key_hash = self._digest(key.encode())
+        offset = self._offset(key_hash)
+        expires_at = time.time() + self.ttl_seconds
+        checksum = self._digest(key_hash + struct.pack("<d", expires_at) + payload)
+        start = offset + self._HEADER.size
+        self._buffer[start:start + len(payload)] = payload
+        self._HEADER.pack_into(self._buffer, offset, key_hash, expires_at, len(payload), checksum)
+
+    async def get_many(self, keys: list[str]) -> list[dict | None]:
+        return [self._read(key) for key in keys]
+
+    async def set_many(self, items: dict[str, dict]) -> None:
+        for key, value in items.items():
+            self._write(key, value)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            key_hash = self._digest(key.encode())
+            offset = self._offset(key_hash)
+            if self._buffer[offset:offset + 8] == key_hash:
+                self._HEADER.pack_into(self._buffer, offset, bytes(8), 0.0, 0, bytes(8))
+
+    async def clear(self) -> None:
+        self._buffer[:self.slots * self.slot_bytes] = bytes(self.slots * self.slot_bytes)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._buffer = None
+        self._segment.close()
+
+
+class RedisUserCacheBackend:
+    """
+    Cache partagé dans Redis, précédé d'un petit cache local par worker (TTL court) pour
+    éviter un aller-retour réseau par lecture. Une invalidation supprime la clé dans Redis
+    et publie un message: chaque worker abonné la retire de son cache local. Le message
+    porte son heure d'émission (mesure du délai d'invalidation).
+    Nécessite le paquet optionnel `redis`.
+    """
+    CHANNEL = "auth:user-cache:invalidate"
+
+    def __init__(self, url: str, ttl_seconds: float, local: InMemoryUserCacheBackend, prefix: str = "auth:user:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("Le backend Redis nécessite le paquet 'redis' (pip install redis)") from e
+        self.ttl_seconds = ttl_seconds
+        self.local = local
+        self.prefix = prefix
+        self.worker_id = uuid.uuid4().hex
+        self._client = redis_asyncio.from_url(url)
+        self._task: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+
+    async def get_many(self, keys: list[str]) -> list[dict | None]:
+        values = [self.local.get_local(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            stored = await self._client.mget([self.prefix + keys[i] for i in missing])
+            for i, raw in zip(missing, stored):
+                if raw is not None:
+                    values[i] = json.loads(raw)
+                    self.local.set_local(keys[i], values[i])
+        return values
+
+    async def set_many(self, items: dict[str, dict]) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(self.prefix + key, dumps(value), px=int(self.ttl_seconds * 1000))
+                self.local.set_local(key, value)
+            await pipe.execute()
+
+    async def delete(self, keys: list[str]) -> None:
+        self.local.delete_local(keys)
+        message = dumps({"keys": keys, "sent_at": time.time(), "origin": self.worker_id})
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.delete(*(self.prefix + key for key in keys))
+            pipe.publish(self.CHANNEL, message)
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        self.local.clear_local()
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+    def _on_message(self, raw: bytes) -> None:
+        message = json.loads(raw)
+        if message["origin"] == self.worker_id:
+            return
+        self.local.delete_local(message["keys"])
+        USER_CACHE_EVENTS.inc("invalidation_received")
+        USER_CACHE_INVALIDATION_LAG.observe(max(time.time() - message["sent_at"], 0.0))
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                # Des invalidations ont pu être manquées avant l'abonnement
+                self.local.clear_local()
+                self._subscribed.set()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Abonnement aux invalidations du cache utilisateurs interrompu")
+                self._subscribed.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """Abonnement aux invalidations (appelé depuis le lifespan); attend qu'il soit actif."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout=5)
+        except TimeoutError:
+            logger.warning("Abonnement aux invalidations du cache utilisateurs pas encore actif")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._client.aclose()
+
+
+def build_user_cache_backend() -> UserCacheBackend | None:
+    backend = settings.USER_CACHE_BACKEND
+    if backend == "memory":
+        return InMemoryUserCacheBackend(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+    if backend == "shm":
+        return SharedMemoryUserCacheBackend(
+            settings.USER_CACHE_SHM_NAME, settings.USER_CACHE_SIZE,
+            settings.USER_CACHE_SHM_SLOT_BYTES, settings.USER_CACHE_TTL_SECONDS,
+        )
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("USER_CACHE_BACKEND=redis nécessite REDIS_URL")
+        local = InMemoryUserCacheBackend(settings.USER_CACHE_SIZE, settings.USER_CACHE_LOCAL_TTL_SECONDS)
+        return RedisUserCacheBackend(settings.REDIS_URL, settings.USER_CACHE_TTL_SECONDS, local)
+    return None
+
+
+class UserCache:
+    """
+    Cache des lectures de UserRepository (par ID, par email, statut d'un lot d'IDs).
+    Les lignes sont rendues sous forme d'objets User détachés (hors session).
+    Les écritures sur un utilisateur appellent `invalidate`; seules les lectures faites
+    hors transaction d'écriture alimentent le cache.
+    """
+    def __init__(self, backend: UserCacheBackend | None):
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def _id_key(user_id: int) -> str:
+        return f"id:{user_id}"
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"email:{normalize_email(email)}"
+
+    async def _get(self, key: str) -> User | None:
+        row = (await self.backend.get_many([key]))[0]
+        USER_CACHE_EVENTS.inc("miss" if row is None else "hit")
+        return None if row is None else User(**row)
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        return await self._get(self._id_key(user_id))
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await self._get(self._email_key(email))
+
+    async def get_many_by_id(self, user_ids: list[int]) -> dict[int, User]:
+        rows = await self.backend.get_many([self._id_key(user_id) for user_id in user_ids])
+        found = {user_id: User(**row) for user_id, row in zip(user_ids, rows) if row is not None}
+        USER_CACHE_EVENTS.inc("hit", amount=len(found))
+        USER_CACHE_EVENTS.inc("miss", amount=len(user_ids) - len(found))
+        return found
+
+    async def put(self, users: list[User]) -> None:
+        items = {}
+        for user in users:
+            row = {name: getattr(user, name) for name in _USER_COLUMNS}
+            items[self._id_key(user.id)] = row
+            items[self._email_key(user.email)] = row
+        await self.backend.set_many(items)
+        USER_CACHE_EVENTS.inc("set", amount=len(users))
+
+    async def invalidate(self, users: set[tuple[int, str]]) -> None:
+        """Retire les utilisateurs (ID, email) du cache, pour tous les workers."""
+        keys = [key for user_id, email in users for key in (self._id_key(user_id), self._email_key(email))]
+        await self.backend.delete(keys)
+        USER_CACHE_EVENTS.inc("invalidation_sent")
+
+    async def invalidate_on_write(self, session: AsyncSession, user_id: int, email: str) -> None:
+        """
+        Invalidation d'un utilisateur modifié dans `session`: immédiate, puis de nouveau après
+        la validation de la transaction. Une lecture de l'ancienne ligne remise en cache
+        par un autre worker entre les deux ne survit donc pas au COMMIT.
+        """
+        if not self.enabled:
+            return
+        await self.invalidate({(user_id, email)})
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add((user_id, email))
+
+    async def start(self) -> None:
+        if self.backend is not None:
+            await self.backend.start()
+
+    async def stop(self) -> None:
+        if self.backend is not None:
+            await self.backend.stop()
+
+    def stats(self) -> dict:
+        hits, misses = USER_CACHE_EVENTS.value("hit"), USER_CACHE_EVENTS.value("miss")
+        return {
+            "backend": settings.USER_CACHE_BACKEND,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "invalidations_sent": USER_CACHE_EVENTS.value("invalidation_sent"),
+            "invalidations_received": USER_CACHE_EVENTS.value("invalidation_received"),
+        }
+
+
+# Instance partagée par toutes les requêtes du worker (désactivée par défaut)
+user_cache = UserCache(build_user_cache_backend())
+
+_PENDING_INVALIDATIONS = "user_cache_invalidations"
+# Références des tâches d'invalidation en cours (sinon collectables avant la fin)
+_invalidation_tasks: set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if pending:
+        # Événement synchrone exécuté dans la boucle (greenlet de la session asynchrone)
+        task = asyncio.get_running_loop().create_task(user_cache.invalidate(pending))
+        _invalidation_tasks.add(task)
+        task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_invalidations(session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -0,0 +1,35 @@
+"""
+Réponses JSON rapides.
+
+- `FastJSONResponse` est la classe de réponse par défaut de l'application: encodage orjson
+  (paquet optionnel, repli sur json), et sérialisation directe par pydantic-core lorsqu'on
+  lui passe un modèle. Un endpoint qui retourne `FastJSONResponse(modele)` évite la
+  revalidation contre `response_model` (gardé pour la documentation OpenAPI): le modèle a
+  déjà été validé à sa construction.
+- `dumps` sert aussi à pré-encoder les corps des endpoints à forme fixe.
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle: pip install orjson
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode en JSON compact UTF-8 (même sortie que JSONResponse)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encodée avec orjson, ou par pydantic-core pour un modèle déjà validé."""
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return dumps(content)
@@ -0,0 +1,92 @@
+"""
+Point d'entrée de production: `python -m src.server`.
+
+Lance uvicorn avec uvloop et httptools et un worker par CPU disponible (quota cgroup
+du conteneur compris). Le processus superviseur gère les signaux:
+- SIGTERM / SIGINT: arrêt propre (les requêtes en cours ont WEB_GRACEFUL_TIMEOUT_SECONDS);
+- SIGHUP: redémarrage des workers un par un (rechargement du code ou de la configuration);
+- SIGTTIN / SIGTTOU: un worker de plus / de moins.
+"""
+import logging
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+
+from src.config import settings
+from src.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> float | None:
+    """Quota CPU du conteneur (en cœurs), ou None s'il n'y en a pas."""
+    try:
+        # cgroup v2: "<quota> <période>" ou "max <période>"
+        quota, period = (root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota à -1 si non limité
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """CPUs utilisables par le processus: affinité, puis quota cgroup (arrondi au supérieur)."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Non disponible hors Linux
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def main() -> None:
+    setup_logging()
+    cpus = available_cpus()
+    workers = settings.WEB_WORKERS or cpus
+    if settings.PASSWORD_HASH_WORKERS is None:
+        # Les workers se partagent les cœurs: pas plus de threads bcrypt que de CPUs au total
+        os.environ["PASSWORD_HASH_WORKERS"] = str(max(cpus // workers, 1))
+
+    logger.info("Démarrage de %d workers (%d CPUs disponibles) sur %s:%s", workers, cpus, settings.WEB_HOST, settings.API_PORT)
+    segment = None
+    if settings.USER_CACHE_BACKEND == "shm":
+        from src.modules.auth.auth_user_cache import open_shared_segment
+
+        # Segment du cache utilisateurs créé par le superviseur: les workers s'y attachent
+        segment = open_shared_segment(settings.USER_CACHE_SHM_NAME, settings.USER_CACHE_SIZE * settings.USER_CACHE_SHM_SLOT_BYTES)
+    try:
+        uvicorn.run(
+            "src.main:app",
+            host=settings.WEB_HOST,
+            port=settings.API_PORT,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            backlog=settings.WEB_BACKLOG,
+            timeout_keep_alive=settings.WEB_KEEPALIVE_SECONDS,
+            timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT_SECONDS,
+            access_log=settings.WEB_ACCESS_LOG,
+            # Journalisation configurée par src.logging_config (superviseur et workers)
+            log_config=None,
+            proxy_headers=True,
+        )
+    finally:
+        if segment is not None:
+            segment.close()
+            segment.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,12 @@ from sqlalchemy.pool import NullPool
 
 from src.main import app
 from src.config import settings
-from src.data.domain import Base, get_db_session
+from src.data.domain import Base, dispose_engines, get_db_session
+from src.modules.auth.auth_audit import audit_log
+from src.modules.auth.auth_cache import token_cache
+from src.modules.auth.auth_login_tracker import login_tracker
+from src.modules.auth.auth_revocation import revocation_list
+from src.modules.auth.auth_throttle import login_throttle
 
 # Import des modèles pour s'assurer qu'ils sont enregistrés dans Base.metadata
 
@@ -51,6 +56,11 @@ async def async_client(db_session):
         yield db_session
         
     app.dependency_overrides[get_db_session] = override_get_db_session
+    token_cache.clear()
+    revocation_list.clear()
+    audit_log.clear()
+    login_tracker.clear()
+    await login_throttle.backend.reset()
     
     async with AsyncClient(
         transport=ASGITransport(app=app), 
@@ -59,3 +69,5 @@ async def async_client(db_session):
         yield client
         
     app.dependency_overrides.clear()
+    # Les connexions du moteur global sont liées à la boucle du test
+    await dispose_engines()
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, text
+
+from src.data.domain import dispose_engines
+from src.modules.auth.auth_audit import AUDIT_EVENTS, AuditLog, audit_log
+from src.modules.auth.auth_model import LoginEvent
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_login_and_register_events_are_written_in_batch(async_client: AsyncClient, db_session):
+    payload = {"email": "audit@example.com", "password": "Password123"}
+    await async_client.post("/api/v1/auth/register", json=payload)
+    await async_client.post("/api/v1/auth/login", json=payload)
+    await async_client.post("/api/v1/auth/login", json={**payload, "password": "WrongPassword1"})
+    await async_client.post("/api/v1/auth/login", json={**payload, "email": "nobody@example.com"})
+
+    # Rien n'est écrit pendant les requêtes
+    assert audit_log.pending() == 4
+    written = AUDIT_EVENTS.value("written")
+    await audit_log.flush()
+    assert AUDIT_EVENTS.value("written") == written + 4
+
+    events = (await db_session.execute(select(LoginEvent.event, LoginEvent.user_id).order_by(LoginEvent.id))).all()
+    user_id = events[0].user_id
+    assert [tuple(event) for event in events] == [
+        ("register", user_id),
+        ("login_success", user_id),
+        ("login_bad_password", user_id),
+        ("login_unknown_email", None),
+    ]
+    await dispose_engines()
+
+
+async def test_full_queue_drops_events():
+    audit = AuditLog(max_size=2, batch_size=10, flush_interval=1)
+    dropped = AUDIT_EVENTS.value("dropped_queue_full")
+    for _ in range(5):
+        audit.record("login_success", "drop@example.com")
+    assert audit.pending() == 2
+    assert AUDIT_EVENTS.value("dropped_queue_full") == dropped + 3
+
+
+async def test_stop_during_a_write_inserts_the_batch_once(db_session):
+    audit = AuditLog(max_size=100, batch_size=3, flush_interval=60)
+    # Table verrouillée par une autre transaction: l'insertion du premier lot reste bloquée
+    await db_session.execute(text("LOCK TABLE login_events IN EXCLUSIVE MODE"))
+    audit.start()
+    for _ in range(5):
+        audit.record("login_success", "cancel@example.com")
+    await asyncio.sleep(0.2)
+    assert audit.pending() == 2  # Premier lot retiré de la file, en cours d'insertion
+
+    stopping = asyncio.create_task(audit.stop())
+    await asyncio.sleep(0.1)
+    await db_session.commit()
+    await stopping
+
+    assert audit.pending() == 0
+    assert await db_session.scalar(select(func.count()).select_from(LoginEvent)) == 5
+    await dispose_engines()
@@ -1,6 +1,11 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 
+from src.config import settings
+from src.main import app, lifespan
+
 # Marqueur pour indiquer que tous les tests de ce fichier sont asynchrones
 pytestmark = pytest.mark.asyncio
 
@@ -39,3 +44,125 @@ async def test_login_user(async_client: AsyncClient):
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+async def test_password_hash_async_roundtrip():
+    from src.modules.auth.auth_metier import get_password_hash_async, verify_password_async
+
+    hashed = await get_password_hash_async("Password123")
+    assert await verify_password_async("Password123", hashed)
+    assert not await verify_password_async("WrongPassword1", hashed)
+
+async def test_password_policy_argon2_and_bcrypt_migration():
+    pytest.importorskip("argon2")
+    from src.modules.auth.auth_metier import build_password_context
+
+    bcrypt_hash = build_password_context("bcrypt", bcrypt_rounds=4).hash("Password123")
+    argon2_context = build_password_context("argon2", argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1)
+    ok, new_hash = argon2_context.verify_and_update("Password123", bcrypt_hash)
+    assert ok and new_hash.startswith("$argon2id$")
+    assert not argon2_context.needs_update(new_hash)
+    assert argon2_context.verify_and_update("WrongPassword1", bcrypt_hash) == (False, None)
+
+async def test_login_rehashes_outdated_password_hash(async_client: AsyncClient, db_session):
+    from sqlalchemy import select
+
+    from src.config import settings
+    from src.modules.auth.auth_metier import build_password_context, pwd_context
+    from src.modules.auth.auth_model import User
+
+    # Hachage produit avec un autre coût que la politique courante
+    outdated = build_password_context("bcrypt", bcrypt_rounds=4 if settings.PASSWORD_BCRYPT_ROUNDS != 4 else 5).hash("Password123")
+    db_session.add(User(email="rehash@example.com", hashed_password=outdated, first_name="", last_name=""))
+    await db_session.commit()
+
+    response = await async_client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": "Password123"})
+    assert response.status_code == 200
+    db_session.expire_all()
+    stored = await db_session.scalar(select(User.hashed_password).where(User.email == "rehash@example.com"))
+    assert stored != outdated
+    assert pwd_context.verify("Password123", stored) and not pwd_context.needs_update(stored)
+
+async def test_register_duplicate_email(async_client: AsyncClient):
+    payload = {
+        "email": "duplicate@example.com",
+        "password": "Password123"
+    }
+    first = await async_client.post("/api/v1/auth/register", json=payload)
+    assert first.status_code == 201
+
+    second = await async_client.post("/api/v1/auth/register", json=payload)
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Un utilisateur avec cet email existe déjà"
+
+async def test_email_is_case_insensitive(async_client: AsyncClient):
+    payload = {"email": "Mixed.Case@example.com", "password": "Password123"}
+    first = await async_client.post("/api/v1/auth/register", json=payload)
+    assert first.status_code == 201
+    assert first.json()["email"] == payload["email"]
+
+    second = await async_client.post("/api/v1/auth/register", json={**payload, "email": "mixed.case@example.com"})
+    assert second.status_code == 400
+
+    login = await async_client.post("/api/v1/auth/login", json={**payload, "email": "MIXED.CASE@example.com"})
+    assert login.status_code == 200
+
+INTERNAL_TOKEN = "internal-test-token"
+
+
+@pytest.fixture
+def internal_headers(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_ENDPOINTS_TOKEN", INTERNAL_TOKEN)
+    return {"Authorization": f"Bearer {INTERNAL_TOKEN}"}
+
+async def test_internal_endpoints_hidden_without_token_setting(async_client: AsyncClient):
+    assert (await async_client.get("/metrics")).status_code == 404
+    assert (await async_client.get("/internal/db-pool")).status_code == 404
+
+async def test_internal_endpoints_reject_bad_token(async_client: AsyncClient, internal_headers):
+    assert (await async_client.get("/metrics")).status_code == 401
+    response = await async_client.get("/internal/db-pool", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+async def test_db_pool_status(async_client: AsyncClient, internal_headers):
+    response = await async_client.get("/internal/db-pool", headers=internal_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert {"size", "checked_out", "overflow", "timeouts", "wait_seconds_total"} <= data.keys()
+
+async def test_metrics_endpoint(async_client: AsyncClient, internal_headers):
+    payload = {
+        "email": "metrics@example.com",
+        "password": "Password123"
+    }
+    await async_client.post("/api/v1/auth/register", json=payload)
+    await async_client.post("/api/v1/auth/login", json={**payload, "password": "WrongPassword1"})
+
+    response = await async_client.get("/metrics", headers=internal_headers)
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_requests_total{method="POST",route="/api/v1/auth/register",status="201"}' in body
+    assert 'auth_login_attempts_total{outcome="bad_password"}' in body
+    assert 'auth_section_duration_seconds_count{section="password_verify"}' in body
+    assert 'db_pool_connections{state="checked_out"}' in body
+
+async def test_metrics_read_pool_status_once_per_scrape(async_client: AsyncClient, internal_headers, monkeypatch):
+    import src.main
+
+    calls = []
+    real_status = src.main.get_pool_status
+    monkeypatch.setattr(src.main, "get_pool_status", lambda engine: calls.append(engine) or real_status(engine))
+    for _ in range(2):
+        body = (await async_client.get("/metrics", headers=internal_headers)).text
+        assert 'db_pool_events_total{event="checkouts"}' in body
+    assert len(calls) == 2
+
+async def test_ready_after_lifespan_warm_up(async_client: AsyncClient):
+    async with lifespan(app):
+        assert (await async_client.get("/ready")).status_code == 503
+        for _ in range(200):
+            response = await async_client.get("/ready")
+            if response.status_code == 200:
+                break
+            await asyncio.sleep(0.05)
+        assert response.json() == {"status": "ready"}
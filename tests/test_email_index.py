@@ -0,0 +1,44 @@
+import os
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.modules.auth.auth_model import User, normalize_email
+
+pytestmark = pytest.mark.asyncio
+
+# Taille de la table pour les plans d'exécution (réduire localement avec EMAIL_INDEX_TEST_ROWS)
+ROWS = int(os.environ.get("EMAIL_INDEX_TEST_ROWS", 1_000_000))
+
+
+async def explain(db_session, stmt) -> str:
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return "\n".join((await db_session.execute(text(f"EXPLAIN {sql}"))).scalars())
+
+
+async def test_email_lookups_use_the_normalized_index(db_session):
+    await db_session.execute(text(
+        "INSERT INTO users (email, email_normalized, hashed_password, first_name, last_name, is_active) "
+        "SELECT 'User' || g || '@Example.com', 'user' || g || '@example.com', 'x', '', '', true "
+        f"FROM generate_series(1, {ROWS}) AS g"
+    ))
+    await db_session.commit()
+    await db_session.execute(text("ANALYZE users"))
+
+    email = f"USER{ROWS // 2}@example.com"
+
+    # Login: recherche de UserRepository.get_user_by_email
+    plan = await explain(db_session, select(User).where(User.email_normalized == normalize_email(email)))
+    assert "Index Scan using ix_users_email_normalized" in plan, plan
+
+    # Register: l'index unique sert d'arbitre au ON CONFLICT de insert_user_returning
+    plan = await explain(db_session, pg_insert(User).values(
+        email=email, email_normalized=normalize_email(email), hashed_password="x", first_name="", last_name="",
+    ).on_conflict_do_nothing(index_elements=[User.email_normalized]).returning(User.id))
+    assert "Conflict Arbiter Indexes: ix_users_email_normalized" in plan, plan
+
+    # À l'inverse, lower(email) ne peut utiliser aucun index
+    plan = await explain(db_session, select(User).where(func.lower(User.email) == normalize_email(email)))
+    assert "Seq Scan on users" in plan, plan
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from src.config import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_export_users_keyset_pages(async_client: AsyncClient, db_session, monkeypatch):
+    admin = {"email": "admin@example.com", "password": "Password123"}
+    admin_id = (await async_client.post("/api/v1/auth/register", json=admin)).json()["id"]
+    for i in range(4):
+        await async_client.post("/api/v1/auth/register", json={"email": f"user{i}@example.com", "password": "Password123"})
+    await db_session.commit()  # L'export lit avec ses propres sessions
+
+    token = (await async_client.post("/api/v1/auth/login", json=admin)).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    monkeypatch.setattr(settings, "ADMIN_USER_IDS", [admin_id])
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+    response = await async_client.get("/api/v1/auth/admin/users/export", headers=headers)
+    assert response.status_code == 200
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert len(users) == 5
+    assert [user["id"] for user in users] == sorted(user["id"] for user in users)
+    assert "hashed_password" not in users[0]
+
+    response = await async_client.get("/api/v1/auth/admin/users/export?format=csv&is_active=false", headers=headers)
+    assert response.text.splitlines() == ["id,email,first_name,last_name,is_active"]
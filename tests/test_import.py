@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from src.config import settings
+from src.data.domain import dispose_engines, get_async_engine
+from src.data.pool_metrics import get_pool_status
+from src.modules.auth import auth_import
+from src.modules.auth.auth_import import import_users, iter_lines_from_chunks, parse_records
+
+pytestmark = pytest.mark.asyncio
+
+CSV_BODY = (
+    "email,password,first_name,last_name\n"
+    "alice@example.com,Password123,Alice,Martin\n"
+    "bob@example.com,weak,Bob,Durand\n"
+    "alice@example.com,Password123,Alice,Bis\n"
+    "carol@example.com,Password123,,\n"
+)
+
+
+async def _admin_headers(async_client: AsyncClient, monkeypatch) -> dict:
+    payload = {"email": "admin@example.com", "password": "Password123"}
+    admin_id = (await async_client.post("/api/v1/auth/register", json=payload)).json()["id"]
+    token = (await async_client.post("/api/v1/auth/login", json=payload)).json()["access_token"]
+    monkeypatch.setattr(settings, "ADMIN_USER_IDS", [admin_id])
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def test_import_users_csv(async_client: AsyncClient, monkeypatch):
+    headers = await _admin_headers(async_client, monkeypatch)
+
+    response = await async_client.post("/api/v1/auth/admin/users/import?format=csv", content=CSV_BODY, headers=headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total"] == 4
+    assert report["imported"] == 2
+    assert {reject["line"] for reject in report["rejects"]} == {3, 4}
+
+    # Un second import ne crée aucun doublon en base
+    response = await async_client.post("/api/v1/auth/admin/users/import?format=csv", content=CSV_BODY, headers=headers)
+    assert response.json()["imported"] == 0
+
+    login = await async_client.post("/api/v1/auth/login", json={"email": "alice@example.com", "password": "Password123"})
+    assert login.status_code == 200
+
+
+async def test_import_requires_admin(async_client: AsyncClient):
+    payload = {"email": "user@example.com", "password": "Password123"}
+    await async_client.post("/api/v1/auth/register", json=payload)
+    token = (await async_client.post("/api/v1/auth/login", json=payload)).json()["access_token"]
+
+    response = await async_client.post(
+        "/api/v1/auth/admin/users/import",
+        content=CSV_BODY,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def test_csv_quoted_fields_may_span_lines(db_session):
+    body = (
+        'email,password,first_name,last_name\r\n'
+        '"dana@example.com",Password123,"Dana\r\nMarie","Le Gall, ""dite"" D"\r\n'
+        '\r\n'
+        'erin@example.com,Password123,Erin,"Martin\n'
+        'Durand"\n'
+        'frank@example.com,Password123,"non fermé,\n'
+    ).encode()
+    records = [record async for record in parse_records(iter_lines_from_chunks(_chunks(body, 7)), "csv")]
+    assert records == [
+        (2, {"email": "dana@example.com", "password": "Password123", "first_name": "Dana\r\nMarie", "last_name": 'Le Gall, "dite" D'}),
+        (5, {"email": "erin@example.com", "password": "Password123", "first_name": "Erin", "last_name": "Martin\nDurand"}),
+        (7, None),
+    ]
+
+
+async def test_import_bounds_hashing_and_holds_no_connection_while_hashing(db_session, monkeypatch):
+    in_flight = peak = 0
+    checked_out = []
+
+    async def slow_hash(password: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        checked_out.append(get_pool_status(get_async_engine())["checked_out"])
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "hashed-" + password
+
+    monkeypatch.setattr(auth_import, "get_password_hash_async", slow_hash)
+    body = "email,password\n" + "".join(f"user{i}@example.com,Password123\n" for i in range(12))
+    records = parse_records(iter_lines_from_chunks(_chunks(body.encode(), 64)), "csv")
+    report = await import_users(records, chunk_size=5, hash_concurrency=2)
+
+    assert (report.total, report.imported) == (12, 12)
+    assert peak == 2
+    # Aucune connexion gardée pendant le hachage: chaque bloc est écrit et validé séparément
+    assert set(checked_out) == {0}
+    assert get_pool_status(get_async_engine())["checked_out"] == 0
+    await dispose_engines()
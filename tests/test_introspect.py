@@ -0,0 +1,41 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from src.metrics import SECTION_DURATION
+from src.modules.auth.auth_model import User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _login(client: AsyncClient, email: str) -> str:
+    payload = {"email": email, "password": "Password123"}
+    await client.post("/api/v1/auth/register", json=payload)
+    response = await client.post("/api/v1/auth/login", json=payload)
+    return response.json()["access_token"]
+
+
+async def test_introspect_batch_resolves_users_in_one_query(async_client: AsyncClient, db_session):
+    active_token = await _login(async_client, "gateway-active@example.com")
+    inactive_token = await _login(async_client, "gateway-inactive@example.com")
+    # Désactivation hors API: seule la base connaît le statut (pas de révocation en mémoire)
+    await db_session.execute(update(User).where(User.email == "gateway-inactive@example.com").values(is_active=False))
+    await db_session.commit()
+
+    queries = SECTION_DURATION.count("db_get_active_flags")
+    response = await async_client.post(
+        "/api/v1/auth/introspect",
+        json={"tokens": [active_token, "not-a-jwt", inactive_token, active_token]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert SECTION_DURATION.count("db_get_active_flags") == queries + 1
+
+    assert [result["active"] for result in results] == [True, False, False, True]
+    assert results[1]["user_id"] is None
+    assert results[0]["user_id"] == results[3]["user_id"] != results[2]["user_id"]
+
+
+async def test_introspect_rejects_empty_batch(async_client: AsyncClient):
+    response = await async_client.post("/api/v1/auth/introspect", json={"tokens": []})
+    assert response.status_code == 422
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from httpx import AsyncClient
+from jose import JWTError, jwt
+
+from src.config import settings
+from src.modules.auth import auth_metier
+from src.modules.auth.auth_keys import load_key_ring
+
+
+def _write_rsa_key(directory, kid: str, public_only: bool = False) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if public_only:
+        (directory / f"{kid}.pub.pem").write_bytes(private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+    else:
+        (directory / f"{kid}.pem").write_bytes(private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ))
+
+
+@pytest.fixture
+def rsa_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ALGORITHM", "RS256")
+    monkeypatch.setattr(settings, "JWT_KEYS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_rs256_tokens_carry_kid_and_survive_rotation(rsa_settings, monkeypatch):
+    _write_rsa_key(rsa_settings, "k1")
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "k1")
+    monkeypatch.setattr(auth_metier, "key_ring", load_key_ring())
+    old_token = auth_metier.create_access_token({"sub": "1"})
+    assert jwt.get_unverified_header(old_token) == {"alg": "RS256", "kid": "k1", "typ": "JWT"}
+
+    # Rotation: k2 devient active, k1 n'est plus conservée qu'en clé publique
+    private_k1 = rsa_settings / "k1.pem"
+    public_pem = serialization.load_pem_private_key(private_k1.read_bytes(), None).public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    private_k1.unlink()
+    (rsa_settings / "k1.pub.pem").write_bytes(public_pem)
+    _write_rsa_key(rsa_settings, "k2")
+    monkeypatch.setattr(settings, "JWT_ACTIVE_KID", "k2")
+    ring = load_key_ring()
+    monkeypatch.setattr(auth_metier, "key_ring", ring)
+
+    assert auth_metier.decode_access_token(old_token)["sub"] == "1"
+    new_token = auth_metier.create_access_token({"sub": "2"})
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+    assert auth_metier.decode_access_token(new_token)["sub"] == "2"
+
+    jwks = json.loads(ring.jwks_json)
+    assert sorted(key["kid"] for key in jwks["keys"]) == ["k1", "k2"]
+    assert all("d" not in key for key in jwks["keys"])  # Aucune partie privée publiée
+
+
+def test_legacy_hs256_and_unknown_kid(rsa_settings, monkeypatch):
+    _write_rsa_key(rsa_settings, "k1")
+    monkeypatch.setattr(auth_metier, "key_ring", load_key_ring())
+
+    legacy_token = jwt.encode({"sub": "3"}, settings.SECRET_KEY, algorithm="HS256")
+    assert auth_metier.decode_access_token(legacy_token)["sub"] == "3"
+
+    forged = jwt.encode({"sub": "4"}, settings.SECRET_KEY, algorithm="HS256", headers={"kid": "k1"})
+    with pytest.raises(JWTError):
+        auth_metier.decode_access_token(forged)  # kid RS256 avec une signature HMAC
+
+    unknown = jwt.encode({"sub": "5"}, settings.SECRET_KEY, algorithm="HS256", headers={"kid": "nope"})
+    with pytest.raises(JWTError):
+        auth_metier.decode_access_token(unknown)
+
+
+@pytest.mark.asyncio
+async def test_jwks_endpoint(async_client: AsyncClient):
+    response = await async_client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert "keys" in response.json()
+    assert "max-age" in response.headers["Cache-Control"]
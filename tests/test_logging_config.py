@@ -0,0 +1,45 @@
+import json
+import logging
+import queue
+import subprocess
+import sys
+
+from src.logging_config import LOG_RECORDS_DROPPED, JsonFormatter, NonBlockingQueueHandler, SamplingFilter
+
+
+def _record(msg: str, *args, level: int = logging.WARNING) -> logging.LogRecord:
+    return logging.LogRecord("src.modules.auth.auth_app", level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_keeps_burst_then_one_in_n():
+    sampling = SamplingFilter(burst=2, every=3, window=60)
+    kept = [sampling.filter(record) and record for record in (_record("Mot de passe incorrect pour: %s", f"u{i}@example.com") for i in range(8))]
+    assert [bool(record) for record in kept] == [True, True, False, False, True, False, False, True]
+    assert kept[4].suppressed == 2
+    # Autre gabarit et erreurs: jamais échantillonnés
+    assert sampling.filter(_record("Compte inactif: %s", "a@example.com"))
+    assert all(sampling.filter(_record("Erreur %s", i, level=logging.ERROR)) for i in range(10))
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    dropped = LOG_RECORDS_DROPPED.value("queue_full")
+    handler.handle(_record("Connexion réussie pour: %s", "a@example.com"))
+    handler.handle(_record("Connexion réussie pour: %s", "b@example.com"))
+    assert LOG_RECORDS_DROPPED.value("queue_full") == dropped + 1
+
+    record = handler.queue.get_nowait()
+    assert record.args == ("a@example.com",)  # Message non construit dans le thread appelant
+    record.client_ip = "10.0.0.1"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Connexion réussie pour: a@example.com"
+    assert entry["level"] == "WARNING" and entry["client_ip"] == "10.0.0.1"
+
+
+def test_importing_the_app_starts_no_logging_thread():
+    # Le thread d'écriture est démarré par le lifespan ou src.server, pas par l'import de src.main
+    code = (
+        "import threading, src.main, src.logging_config as lc; "
+        "assert lc._listener is None and threading.active_count() == 1, threading.enumerate()"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+
+from src.data.domain import dispose_engines
+from src.modules.auth.auth_login_tracker import LoginTracker, login_tracker
+from src.modules.auth.auth_model import User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_logins_are_coalesced_into_one_update_per_user(async_client: AsyncClient, db_session):
+    payload = {"email": "tracker@example.com", "password": "Password123"}
+    await async_client.post("/api/v1/auth/register", json=payload)
+    for _ in range(3):
+        response = await async_client.post("/api/v1/auth/login", json=payload)
+        assert response.status_code == 200
+    await async_client.post("/api/v1/auth/login", json={**payload, "password": "WrongPassword1"})
+
+    # Rien n'est écrit pendant les requêtes
+    assert login_tracker.pending() == 1
+    user = (await db_session.execute(select(User).where(User.email == payload["email"]))).scalar_one()
+    assert (user.last_login_at, user.login_count) == (None, 0)
+
+    assert await login_tracker.flush() == 1
+    assert login_tracker.pending() == 0
+    await db_session.refresh(user)
+    assert user.login_count == 3
+    assert user.last_login_at is not None
+    await dispose_engines()
+
+
+async def test_flush_keeps_latest_login_and_adds_counts(db_session):
+    db_session.add_all([User(email="a@example.com", hashed_password="x"), User(email="b@example.com", hashed_password="x")])
+    await db_session.commit()
+    a, b = (await db_session.execute(select(User).order_by(User.id))).scalars().all()
+
+    tracker = LoginTracker(interval=60, batch_size=1)
+    now = datetime.now(timezone.utc)
+    tracker.record(a.id, now)
+    tracker.record(a.id, now - timedelta(minutes=5))
+    tracker.record(b.id, now - timedelta(minutes=1))
+    tracker.record(999_999, now)  # compte supprimé entre-temps: ignoré
+    assert await tracker.flush() == 2
+
+    # Une connexion plus ancienne que la valeur en base ne la fait pas reculer
+    tracker.record(a.id, now - timedelta(hours=1))
+    await tracker.stop()
+
+    for user in (a, b):
+        await db_session.refresh(user)
+    assert (a.last_login_at, a.login_count) == (now, 3)
+    assert (b.last_login_at, b.login_count) == (now - timedelta(minutes=1), 1)
+    await dispose_engines()
+
+
+async def test_disabled_tracker_records_nothing():
+    tracker = LoginTracker(interval=0, batch_size=100)
+    tracker.record(1)
+    assert tracker.pending() == 0
+
+
+async def test_stop_during_a_write_neither_loses_nor_repeats_counts(db_session):
+    user = User(email="cancel@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+
+    tracker = LoginTracker(interval=60, batch_size=100)
+    tracker.record(user.id)
+    # Ligne verrouillée par une autre transaction: l'écriture périodique reste bloquée sur l'UPDATE
+    await db_session.execute(text("SELECT id FROM users WHERE id = :id FOR UPDATE"), {"id": user.id})
+    periodic = asyncio.create_task(tracker.flush())
+    await asyncio.sleep(0.2)
+    assert tracker.pending() == 0
+    periodic.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await periodic
+
+    tracker.record(user.id)
+    stopping = asyncio.create_task(tracker.stop())
+    await asyncio.sleep(0.1)
+    await db_session.commit()  # Libère la ligne: l'écriture interrompue se termine, puis la suivante
+    await stopping
+
+    await db_session.refresh(user)
+    assert user.login_count == 2
+    await dispose_engines()
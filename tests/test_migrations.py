@@ -0,0 +1,187 @@
+import asyncio
+from pathlib import Path
+import time
+
+import asyncpg
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.config import settings
+from src.modules.auth.auth_app import AuthAppService
+from src.modules.auth.auth_audit import audit_log
+from src.modules.auth.auth_dto import UserLogin
+from src.modules.auth.auth_login_tracker import login_tracker
+from src.modules.auth.auth_metier import get_password_hash, verify_password
+from src.modules.auth.auth_throttle import login_throttle
+
+DATABASE = "auth_migrations_test"
+# Révision précédant l'ajout de users.email_normalized (expansion puis contraction)
+BEFORE_EMAIL_NORMALIZED = "7d2e4b91a3c6"
+# Dernière révision appliquée en mode online sans MIGRATION_CONTRACT, et révision de contraction
+BEFORE_CONTRACT = "e61a9c3f0b52"
+CONTRACT = "a93d5e7c2f14"
+
+
+def dsn(database: str | None = None) -> str:
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    if database:
+        url = url.set(database=database)
+    return url.render_as_string(hide_password=False)
+
+
+async def execute(database: str | None, *statements: str):
+    conn = await asyncpg.connect(dsn(database))
+    try:
+        return [await conn.fetch(statement) for statement in statements]
+    finally:
+        await conn.close()
+
+
+@pytest.fixture
+def alembic_config(monkeypatch):
+    """Base vide dédiée, migrée en mode online (sans fichier ini: la configuration des logs du test est conservée)."""
+    asyncio.run(execute(None, f"DROP DATABASE IF EXISTS {DATABASE}", f"CREATE DATABASE {DATABASE}"))
+    url = make_url(settings.DATABASE_URL).set(database=DATABASE).render_as_string(hide_password=False)
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    monkeypatch.setattr(settings, "MIGRATION_MODE", "online")
+    monkeypatch.setattr(settings, "MIGRATION_BACKFILL_BATCH_SIZE", 100)
+    monkeypatch.setattr(settings, "MIGRATION_BACKFILL_PAUSE_SECONDS", 0)
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).parents[1] / "alembic"))
+    yield config
+    monkeypatch.undo()
+    asyncio.run(execute(None, f"DROP DATABASE {DATABASE} WITH (FORCE)"))
+
+
+def users_indexes() -> dict[str, bool]:
+    [rows] = asyncio.run(execute(DATABASE, (
+        "SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = 'users'::regclass"
+    )))
+    return {row["relname"]: row["indisvalid"] for row in rows}
+
+
+def current_revision() -> str:
+    [[row]] = asyncio.run(execute(DATABASE, "SELECT version_num FROM alembic_version"))
+    return row["version_num"]
+
+
+def email_normalized_counts() -> tuple[int, int]:
+    [[counts]] = asyncio.run(execute(DATABASE, (
+        "SELECT count(*) AS total, count(*) FILTER (WHERE email_normalized = lower(email)) AS normalized FROM users"
+    )))
+    return counts["total"], counts["normalized"]
+
+
+def test_online_migrations_expand_then_contract(alembic_config, monkeypatch):
+    command.upgrade(alembic_config, BEFORE_EMAIL_NORMALIZED)
+    assert set(users_indexes()) == {"users_pkey", "ix_users_email", "ix_users_id"}
+    asyncio.run(execute(DATABASE, (
+        "INSERT INTO users (email, hashed_password, first_name, last_name) "
+        "SELECT 'User' || g || '@Example.com', 'x', '', '' FROM generate_series(1, 250) AS g"
+    )))
+
+    # Expansion seule: l'ancienne version de l'application garde son index et ses insertions
+    command.upgrade(alembic_config, "head")
+    assert current_revision() == BEFORE_CONTRACT
+    assert users_indexes() == {"users_pkey": True, "ix_users_email": True, "ix_users_email_normalized": True}
+    assert email_normalized_counts() == (250, 250)
+    asyncio.run(execute(DATABASE, (
+        "INSERT INTO users (email, hashed_password, first_name, last_name) VALUES ('Old@Example.com', 'x', '', '')"
+    )))
+    assert email_normalized_counts() == (251, 251)
+
+    # Contraction, une fois toutes les instances à jour
+    monkeypatch.setattr(settings, "MIGRATION_CONTRACT", True)
+    command.upgrade(alembic_config, "head")
+    assert current_revision() == CONTRACT
+    assert users_indexes() == {"users_pkey": True, "ix_users_email_normalized": True}
+    with pytest.raises(asyncpg.NotNullViolationError):
+        asyncio.run(execute(DATABASE, (
+            "INSERT INTO users (email, hashed_password, first_name, last_name) VALUES ('new@example.com', 'x', '', '')"
+        )))
+
+    command.downgrade(alembic_config, BEFORE_EMAIL_NORMALIZED)
+    assert users_indexes() == {"users_pkey": True, "ix_users_email": True, "ix_users_id": True}
+
+
+def legacy_login(email: str, password: str) -> tuple[bool, str]:
+    """Recherche de l'ancienne version (`User.email == ...`): résultat et index utilisé."""
+    query = f"SELECT hashed_password FROM users WHERE email = '{email}'"
+    [[user], _, plan] = asyncio.run(execute(
+        DATABASE,
+        query,
+        "SET enable_seqscan = off",  # Petite table: sans cela, le plan serait un parcours séquentiel quel que soit l'index
+        f"EXPLAIN {query}",
+    ))
+    return verify_password(password, user["hashed_password"]), plan[0]["QUERY PLAN"]
+
+
+def current_login(email: str, password: str) -> None:
+    """Connexion par le service de la version actuelle (recherche sur email_normalized)."""
+    async def login() -> None:
+        engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                token = await AuthAppService(session).authenticate_user(UserLogin(email=email, password=password))
+                assert token.access_token
+                await session.commit()
+        finally:
+            await engine.dispose()
+            await login_throttle.backend.reset()
+    asyncio.run(login())
+    audit_log.clear()
+    login_tracker.clear()
+
+
+def test_user_registered_before_the_migration_logs_in_during_and_after_it(alembic_config, monkeypatch):
+    command.upgrade(alembic_config, BEFORE_EMAIL_NORMALIZED)
+    # Inscription par l'ancienne version: email tel que saisi, sans email_normalized
+    asyncio.run(execute(DATABASE, (
+        "INSERT INTO users (email, hashed_password, first_name, last_name, is_active) "
+        f"VALUES ('Legacy@example.com', '{get_password_hash('Password123')}', '', '', true)"
+    )))
+
+    # Pendant: expansion appliquée, ancienne et nouvelle versions servent ensemble
+    command.upgrade(alembic_config, "head")
+    assert current_revision() == BEFORE_CONTRACT
+    password_ok, plan = legacy_login("Legacy@example.com", "Password123")
+    assert password_ok and "ix_users_email " in plan
+    current_login("legacy@EXAMPLE.com", "Password123")
+
+    # Après: contraction appliquée, seule la nouvelle version sert (l'ancienne recherche reste exacte)
+    monkeypatch.setattr(settings, "MIGRATION_CONTRACT", True)
+    command.upgrade(alembic_config, "head")
+    assert current_revision() == CONTRACT
+    assert legacy_login("Legacy@example.com", "Password123")[0]
+    current_login("LEGACY@example.com", "Password123")
+
+
+def test_online_migration_gives_up_on_lock_instead_of_queueing(alembic_config, monkeypatch):
+    command.upgrade(alembic_config, BEFORE_EMAIL_NORMALIZED)
+    monkeypatch.setattr(settings, "MIGRATION_LOCK_TIMEOUT_MS", 200)
+
+    # Une transaction de l'API en cours sur users: ALTER TABLE ne peut pas obtenir son verrou
+    loop = asyncio.new_event_loop()
+    holder = loop.run_until_complete(asyncpg.connect(dsn(DATABASE)))
+    transaction = holder.transaction()
+    loop.run_until_complete(transaction.start())
+    loop.run_until_complete(holder.fetch("SELECT * FROM users"))
+    try:
+        start = time.perf_counter()
+        with pytest.raises(DBAPIError, match="lock timeout"):
+            command.upgrade(alembic_config, "head")
+        assert time.perf_counter() - start < 5
+    finally:
+        loop.run_until_complete(transaction.rollback())
+        loop.run_until_complete(holder.close())
+        loop.close()
+
+    # Relance (scripts/entrypoint.sh) une fois le verrou libéré
+    command.upgrade(alembic_config, "head")
+    assert "ix_users_email_normalized" in users_indexes()
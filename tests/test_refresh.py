@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from src.modules.auth.auth_app import AuthAppService
+from src.modules.auth.auth_model import TokenRevocation
+from src.modules.auth.auth_revocation import RevocationList, revocation_list
+
+pytestmark = pytest.mark.asyncio
+
+CREDENTIALS = {"email": "refresh@example.com", "password": "Password123"}
+
+
+async def _login(async_client: AsyncClient) -> dict:
+    await async_client.post("/api/v1/auth/register", json=CREDENTIALS)
+    response = await async_client.post("/api/v1/auth/login", json=CREDENTIALS)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_refresh_rotates_tokens(async_client: AsyncClient):
+    tokens = await _login(async_client)
+    assert tokens["refresh_token"]
+    assert tokens["expires_in"] > 0
+
+    response = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 200
+
+
+async def test_refresh_token_reuse_revokes_session(async_client: AsyncClient):
+    tokens = await _login(async_client)
+    rotated = (await async_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).json()
+
+    # Rejeu de l'ancien refresh token: toute la session est révoquée
+    response = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    response = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401
+
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 401
+
+
+async def test_logout_revokes_access_token_without_db_lookup(async_client: AsyncClient):
+    tokens = await _login(async_client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 200
+
+    response = await async_client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 204
+    assert revocation_list.stats()["families"] == 1
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 401
+
+
+async def test_revocation_list_refreshes_from_database(async_client: AsyncClient, db_session):
+    tokens = await _login(async_client)
+    await async_client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    await db_session.commit()
+
+    # Un autre worker ne connaît la révocation que par la table token_revocations
+    revocation_list.clear()
+    assert await revocation_list.refresh() == 1
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 401
+
+
+async def test_user_revocation_covers_tokens_issued_at_the_same_time():
+    revocations = RevocationList()
+    revoked_at = datetime.fromtimestamp(1_000_000.5, timezone.utc)
+    revocations.add(TokenRevocation(user_id=1, revoked_at=revoked_at, expires_at=revoked_at + timedelta(hours=1)))
+    # iat en secondes entières (tokens sans iat_ms): la seconde de la révocation reste révoquée
+    assert revocations.is_revoked(1, None, 1_000_000)
+    assert revocations.is_revoked(1, None, 1_000_000.5)
+    assert not revocations.is_revoked(1, None, 1_000_000.501)
+
+
+async def test_reactivated_user_can_log_in_again_at_once(async_client: AsyncClient, db_session):
+    tokens = await _login(async_client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    user_id = (await async_client.get("/api/v1/auth/users/me", headers=headers)).json()["user_id"]
+    service = AuthAppService(db_session)
+    await service.set_user_active(user_id, False)
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 401
+
+    # Réactivation et nouvelle connexion, le plus souvent dans la seconde de la révocation
+    await service.set_user_active(user_id, True)
+    await db_session.commit()
+    fresh = (await async_client.post("/api/v1/auth/login", json=CREDENTIALS)).json()
+    headers = {"Authorization": f"Bearer {fresh['access_token']}"}
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 200
+    # Les tokens émis avant la désactivation restent révoqués
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 401
+
+
+async def test_deactivation_is_revoked_in_memory_only_once_committed(async_client: AsyncClient, db_session, monkeypatch):
+    await _login(async_client)
+    service = AuthAppService(db_session)
+    user = await service.repository.get_user_by_email(CREDENTIALS["email"])
+
+    async def failing_commit():
+        raise RuntimeError("commit impossible")
+
+    monkeypatch.setattr(db_session, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        await service.set_user_active(user.id, False)
+    # Libère les verrous de la transaction abandonnée (sinon drop_all attend)
+    await db_session.rollback()
+    assert revocation_list.stats()["users"] == 0
+
+
+async def test_revocation_refresh_rereads_an_overlap_window(db_session):
+    revocations = RevocationList(overlap=60)
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(hours=1)
+    db_session.add(TokenRevocation(family_id="recent", revoked_at=now, expires_at=expires_at))
+    await db_session.commit()
+    assert await revocations.refresh() == 1
+
+    # Transactions validées après la précédente lecture, avec un revoked_at antérieur
+    db_session.add_all([
+        TokenRevocation(family_id="late", revoked_at=now - timedelta(seconds=30), expires_at=expires_at),
+        TokenRevocation(family_id="too-late", revoked_at=now - timedelta(seconds=90), expires_at=expires_at),
+    ])
+    await db_session.commit()
+    await revocations.refresh()
+    assert revocations.is_revoked(1, "late", 0)
+    assert not revocations.is_revoked(1, "too-late", 0)
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.config import settings
+from src.data import domain
+from src.data.domain import AsyncSessionLocal, Base, dispose_engines
+from src.data.replicas import ReplicaSet
+from src.modules.auth.auth_model import User
+from src.modules.auth.auth_repo import UserRepository
+
+REPLICA_DB = "auth_replica_test"
+
+
+def _engine(**url_parts):
+    return create_async_engine(make_url(settings.DATABASE_URL).set(**url_parts))
+
+
+@pytest.fixture
+async def replica_engine():
+    """Seconde base, vide au départ, qui joue le rôle d'un réplica en retard."""
+    admin = _engine().execution_options(isolation_level="AUTOCOMMIT")
+    async with admin.connect() as conn:
+        await conn.execute(text(f"DROP DATABASE IF EXISTS {REPLICA_DB}"))
+        await conn.execute(text(f"CREATE DATABASE {REPLICA_DB}"))
+    engine = _engine(database=REPLICA_DB)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+    async with admin.connect() as conn:
+        await conn.execute(text(f"DROP DATABASE IF EXISTS {REPLICA_DB}"))
+    await admin.dispose()
+
+
+def test_replica_set_strategies_and_health():
+    engines = [_engine(database=f"replica{i}") for i in range(2)]
+    replica_set = ReplicaSet(engines, retry_seconds=60)
+    first, second = replica_set.replicas
+    assert [replica_set.choose() for _ in range(3)] == [first, second, first]
+
+    replica_set.mark_failed(second, OSError())
+    assert [replica_set.choose() for _ in range(2)] == [first, first]
+    replica_set.mark_failed(first, OSError())
+    assert replica_set.choose() is None
+
+    least = ReplicaSet(engines, strategy="least_connections")
+    assert least.choose() is least.replicas[0]
+
+
+@pytest.mark.asyncio
+async def test_user_lookups_use_replica_with_primary_fallback(db_session, replica_engine, monkeypatch):
+    db_session.add(User(email="primary@example.com", hashed_password="x"))
+    await db_session.commit()
+    async with AsyncSession(replica_engine) as replica_session:
+        replica_session.add(User(email="replica-only@example.com", hashed_password="x"))
+        await replica_session.commit()
+
+    dead = _engine(host="127.0.0.1", port=1, query={})
+    replica_set = ReplicaSet([dead, replica_engine], retry_seconds=60)
+    monkeypatch.setattr(domain, "_replicas", replica_set)
+
+    async with AsyncSessionLocal() as session:
+        repository = UserRepository(session)
+        # Réplica injoignable écarté, lecture servie par le second
+        assert (await repository.get_user_by_email("replica-only@example.com")) is not None
+        assert not replica_set.replicas[0].healthy
+        # Ligne absente du réplica (retard de réplication): relue sur le primaire
+        assert (await repository.get_user_by_email("primary@example.com")) is not None
+
+        # Après une écriture, tout reste sur le primaire
+        session.add(User(email="written@example.com", hashed_password="x"))
+        await session.flush()
+        assert (await repository.get_user_by_email("replica-only@example.com")) is None
+        await session.rollback()
+
+    await dead.dispose()
+    await dispose_engines()
@@ -0,0 +1,15 @@
+import json
+
+from fastapi.responses import JSONResponse
+
+from src.modules.auth.auth_dto import Token, UserInDB
+from src.responses import FastJSONResponse
+
+
+def test_fast_json_response_matches_standard_encoding():
+    user = UserInDB(id=1, email="fast@example.com", first_name="Élise", last_name="", is_active=True)
+    token = Token(access_token="abc", expires_in=900)
+    assert FastJSONResponse(user).body == JSONResponse(user.model_dump(mode="json")).body
+    assert FastJSONResponse(token).body == JSONResponse(token.model_dump(mode="json")).body
+    payload = {"message": "Accès autorisé", "values": [1, 2.5, None]}
+    assert json.loads(FastJSONResponse(payload).body) == payload
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import select
+
+from src.data.domain import AsyncSessionLocal, dispose_engines, get_async_engine, get_read_engine, release_session
+from src.data.pool_metrics import get_pool_status
+from src.modules.auth.auth_model import User
+from src.modules.auth.auth_repo import UserRepository
+
+
+@pytest.mark.asyncio
+async def test_session_routes_reads_to_autocommit_until_first_write(db_session):
+    async_engine, read_engine = get_async_engine(), get_read_engine()
+    async with AsyncSessionLocal() as session:
+        sync_session = session.sync_session
+        checkouts = async_engine.pool.stats.checkouts
+        assert sync_session.get_bind(clause=select(User)) is read_engine.sync_engine
+        assert async_engine.pool.stats.checkouts == checkouts  # Aucune connexion avant la première requête
+
+        assert await session.scalar(select(User).where(User.email == "routing@example.com")) is None
+        assert sync_session.get_bind(clause=select(User).with_for_update()) is async_engine.sync_engine
+
+        session.add(User(email="routing@example.com", hashed_password="x"))
+        await session.flush()
+        # Après une écriture, les lectures voient les données non encore validées
+        assert sync_session.get_bind(clause=select(User)) is async_engine.sync_engine
+        assert await session.scalar(select(User.id).where(User.email == "routing@example.com")) is not None
+
+        await release_session(session)
+        assert sync_session.get_bind(clause=select(User)) is read_engine.sync_engine
+        assert await session.scalar(select(User.id).where(User.email == "routing@example.com")) is not None
+    await dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_read_then_write_holds_a_single_connection(db_session):
+    async_engine = get_async_engine()
+    async with AsyncSessionLocal() as session:
+        session.add(User(email="rmw@example.com", hashed_password="x"))
+        with session.no_autoflush:
+            # Écriture en attente (non encore envoyée): la lecture passe déjà par la transaction
+            assert session.sync_session.get_bind(clause=select(User)) is async_engine.sync_engine
+        await release_session(session)
+        user_id = await session.scalar(select(User.id).where(User.email == "rmw@example.com"))
+        await release_session(session)
+
+        # Lecture-modification-écriture: une seule connexion de la lecture au commit
+        user = await UserRepository(session).set_user_active(user_id, False)
+        assert user is not None and not user.is_active
+        assert get_pool_status(async_engine)["checked_out"] == 1
+        await release_session(session)
+        assert get_pool_status(async_engine)["checked_out"] == 0
+    await dispose_engines()
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from src.config import settings
+from src.modules.auth.auth_throttle import LOGIN_SHED, login_throttle
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_login_rate_limited_per_email(async_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_EMAIL", 2)
+    payload = {"email": "throttle@example.com", "password": "WrongPassword1"}
+
+    for _ in range(2):
+        response = await async_client.post("/api/v1/auth/login", json=payload)
+        assert response.status_code == 401
+
+    shed_before = LOGIN_SHED.value("rate_limit_email")
+    response = await async_client.post("/api/v1/auth/login", json=payload)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert LOGIN_SHED.value("rate_limit_email") == shed_before + 1
+
+
+async def test_login_shed_when_password_checks_saturated(async_client: AsyncClient, monkeypatch):
+    payload = {"email": "overload@example.com", "password": "Password123"}
+    await async_client.post("/api/v1/auth/register", json=payload)
+
+    monkeypatch.setattr(login_throttle.gate, "limit", 1)
+    monkeypatch.setattr(login_throttle.gate, "in_flight", 1)
+    response = await async_client.post("/api/v1/auth/login", json=payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.PASSWORD_CHECK_RETRY_AFTER_SECONDS)
+
+
+async def test_blocked_ip_does_not_consume_the_email_budget(async_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", 2)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_EMAIL", 3)
+
+    await login_throttle.check_attempt("victim@example.com", "203.0.113.7")
+    await login_throttle.check_attempt("victim@example.com", "203.0.113.7")
+    for _ in range(5):
+        with pytest.raises(HTTPException) as blocked:
+            await login_throttle.check_attempt("victim@example.com", "203.0.113.7")
+        assert blocked.value.status_code == 429
+
+    # Les tentatives refusées par IP n'ont pas été comptées pour l'email
+    await login_throttle.check_attempt("victim@example.com", "198.51.100.1")
+    with pytest.raises(HTTPException):
+        await login_throttle.check_attempt("victim@example.com", "198.51.100.2")
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from src.modules.auth.auth_app import AuthAppService
+from src.modules.auth.auth_cache import CachedToken, TokenCache, token_cache
+
+
+def _claims(user_id: int) -> CachedToken:
+    return CachedToken(user_id=user_id, session_id=None, issued_at=time.time())
+
+
+def test_token_cache_lru_and_expiry():
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    now = time.time()
+    cache.put("a", _claims(1), now + 3600)
+    cache.put("b", _claims(2), now + 3600)
+    assert cache.get("a").user_id == 1
+    cache.put("c", _claims(3), now + 3600)  # "b" est le moins récemment utilisé
+    assert cache.get("b") is None
+    assert cache.get("c").user_id == 3
+
+    cache.put("expired", _claims(4), now - 1)  # exp déjà dépassé
+    assert cache.get("expired") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_token_cache_invalidate_user():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.put("t1", _claims(1), time.time() + 3600)
+    cache.put("t2", _claims(1), time.time() + 3600)
+    cache.invalidate_user(1)
+    assert cache.get("t1") is None
+    assert cache.get("t2") is None
+
+
+@pytest.mark.asyncio
+async def test_cached_token_skips_lookup_and_deactivation_invalidates(async_client: AsyncClient, db_session):
+    payload = {"email": "cache_test@example.com", "password": "Password123"}
+    user_id = (await async_client.post("/api/v1/auth/register", json=payload)).json()["id"]
+    token = (await async_client.post("/api/v1/auth/login", json=payload)).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 200
+    hits_before = token_cache.hits
+    assert (await async_client.get("/api/v1/auth/users/me", headers=headers)).status_code == 200
+    assert token_cache.hits == hits_before + 1
+
+    await AuthAppService(db_session).set_user_active(user_id, False)
+    response = await async_client.get("/api/v1/auth/users/me", headers=headers)
+    assert response.status_code == 401
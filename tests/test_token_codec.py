@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwt
+
+from src.config import settings
+from src.modules.auth.auth_keys import load_key_ring
+from src.modules.auth.auth_metier import HmacTokenCodec, JoseTokenCodec, build_token_codec
+
+NOW = int(time.time())
+
+
+@pytest.fixture(params=["HS256", "HS384", "HS512"])
+def codecs(request, monkeypatch):
+    monkeypatch.setattr(settings, "ALGORITHM", request.param)
+    keys = load_key_ring()
+    return build_token_codec(keys, "fast"), build_token_codec(keys, "jose")
+
+
+def test_fast_codec_is_wire_compatible_with_jose(codecs):
+    fast, jose_codec = codecs
+    assert isinstance(fast, HmacTokenCodec) and isinstance(jose_codec, JoseTokenCodec)
+    claims = {"sub": "42", "sid": "abc", "exp": NOW + 60, "iat": NOW}
+
+    token = fast.encode(claims)
+    assert token == jose_codec.encode(claims)
+    assert jose_codec.decode(token) == claims
+    assert fast.decode(jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)) == claims
+
+
+def _invalid_tokens(algorithm: str) -> list[str]:
+    def sign(claims, **options):
+        return jwt.encode(claims, options.pop("key", settings.SECRET_KEY), algorithm=options.pop("algorithm", algorithm), **options)
+
+    valid = sign({"sub": "1", "exp": NOW + 60})
+    header, payload, signature = valid.split(".")
+    return [
+        sign({"sub": "1", "exp": NOW - 10}),  # expiré
+        sign({"sub": "1", "nbf": NOW + 60}),  # pas encore valide
+        sign({"sub": "1", "aud": "other"}),  # audience non attendue
+        sign({"sub": 1}),  # sub non textuel
+        sign({"sub": "1", "exp": "soon"}),
+        sign({"sub": "1"}, key="wrong-secret"),
+        sign({"sub": "1"}, headers={"kid": "unknown"}),
+        f"{header}.{payload}.{signature[:-2]}",
+        f"{header}.{payload[:-4]}.{signature}",
+        f"{header}..{signature}",
+        "not-a-token",
+        "",
+    ]
+
+
+def test_fast_codec_rejects_what_jose_rejects(codecs):
+    fast, jose_codec = codecs
+    for token in _invalid_tokens(settings.ALGORITHM):
+        with pytest.raises(JWTError):
+            jose_codec.decode(token)
+        with pytest.raises(JWTError):
+            fast.decode(token)
+
+
+def test_fast_codec_delegates_asymmetric_keys(tmp_path, monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (tmp_path / "k1.pem").write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    monkeypatch.setattr(settings, "ALGORITHM", "RS256")
+    monkeypatch.setattr(settings, "JWT_KEYS_DIR", str(tmp_path))
+    fast = build_token_codec(load_key_ring(), "fast")
+
+    token = fast.encode({"sub": "1", "exp": NOW + 60})
+    assert jwt.get_unverified_header(token) == {"alg": "RS256", "kid": "k1", "typ": "JWT"}
+    assert fast.decode(token)["sub"] == "1"
+    # Tokens HS256 historiques (sans kid) toujours vérifiés par le chemin rapide
+    assert fast.decode(jwt.encode({"sub": "2"}, settings.SECRET_KEY, algorithm="HS256")) == {"sub": "2"}
@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+
+import pytest
+from multiprocessing.shared_memory import SharedMemory
+
+from src.config import settings
+from src.modules.auth.auth_model import User
+from src.modules.auth.auth_repo import UserRepository
+from src.modules.auth.auth_user_cache import (
+    USER_CACHE_EVENTS, USER_CACHE_INVALIDATION_LAG, InMemoryUserCacheBackend,
+    RedisUserCacheBackend, SharedMemoryUserCacheBackend, user_cache,
+)
+
+pytestmark = pytest.mark.asyncio
+
+ROW = {"id": 1, "email": "cache@example.com", "hashed_password": "x", "first_name": "", "last_name": "", "is_active": True}
+
+
+async def test_repository_reads_through_cache_and_invalidates_on_write(db_session, monkeypatch):
+    monkeypatch.setattr(user_cache, "backend", InMemoryUserCacheBackend(100, 60))
+    db_session.add(User(email="cached@example.com", hashed_password="x", first_name="", last_name=""))
+    await db_session.commit()
+    repository = UserRepository(db_session)
+
+    user = await repository.get_user_by_email("cached@example.com")
+    hits = USER_CACHE_EVENTS.value("hit")
+    assert (await repository.get_user_by_id(user.id)).email == "cached@example.com"
+    assert (await repository.get_active_flags({user.id, 999_999})) == {user.id: True}
+    assert USER_CACHE_EVENTS.value("hit") == hits + 2
+
+    invalidations = USER_CACHE_EVENTS.value("invalidation_sent")
+    await repository.set_user_active(user.id, False)
+    await db_session.commit()
+    await asyncio.sleep(0)  # Seconde invalidation, planifiée après le COMMIT
+    assert USER_CACHE_EVENTS.value("invalidation_sent") == invalidations + 2
+    assert (await repository.get_user_by_email("cached@example.com")).is_active is False
+
+
+async def test_shared_memory_backend_is_shared_between_workers():
+    name = f"auth_test_{uuid.uuid4().hex[:8]}"
+    worker_a = SharedMemoryUserCacheBackend(name, slots=64, slot_bytes=256, ttl_seconds=60)
+    worker_b = SharedMemoryUserCacheBackend(name, slots=64, slot_bytes=256, ttl_seconds=60)
+    try:
+        await worker_a.set_many({"id:1": ROW, "id:2": {**ROW, "first_name": "x" * 300}})
+        assert await worker_b.get_many(["id:1", "id:2", "id:3"]) == [ROW, None, None]  # Ligne trop longue: non mise en cache
+
+        await worker_b.delete(["id:1"])
+        assert await worker_a.get_many(["id:1"]) == [None]
+
+        # Case modifiée sans mise à jour de l'en-tête (écriture concurrente): miss
+        await worker_a.set_many({"id:1": ROW})
+        offset = worker_a._offset(worker_a._digest(b"id:1")) + worker_a._HEADER.size
+        worker_b._buffer[offset] ^= 0xFF
+        assert await worker_a.get_many(["id:1"]) == [None]
+    finally:
+        worker_a.close()
+        worker_b.close()
+        SharedMemory(name).unlink()
+
+
+@pytest.mark.skipif(not settings.REDIS_URL, reason="REDIS_URL non défini")
+async def test_redis_backend_invalidates_other_workers_local_cache():
+    prefix = f"auth:test:{uuid.uuid4().hex[:8]}:"
+    worker_a = RedisUserCacheBackend(settings.REDIS_URL, 60, InMemoryUserCacheBackend(100, 60), prefix=prefix)
+    worker_b = RedisUserCacheBackend(settings.REDIS_URL, 60, InMemoryUserCacheBackend(100, 60), prefix=prefix)
+    await worker_a.start()
+    await worker_b.start()
+    try:
+        await worker_a.set_many({"id:1": ROW})
+        assert await worker_b.get_many(["id:1"]) == [ROW]
+        assert worker_b.local.get_local("id:1") == ROW
+
+        received = USER_CACHE_INVALIDATION_LAG.count()
+        await worker_a.delete(["id:1"])
+        for _ in range(100):
+            if worker_b.local.get_local("id:1") is None:
+                break
+            await asyncio.sleep(0.01)
+        assert worker_b.local.get_local("id:1") is None
+        assert USER_CACHE_INVALIDATION_LAG.count() == received + 1
+        assert await worker_b.get_many(["id:1"]) == [None]
+    finally:
+        await worker_a.clear()
+        await worker_a.stop()
+        await worker_b.stop()